@@ -0,0 +1,211 @@
+"""Пакетное формирование протоколов испытаний без графического интерфейса.
+
+Входной файл - JSON или CSV со списком протоколов. Протоколы формируются
+параллельно пулом процессов; каждый процесс читает шаблон один раз и
+использует его для всех своих протоколов.
+
+Формат JSON - список объектов:
+    [{"file": "П-1.xlsx",
+      "header": {"protocol_number": "П-1", "execution_group": "1"},
+      "results": {"1": {"nominal": 30, "first": 45.5, "result": "Годно"}}}]
+
+Формат CSV (разделитель ";" или ","): колонка file, поля шапки по имени
+(protocol_number, execution_group) и результаты в колонках
+"<номер испытания>.<поле>", например "1.first". Пустые ячейки пропускаются.
+
+Если имя файла не указано, используется номер протокола.
+
+Пример:
+    python batch_protocols.py protocols.csv --out C:\\dumpProtocols --workers 8
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from catalog import to_float
+from protocol import EXPORT_DIR, TEMPLATE_PATH, fill_template, protocol_number
+from protocol_map import CURRENT_VERSION, PROTOCOL_MAPS, UnmappedCellError, build_cells
+
+# Шаблон, прочитанный рабочим процессом при запуске
+_template_path = None
+_template_data = None
+
+
+def parse_value(text):
+    """Преобразует значение из CSV: числа (в том числе с запятой) - в число, остальное - строка."""
+    text = text.strip()
+    try:
+        return protocol_number(to_float(text))
+    except ValueError:
+        return text
+
+
+def read_csv(path):
+    """Читает список протоколов из CSV.
+
+    Args:
+        path (str): Путь к файлу CSV
+
+    Returns:
+        list: [{"file": ..., "header": {...}, "results": {номер: {поле: значение}}}]
+    """
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        sample = f.read(4096)
+        f.seek(0)
+        dialect = csv.Sniffer().sniff(sample, delimiters=";,")
+        protocols = []
+        for row in csv.DictReader(f, dialect=dialect):
+            item = {"file": "", "header": {}, "results": {}}
+            for column, text in row.items():
+                if column is None or text is None or not text.strip():
+                    continue
+                column = column.strip()
+                if column == "file":
+                    item["file"] = text.strip()
+                elif "." in column:
+                    number, field = column.split(".", 1)
+                    item["results"].setdefault(int(number), {})[field] = parse_value(text)
+                else:
+                    item["header"][column] = text.strip()
+            protocols.append(item)
+    return protocols
+
+
+def read_json(path):
+    """Читает список протоколов из JSON (номера испытаний приводятся к int)."""
+    with open(path, encoding="utf-8") as f:
+        protocols = json.load(f)
+    if not isinstance(protocols, list):
+        raise ValueError("Ожидается список протоколов")
+    for index, item in enumerate(protocols, start=1):
+        if not isinstance(item, dict):
+            raise ValueError(f"Запись {index}: ожидается объект")
+        item.setdefault("header", {})
+        results = item.get("results", {})
+        if not isinstance(results, dict):
+            raise ValueError(f"Запись {index}: поле results должно быть объектом")
+        try:
+            item["results"] = {int(number): fields for number, fields in results.items()}
+        except ValueError:
+            raise ValueError(f"Запись {index}: номер испытания в results должен быть целым числом")
+    return protocols
+
+
+def read_protocols(path):
+    """Читает список протоколов из файла JSON или CSV (по расширению)."""
+    if path.lower().endswith(".json"):
+        return read_json(path)
+    return read_csv(path)
+
+
+def _init_worker(template_path):
+    """Инициализация рабочего процесса: шаблон читается один раз."""
+    global _template_path, _template_data
+    _template_path = template_path
+    with open(template_path, "rb") as f:
+        _template_data = f.read()
+
+
+def _render(task):
+    """Формирует один протокол в рабочем процессе.
+
+    Returns:
+        tuple: (путь к протоколу, текст ошибки или None)
+    """
+    export_path, cells = task
+    try:
+        fill_template(export_path, cells, _template_path, _template_data)
+    except Exception as e:
+        return export_path, str(e)
+    return export_path, None
+
+
+def build_tasks(protocols, out_dir, version=CURRENT_VERSION):
+    """Формирует задания (путь к протоколу, значения ячеек) для пула процессов.
+
+    Raises:
+        ValueError: Если запись некорректна, у протокола нет имени файла и номера протокола
+            или поле отсутствует в карте
+    """
+    tasks = []
+    for index, item in enumerate(protocols, start=1):
+        if not isinstance(item, dict) or not isinstance(item.get("header"), dict):
+            raise ValueError(f"Запись {index}: ожидается объект с полем header (объект)")
+        results = item.get("results") or {}
+        if not isinstance(results, dict) or not all(isinstance(fields, dict) for fields in results.values()):
+            raise ValueError(f"Запись {index}: поле results должно быть объектом "
+                             "{номер испытания: {поле: значение}}")
+        file_name = item.get("file") or item["header"].get("protocol_number")
+        if file_name is None or file_name == "":
+            raise ValueError(f"Запись {index}: не указаны имя файла и номер протокола")
+        # Номер протокола в JSON часто числовой
+        file_name = str(file_name)
+        if not file_name.lower().endswith(".xlsx"):
+            file_name += ".xlsx"
+        try:
+            cells = build_cells(results, item["header"], version)
+        except UnmappedCellError as e:
+            raise ValueError(f"Запись {index}: {e}")
+        tasks.append((os.path.join(out_dir, file_name), cells))
+    return tasks
+
+
+def generate(tasks, template_path=TEMPLATE_PATH, workers=None):
+    """Формирует протоколы пулом процессов.
+
+    Args:
+        tasks (list): [(путь к протоколу, {адрес: значение})]
+        template_path (str): Путь к файлу шаблона
+        workers (int): Количество процессов (по умолчанию - число ядер)
+
+    Returns:
+        list: [(путь к протоколу, текст ошибки)] для протоколов с ошибками
+    """
+    workers = workers or os.cpu_count() or 1
+    chunksize = max(1, len(tasks) // (workers * 4))
+    errors = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(template_path,)) as pool:
+        for export_path, error in pool.map(_render, tasks, chunksize=chunksize):
+            if error:
+                errors.append((export_path, error))
+    return errors
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Пакетное формирование протоколов испытаний ПЭД")
+    parser.add_argument("input", help="Файл JSON или CSV со списком протоколов")
+    parser.add_argument("--template", default=TEMPLATE_PATH, help="Путь к шаблону протокола")
+    parser.add_argument("--out", default=EXPORT_DIR, help="Каталог для протоколов")
+    parser.add_argument("--workers", type=int, default=None, help="Количество процессов")
+    parser.add_argument("--version", type=int, default=CURRENT_VERSION, choices=sorted(PROTOCOL_MAPS),
+                        help="Версия карты ячеек шаблона")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.template):
+        print(f"Шаблон протокола не найден: {args.template}", file=sys.stderr)
+        return 2
+
+    try:
+        tasks = build_tasks(read_protocols(args.input), args.out, args.version)
+    except (OSError, ValueError) as e:
+        print(f"Ошибка чтения списка протоколов: {e}", file=sys.stderr)
+        return 2
+    os.makedirs(args.out, exist_ok=True)
+
+    started = time.perf_counter()
+    errors = generate(tasks, args.template, args.workers)
+    elapsed = time.perf_counter() - started
+
+    for export_path, error in errors:
+        print(f"Ошибка: {export_path}: {error}", file=sys.stderr)
+    done = len(tasks) - len(errors)
+    rate = done / elapsed if elapsed > 0 else 0.0
+    print(f"Сформировано протоколов: {done} из {len(tasks)} за {elapsed:.2f} с ({rate:.1f} протоколов/с)")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
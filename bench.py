@@ -0,0 +1,245 @@
+"""Испытания ПЭД без графического интерфейса.
+
+Модуль объединяет измерения (instruments), оценку результатов, хранение
+(results_store) и формирование протокола (protocol) в обычные функции
+Python. Окна программы вызывают эти функции, а командная строка позволяет
+выполнять полные сессии испытаний без дисплея - например, с имитатором
+прибора для прогона стенда и профилирования в CI.
+
+Пример:
+    python bench.py --protocol out/П-1.xlsx --template pattern.xlsx --port sim --runs 20 --profile bench.prof
+"""
+import argparse
+import cProfile
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+from catalog import fetch_model
+from instruments import SIMULATED_PORT, InstrumentError, Megohmmeter, measure_insulation, open_port
+from protocol import TEMPLATE_PATH, fill_template
+from protocol_map import FIRST, NOMINAL, RESULT, SECOND, build_cells
+from results_store import get_results_store
+
+INSULATION_TEST = 3  # Номер испытания "Сопротивление вводов (хол.)" в протоколе
+MIN_RESISTANCE = 100  # Допустимое сопротивление изоляции, МОм
+MIN_VOLTAGE = 5000  # Допустимое испытательное напряжение, В
+MIN_POLARIZATION = 2.0  # Допустимый индекс поляризации
+INSULATION_UNITS = {"resistance": "МОм", "voltage": "В"}
+
+PASSED = "Годно"
+FAILED = "Не годно!"
+
+INVALID_NAME_CHARS = re.compile(r'[\\/*?:"<>|]')
+
+
+def check_insulation(resistance, voltage, polarization_index):
+    """Проверка результатов измерения изоляции на соответствие нормативам.
+
+    Returns:
+        list: Описания нарушений (пустой список - все параметры в норме)
+    """
+    problems = []
+    if resistance < MIN_RESISTANCE:
+        problems.append(f"Сопротивление изоляции {resistance:.2f} МОм < {MIN_RESISTANCE} МОм")
+    if voltage < MIN_VOLTAGE:
+        problems.append(f"Напряжение {voltage:.2f} В < {MIN_VOLTAGE} В")
+    if polarization_index < MIN_POLARIZATION:
+        problems.append(f"Индекс поляризации {polarization_index:.2f} < {MIN_POLARIZATION}")
+    return problems
+
+
+def insulation_results(measurements, second_run=False):
+    """Результаты испытания изоляции для протокола и хранилища.
+
+    Args:
+        measurements (dict): {"resistance", "voltage", "polarization_index"}
+        second_run (bool): Измерение на второй обкатке
+
+    Returns:
+        dict: {номер испытания: {поле: значение}}
+    """
+    fields = dict(measurements)
+    problems = check_insulation(fields["resistance"], fields["voltage"], fields["polarization_index"])
+    fields[RESULT] = FAILED if problems else PASSED
+    fields[NOMINAL] = MIN_RESISTANCE
+    fields[SECOND if second_run else FIRST] = round(fields["resistance"], 2)
+    return {INSULATION_TEST: fields}
+
+
+def protocol_file_name(protocol_number, ed_number, model):
+    """Имя файла протокола.
+
+    Raises:
+        ValueError: Значения содержат символы, недопустимые в имени файла
+    """
+    if any(INVALID_NAME_CHARS.search(value) for value in (protocol_number, ed_number, model)):
+        raise ValueError("Номер протокола, номер ЭД и модель не должны содержать следующие символы:\n"
+                         "\\ / : * ? \" < > |")
+    return f"{protocol_number}{ed_number}{model}.xlsx"
+
+
+def create_protocol(export_path, header, template_path=TEMPLATE_PATH):
+    """Создает файл протокола из шаблона с заполненной шапкой."""
+    directory = os.path.dirname(export_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    fill_template(export_path, build_cells(header=header), template_path)
+
+
+class BenchSession:
+    """Сессия испытаний одного протокола."""
+
+    def __init__(self, protocol_path, store=None, protocol_id=None, **info):
+        """Регистрирует протокол в хранилище результатов.
+
+        Args:
+            protocol_path (str): Путь к файлу протокола
+            store (ResultsStore): Хранилище (по умолчанию - общее для baseReda.db)
+            protocol_id (int): ID уже зарегистрированного протокола (без повторного поиска по пути)
+            info: model_id, header, ed_number, operator (см. ResultsStore.open_protocol)
+        """
+        self.protocol_path = protocol_path
+        self.store = store or get_results_store()
+        if protocol_id is None:
+            protocol_id = self.store.open_protocol(protocol_path, **info)
+        self.protocol_id = protocol_id
+
+    def save(self, results, units=None):
+        """Записывает результаты испытаний в хранилище."""
+        self.store.add_results(self.protocol_id, results, units)
+        self.store.sync()
+
+    def results(self, fields=None):
+        """Последние сохраненные результаты: {номер испытания: {поле: значение}}."""
+        return self.store.results(self.protocol_id, fields)
+
+    def render(self):
+        """Записывает сохраненные результаты в файл протокола.
+
+        Returns:
+            list: Номера испытаний, не записанные в файл (ячейки не подтверждены шаблоном)
+        """
+        return self.store.render_protocol(self.protocol_id)
+
+    def checkpoint(self, force=False):
+        """Записывает файл протокола в контрольной точке (см. ResultsStore.checkpoint).
+
+        Returns:
+            list: Номера испытаний, не записанные в файл, или None, если запись отложена
+        """
+        return self.store.checkpoint(self.protocol_id, force)
+
+    def finish(self):
+        """Отмечает завершение сессии испытаний."""
+        self.store.finish_session(self.protocol_id)
+
+
+def run_insulation_test(session, meter, second_run=False, wait_seconds=60, progress=None):
+    """Испытание изоляции: измерение, оценка и сохранение результатов.
+
+    Returns:
+        dict: Сохраненные результаты или None, если измерения остановлены
+
+    Raises:
+        InstrumentError: Прибор не ответил
+    """
+    measurements = measure_insulation(meter, wait_seconds, progress)
+    if measurements is None:
+        return None
+    results = insulation_results(measurements, second_run)
+    session.save(results, INSULATION_UNITS)
+    return results
+
+
+def run_session(args):
+    """Выполняет сессию испытаний по аргументам командной строки (см. main).
+
+    Returns:
+        int: Количество выполненных испытаний
+    """
+    store = get_results_store(args.db)
+    model_id = None
+    if args.model:
+        motor = fetch_model(store.conn, args.model)
+        if motor is None:
+            raise ValueError(f"Модель не найдена в базе: {args.model}")
+        model_id = motor.get("ID")
+
+    header = {"protocol_number": args.protocol_number or os.path.splitext(os.path.basename(args.protocol))[0]}
+    if not os.path.exists(args.protocol):
+        create_protocol(args.protocol, header, args.template)
+
+    session = BenchSession(args.protocol, store, model_id=model_id, header=header,
+                           ed_number=args.ed_number, operator=args.operator)
+    log = print if args.verbose else None
+    stop = threading.Event()
+    port = open_port(args.port)
+    completed = 0
+    try:
+        meter = Megohmmeter(port, log=log, stop=stop, poll_interval=args.poll)
+        for run in range(1, args.runs + 1):
+            started = time.perf_counter()
+            results = run_insulation_test(session, meter, args.second_run, args.wait)
+            if results is None:
+                print(f"{run}: измерения остановлены", file=sys.stderr)
+                break
+            completed += 1
+            fields = results[INSULATION_TEST]
+            print(f"{run}: {fields['resistance']:.2f} МОм, {fields['voltage']:.2f} В, "
+                  f"индекс поляризации {fields['polarization_index']:.2f} - {fields[RESULT]} "
+                  f"({(time.perf_counter() - started) * 1000:.1f} мс)")
+    finally:
+        port.close()
+    for test in session.render():
+        print(f"Испытание {test} не записано в протокол: ячейки шаблона не подтверждены", file=sys.stderr)
+    session.finish()
+    return completed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Испытания ПЭД без графического интерфейса")
+    parser.add_argument("--protocol", required=True, help="Файл протокола (создается из шаблона, если его нет)")
+    parser.add_argument("--template", default=TEMPLATE_PATH, help="Путь к шаблону протокола")
+    parser.add_argument("--db", default="baseReda.db", help="Путь к базе данных")
+    parser.add_argument("--port", default=SIMULATED_PORT, help="COM-порт мегаомметра (sim - имитатор)")
+    parser.add_argument("--model", help="Модель ПЭД из каталога")
+    parser.add_argument("--protocol-number", help="Номер протокола (по умолчанию - имя файла)")
+    parser.add_argument("--ed-number", help="Номер ЭД")
+    parser.add_argument("--operator", help="Оператор")
+    parser.add_argument("--runs", type=int, default=1, help="Количество повторов испытания")
+    parser.add_argument("--wait", type=int, default=0, help="Выдержка под напряжением, с")
+    parser.add_argument("--poll", type=float, default=0.1, help="Период опроса порта, с")
+    parser.add_argument("--second-run", action="store_true", help="Измерение на второй обкатке")
+    parser.add_argument("--profile", help="Файл статистики cProfile")
+    parser.add_argument("--verbose", action="store_true", help="Выводить обмен с прибором")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.protocol) and not os.path.exists(args.template):
+        print(f"Шаблон протокола не найден: {args.template}", file=sys.stderr)
+        return 2
+
+    profiler = cProfile.Profile() if args.profile else None
+    started = time.perf_counter()
+    try:
+        if profiler:
+            completed = profiler.runcall(run_session, args)
+        else:
+            completed = run_session(args)
+    except (InstrumentError, ValueError, OSError) as e:
+        print(f"Ошибка испытаний: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if profiler:
+            profiler.dump_stats(args.profile)
+    elapsed = time.perf_counter() - started
+    print(f"Сессия завершена за {elapsed:.2f} с: испытаний {completed}, протокол {args.protocol}")
+    if profiler:
+        pstats.Stats(args.profile).sort_stats("cumulative").print_stats(15)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,326 @@
+"""Каталог электродвигателей (таблица Base): реестр колонок, записи и запросы."""
+import sqlite3
+from collections import namedtuple
+
+
+class Column(namedtuple("Column", "name sql_type py_type unit label required min_value max_value",
+                        defaults=(False, 0, None))):
+    """Описание колонки таблицы Base.
+
+    Attributes:
+        name (str): Имя колонки в базе данных
+        sql_type (str): Тип колонки в DDL
+        py_type (type): Тип значения в Python (int, float или str)
+        unit (str): Единица измерения ("" - безразмерная величина)
+        label (str): Отображаемое название параметра
+        required (bool): Значение обязательно для заполнения
+        min_value: Минимально допустимое значение (None - без ограничения)
+        max_value: Максимально допустимое значение (None - без ограничения)
+    """
+    __slots__ = ()
+
+    @property
+    def title(self):
+        """Название параметра с единицей измерения для интерфейса."""
+        return f"{self.label}, {self.unit}" if self.unit else self.label
+
+
+# Единый реестр колонок таблицы Base (имена, порядок и типы - как в baseReda.db).
+# ID - обычная колонка INT, а не INTEGER PRIMARY KEY: значение для новой записи
+# назначается при вставке (см. INSERT_NEXT_ID).
+COLUMNS = (
+    Column("ID", "INT", int, "", "ID"),
+    Column("Model", "TEXT", str, "", "Модель", required=True, min_value=None),
+    Column("Power_nom", "INT", int, "кВт", "Номинальная мощность"),
+    Column("U_nom", "INT", int, "В", "Номинальное напряжение"),
+    Column("I_nom", "FLOAT", float, "А", "Номинальный ток"),
+    Column("Turning", "INT", int, "об/мин", "Частота вращения"),
+    Column("R_ColdWinding", "FLOAT", float, "Ом", "Сопротивление обмотки"),
+    Column("R_Insul", "INT", int, "МОм", "Сопротивление изоляции"),
+    Column("U_accel", "INT", int, "В", "Напряжение разгона"),
+    Column("BoringMoment", "FLOAT", float, "", "Момент проворачивания"),
+    Column("U_k_z", "INT", int, "В", "Напряжение к.з."),
+    Column("I_k_z", "INT", int, "А", "Ток к.з."),
+    Column("P_h_h", "FLOAT", float, "кВт", "Потери х.х."),
+    Column("I_Idling", "FLOAT", float, "А", "Ток х.х."),
+    Column("U_Idling", "FLOAT", float, "В", "Напряжение х.х."),
+    Column("P_k_z", "INT", int, "кВт", "Потери к.з."),
+    Column("Time_RunDown", "FLOAT", float, "с", "Выбег"),
+    Column("VibrLevel", "FLOAT", float, "мм/с", "Вибрация"),
+    Column("TurningMoment", "FLOAT", float, "", "Крутящий момент"),
+    Column("P_HeatedWaste", "FLOAT", float, "кВт", "Потери в нагретом состоянии"),
+    Column("U_MinInsulWinding", "INT", int, "В", "Испытательное напряжение изоляции"),
+    Column("U_InsulWinding", "INT", int, "В", "Испытательное напряжение изоляции обмоток"),
+)
+
+COLUMN_BY_NAME = {column.name: column for column in COLUMNS}
+COLUMN_NAMES = tuple(column.name for column in COLUMNS)
+# Редактируемые колонки (все, кроме ID)
+DATA_COLUMNS = COLUMNS[1:]
+NUMERIC_COLUMNS = tuple(column.name for column in COLUMNS if column.py_type in (int, float) and column.name != "ID")
+
+# Числовые колонки, доступные для фильтрации по диапазону значений
+RANGE_COLUMNS = [(name, COLUMN_BY_NAME[name].title) for name in ("Power_nom", "U_nom", "I_nom")]
+
+
+# Выражение ID новой записи (ID в таблице Base назначается программой)
+INSERT_NEXT_ID = "(SELECT COALESCE(MAX(ID), 0) + 1 FROM Base)"
+
+
+def create_table_sql():
+    """Возвращает DDL таблицы Base, построенный по реестру колонок."""
+    columns = ",\n".join(f"    {column.name} {column.sql_type}" for column in COLUMNS)
+    return f"CREATE TABLE IF NOT EXISTS Base (\n{columns}\n)"
+
+
+def to_int(value):
+    """Приводит значение к целому числу (поддерживает десятичную запятую)."""
+    if isinstance(value, str):
+        value = value.strip().replace(",", ".")
+        if value.lstrip("+-").isdigit():
+            return int(value)
+        value = float(value)
+    if isinstance(value, float) and not value.is_integer():
+        raise ValueError(f"Значение {value} не является целым числом")
+    return int(value)
+
+
+def to_float(value):
+    """Приводит значение к вещественному числу (поддерживает десятичную запятую)."""
+    if isinstance(value, str):
+        return float(value.strip().replace(",", "."))
+    return float(value)
+
+
+# Функции приведения значений по типу колонки
+CONVERTERS = {int: to_int, float: to_float, str: str}
+
+
+def convert_value(column, value):
+    """Приводит значение к типу колонки.
+
+    Args:
+        column (Column): Описание колонки
+        value: Исходное значение (None и "" считаются пустыми)
+
+    Returns:
+        Значение типа column.py_type или None
+
+    Raises:
+        ValueError: Если значение не приводится к типу колонки
+    """
+    if value is None or value == "":
+        return None
+    return CONVERTERS[column.py_type](value)
+
+
+class MotorModel:
+    """Запись каталога электродвигателей с атрибутами по реестру колонок."""
+
+    __slots__ = COLUMN_NAMES
+
+    def __init__(self, **values):
+        for name in COLUMN_NAMES:
+            setattr(self, name, values.get(name))
+
+    def get(self, name, default=None):
+        """Возвращает значение параметра по имени колонки (аналог dict.get)."""
+        value = getattr(self, name, None)
+        return default if value is None else value
+
+    def as_dict(self):
+        """Возвращает параметры записи в виде словаря."""
+        return {name: getattr(self, name) for name in COLUMN_NAMES}
+
+    def __repr__(self):
+        return f"MotorModel(ID={self.ID!r}, Model={self.Model!r})"
+
+
+def _safe(converter):
+    """Оборачивает функцию приведения: некорректные значения остаются как есть."""
+    def convert(value):
+        if value is None or value == "":
+            return None
+        try:
+            return converter(value)
+        except (TypeError, ValueError):
+            return value
+    return convert
+
+
+_factory_cache = {}
+
+
+def compile_row_factory(names):
+    """Компилирует функцию построения MotorModel для заданного порядка колонок выборки.
+
+    Приведение типов и раскладка по атрибутам определяются один раз для
+    набора колонок, а не для каждой ячейки каждой строки.
+
+    Args:
+        names: Имена колонок выборки (cursor.description)
+
+    Returns:
+        function: row -> MotorModel
+    """
+    names = tuple(names)
+    factory = _factory_cache.get(names)
+    if factory is not None:
+        return factory
+
+    namespace = {"_new": MotorModel.__new__, "_cls": MotorModel}
+    lines = ["def make(row):", "    obj = _new(_cls)"]
+    assigned = set()
+    for i, name in enumerate(names):
+        column = COLUMN_BY_NAME.get(name)
+        if column is None:
+            continue
+        assigned.add(name)
+        if column.py_type is str:
+            lines.append(f"    obj.{name} = row[{i}]")
+        else:
+            namespace[f"_c{i}"] = _safe(CONVERTERS[column.py_type])
+            py_type = column.py_type.__name__
+            lines.append(f"    v = row[{i}]")
+            lines.append(f"    obj.{name} = v if v.__class__ is {py_type} else _c{i}(v)")
+    for name in COLUMN_NAMES:
+        if name not in assigned:
+            lines.append(f"    obj.{name} = None")
+    lines.append("    return obj")
+    exec("\n".join(lines), namespace)
+
+    factory = namespace["make"]
+    _factory_cache[names] = factory
+    return factory
+
+
+def motor_row_factory(cursor, row):
+    """Фабрика строк для sqlite3 (conn.row_factory), возвращающая MotorModel."""
+    return compile_row_factory(col[0] for col in cursor.description)(row)
+
+
+def fetch_model_by_id(conn, model_id):
+    """Загружает запись каталога по ID.
+
+    Args:
+        conn: Соединение с базой данных SQLite
+        model_id: ID записи
+
+    Returns:
+        MotorModel или None, если запись не найдена
+    """
+    cursor = conn.execute(f"SELECT {', '.join(COLUMN_NAMES)} FROM Base WHERE ID = ?", (model_id,))
+    row = cursor.fetchone()
+    if row is None:
+        return None
+    return compile_row_factory(COLUMN_NAMES)(row)
+
+
+def fetch_model(conn, model):
+    """Загружает запись каталога по названию модели.
+
+    Args:
+        conn: Соединение с базой данных SQLite
+        model (str): Название модели
+
+    Returns:
+        MotorModel или None, если модель не найдена
+    """
+    cursor = conn.execute(f"SELECT {', '.join(COLUMN_NAMES)} FROM Base WHERE Model = ?", (model,))
+    row = cursor.fetchone()
+    if row is None:
+        return None
+    return compile_row_factory(COLUMN_NAMES)(row)
+
+# Составной индекс под фильтр по диапазонам (порядок колонок как в RANGE_COLUMNS)
+RANGE_INDEX_NAME = "idx_base_power_u_i"
+
+
+def numeric_expr(name):
+    """Возвращает SQL-выражение числового значения колонки.
+
+    Часть значений в базе хранится текстом с десятичной запятой ("0,82"),
+    поэтому сравнение идет по нормализованному выражению. То же выражение
+    используется в индексе, иначе SQLite не сможет его применить.
+
+    Args:
+        name (str): Имя колонки
+
+    Returns:
+        str: SQL-выражение
+    """
+    return f"CAST(REPLACE({name}, ',', '.') AS REAL)"
+
+
+def ensure_range_indexes(conn):
+    """Создает составной индекс для запросов по диапазонам, если его нет.
+
+    Args:
+        conn: Соединение с базой данных SQLite
+    """
+    columns = ", ".join(numeric_expr(name) for name, _ in RANGE_COLUMNS)
+    try:
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {RANGE_INDEX_NAME} ON Base ({columns})")
+        conn.commit()
+    except sqlite3.OperationalError:
+        # База открыта только для чтения - работаем без индекса
+        pass
+
+
+def get_column_bounds(cursor):
+    """Возвращает минимальное и максимальное значение каждой колонки фильтра.
+
+    Args:
+        cursor: Курсор базы данных
+
+    Returns:
+        dict: {имя колонки: (минимум, максимум)}
+    """
+    bounds = {}
+    for name, _ in RANGE_COLUMNS:
+        expr = numeric_expr(name)
+        cursor.execute(f"SELECT MIN({expr}), MAX({expr}) FROM Base WHERE {name} IS NOT NULL")
+        low, high = cursor.fetchone()
+        bounds[name] = (low or 0, high or 0)
+    return bounds
+
+
+def build_range_condition(ranges):
+    """Формирует условие WHERE для набора диапазонов.
+
+    Args:
+        ranges (dict): {имя колонки: (нижняя граница, верхняя граница)},
+            граница None означает отсутствие ограничения
+
+    Returns:
+        tuple: (строка условия, список параметров запроса)
+    """
+    allowed = {name for name, _ in RANGE_COLUMNS}
+    clauses = []
+    params = []
+    for name, (low, high) in ranges.items():
+        if name not in allowed:
+            raise ValueError(f"Колонка {name} не поддерживает фильтр по диапазону")
+        if low is not None:
+            clauses.append(f"{numeric_expr(name)} >= ?")
+            params.append(low)
+        if high is not None:
+            clauses.append(f"{numeric_expr(name)} <= ?")
+            params.append(high)
+    condition = " AND ".join(clauses) if clauses else "1"
+    return condition, params
+
+
+def find_models_in_ranges(cursor, ranges):
+    """Возвращает отсортированный список моделей, попадающих в диапазоны.
+
+    Args:
+        cursor: Курсор базы данных
+        ranges (dict): Диапазоны значений (см. build_range_condition)
+
+    Returns:
+        list: Названия моделей
+    """
+    condition, params = build_range_condition(ranges)
+    cursor.execute(f"SELECT DISTINCT Model FROM Base WHERE {condition} ORDER BY Model", params)
+    return [row[0] for row in cursor.fetchall() if row[0]]
@@ -0,0 +1,57 @@
+"""Каталог моделей ПЭД, общий для всех окон и станций.
+
+Список моделей и колоночный снимок каталога (snapshot.py) загружаются один
+раз (из результата подготовки во время заставки или из базы) и
+используются всеми панелями выбора модели только для чтения. Изменения
+каталога применяются к кэшу один раз по ленте изменений (changefeed.py),
+сколько бы панелей их ни получило.
+"""
+import os
+import sqlite3
+import threading
+import warmup
+from changefeed import get_feed
+
+
+class CatalogCache:
+    """Список моделей и снимок каталога."""
+
+    def __init__(self, db_path="baseReda.db"):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.feed = get_feed(db_path)
+        self.applied_seq = self.feed.last_seq  # Последняя примененная запись ленты изменений
+        prepared = warmup.take(warmup.catalog_step(db_path)) or warmup.warm_catalog(db_path)
+        self.models = prepared["models"]
+        self.snapshot = prepared["snapshot"]
+
+    def refresh(self, ids):
+        """Применяет изменения каталога (повторный вызов для той же записи ленты ничего не делает).
+
+        Args:
+            ids: ID измененных записей
+        """
+        if self.feed.last_seq == self.applied_seq:
+            return
+        self.applied_seq = self.feed.last_seq
+        if self.snapshot is not None:
+            self.snapshot.update_rows(self.conn, ids)
+            self.models = self.snapshot.models()
+        else:
+            rows = self.conn.execute("SELECT DISTINCT Model FROM Base ORDER BY Model")
+            self.models = [row[0] for row in rows if row[0]]
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_catalog_cache(db_path="baseReda.db"):
+    """Возвращает общий каталог для файла базы данных (один на файл в процессе)."""
+    key = os.path.abspath(db_path)
+    with _caches_lock:
+        cache = _caches.get(key)
+        if cache is None:
+            cache = CatalogCache(db_path)
+            _caches[key] = cache
+        return cache
@@ -0,0 +1,138 @@
+"""Лента изменений каталога (таблица Base) для инкрементального обновления представлений.
+
+Триггеры записывают ID каждой измененной записи в таблицу Base_changes.
+ChangeFeed на отдельном соединении опрашивает PRAGMA data_version (дешевая
+проверка факта фиксации транзакций другими соединениями) и при изменениях
+рассылает подписчикам только множество измененных ID.
+"""
+import os
+import sqlite3
+
+CHANGE_LOG_DDL = (
+    """
+    CREATE TABLE IF NOT EXISTS Base_changes (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        row_id INTEGER,
+        op TEXT,
+        changed_at REAL
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS base_changes_insert AFTER INSERT ON Base
+    BEGIN
+        INSERT INTO Base_changes (row_id, op, changed_at) VALUES (NEW.ID, 'I', julianday('now'));
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS base_changes_update AFTER UPDATE ON Base
+    BEGIN
+        INSERT INTO Base_changes (row_id, op, changed_at) VALUES (NEW.ID, 'U', julianday('now'));
+        INSERT INTO Base_changes (row_id, op, changed_at)
+            SELECT OLD.ID, 'D', julianday('now') WHERE OLD.ID IS NOT NEW.ID;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS base_changes_delete AFTER DELETE ON Base
+    BEGIN
+        INSERT INTO Base_changes (row_id, op, changed_at) VALUES (OLD.ID, 'D', julianday('now'));
+    END
+    """,
+)
+
+
+def install_change_log(conn):
+    """Создает таблицу журнала изменений и триггеры, если их нет.
+
+    Args:
+        conn: Соединение с базой данных SQLite
+    """
+    for statement in CHANGE_LOG_DDL:
+        conn.execute(statement)
+    conn.commit()
+
+
+class ChangeFeed:
+    """Опрашивает журнал изменений и рассылает подписчикам измененные ID."""
+
+    def __init__(self, db_path, keep=10000):
+        """Инициализация ленты изменений.
+
+        Args:
+            db_path (str): Путь к файлу базы данных SQLite
+            keep (int): Количество последних записей журнала, сохраняемых при очистке
+        """
+        self.db_path = db_path
+        self.keep = keep
+        self.subscribers = []
+        self.conn = sqlite3.connect(db_path)
+        install_change_log(self.conn)
+        self.last_seq = self.conn.execute("SELECT COALESCE(MAX(seq), 0) FROM Base_changes").fetchone()[0]
+        self.data_version = self.get_data_version()
+
+    def get_data_version(self):
+        return self.conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def subscribe(self, callback):
+        """Подписывает обработчик callback(ids) на изменения каталога."""
+        if callback not in self.subscribers:
+            self.subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        """Отписывает обработчик от изменений каталога."""
+        if callback in self.subscribers:
+            self.subscribers.remove(callback)
+
+    def poll(self):
+        """Проверяет наличие изменений и рассылает их подписчикам.
+
+        Returns:
+            set: ID измененных записей (пустое множество, если изменений нет)
+        """
+        version = self.get_data_version()
+        if version == self.data_version:
+            return set()
+        self.data_version = version
+
+        rows = self.conn.execute(
+            "SELECT seq, row_id FROM Base_changes WHERE seq > ? ORDER BY seq", (self.last_seq,)
+        ).fetchall()
+        if not rows:
+            return set()
+        self.last_seq = rows[-1][0]
+        ids = {row_id for _, row_id in rows if row_id is not None}
+
+        for callback in list(self.subscribers):
+            callback(ids)
+
+        self.prune()
+        return ids
+
+    def prune(self):
+        """Удаляет из журнала записи старше последних self.keep."""
+        if self.last_seq > self.keep * 2:
+            self.conn.execute("DELETE FROM Base_changes WHERE seq <= ?", (self.last_seq - self.keep,))
+            self.conn.commit()
+            # Собственная фиксация не меняет data_version для этого соединения
+
+    def close(self):
+        self.conn.close()
+
+
+_feeds = {}
+
+
+def get_feed(db_path="baseReda.db"):
+    """Возвращает общую ленту изменений для файла базы данных.
+
+    Args:
+        db_path (str): Путь к файлу базы данных SQLite
+
+    Returns:
+        ChangeFeed: Лента изменений (одна на файл базы в процессе)
+    """
+    key = os.path.abspath(db_path)
+    feed = _feeds.get(key)
+    if feed is None:
+        feed = ChangeFeed(db_path)
+        _feeds[key] = feed
+    return feed
@@ -0,0 +1,99 @@
+"""Очередь записи в базу данных SQLite с единственным потоком-писателем.
+
+Все изменения базы (результаты испытаний всех станций) выполняются одним
+потоком на собственном соединении в порядке поступления, каждое задание -
+в своей транзакции. Станции не ждут друг друга на блокировках SQLite и не
+получают ошибок "database is locked"; чтение выполняется на отдельных
+соединениях и видит зафиксированные данные.
+
+Пример:
+    future = get_write_queue().submit(lambda conn: conn.execute("DELETE FROM ReportCache"))
+    future.result()
+"""
+import atexit
+import os
+import queue
+import sqlite3
+import threading
+from concurrent.futures import Future
+
+
+class WriteQueue:
+    """Поток записи в базу данных."""
+
+    def __init__(self, db_path="baseReda.db", timeout=30.0):
+        """Запускает поток записи.
+
+        Args:
+            db_path (str): Путь к файлу базы данных SQLite
+            timeout (float): Ожидание блокировки базы другими программами, с
+        """
+        self.db_path = db_path
+        self.timeout = timeout
+        self.queue = queue.Queue()
+        self.thread = threading.Thread(target=self._run, name="db-writer", daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        conn = sqlite3.connect(self.db_path, timeout=self.timeout)
+        try:
+            while True:
+                item = self.queue.get()
+                if item is None:
+                    break
+                future, func, args = item
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    with conn:
+                        result = func(conn, *args)
+                except BaseException as e:
+                    future.set_exception(e)
+                else:
+                    future.set_result(result)
+        finally:
+            conn.close()
+
+    def submit(self, func, *args):
+        """Ставит в очередь запись func(conn, *args) (выполняется в отдельной транзакции).
+
+        Returns:
+            Future: Результат func
+        """
+        future = Future()
+        self.queue.put((future, func, args))
+        return future
+
+    def call(self, func, *args):
+        """Выполняет запись и ожидает ее результат."""
+        return self.submit(func, *args).result()
+
+    def close(self):
+        """Выполняет поставленные в очередь записи и останавливает поток."""
+        if self.thread.is_alive():
+            self.queue.put(None)
+            self.thread.join()
+
+
+_queues = {}
+_queues_lock = threading.Lock()
+
+
+def get_write_queue(db_path="baseReda.db"):
+    """Возвращает общую очередь записи для файла базы данных (одна на файл в процессе)."""
+    key = os.path.abspath(db_path)
+    with _queues_lock:
+        writer = _queues.get(key)
+        if writer is None:
+            writer = WriteQueue(db_path)
+            _queues[key] = writer
+        return writer
+
+
+@atexit.register
+def close_all():
+    """Дописывает очереди всех баз при завершении программы."""
+    with _queues_lock:
+        writers = list(_queues.values())
+    for writer in writers:
+        writer.close()
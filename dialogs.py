@@ -1,9 +1,14 @@
 import wx
 import wx.lib.scrolledpanel as scrolled
 from events import ExperienceOneEndedEvent, EVT_EXPERIENCE_ONE_ENDED
-import win32com.client as win32
+import logging
+import threading
 from pathlib import Path
 from validators import NumberValidator
+from resources import colour, font
+from catalog import to_float
+from protocol import OIL_BREAKDOWN_UNITS, oil_breakdown_results
+from results_store import get_results_store
 
 
 class ExperienceOneDialog(wx.Dialog):
@@ -19,8 +24,8 @@ class ExperienceOneDialog(wx.Dialog):
         instruction_text = ("Возьмите пробу масла. Произведите измерение напряжения пробоя масла. "
                             "Введите измеренное и паспортное значения:")
         instruction = wx.StaticText(panel, label=instruction_text)
-        instruction.SetFont(wx.Font(10, wx.FONTFAMILY_DEFAULT, wx.FONTSTYLE_NORMAL, wx.FONTWEIGHT_BOLD))
-        instruction.SetForegroundColour(wx.Colour(85, 0, 255))
+        instruction.SetFont(font(10))
+        instruction.SetForegroundColour(colour("label"))
         main_sizer.Add(instruction, 0, wx.ALL | wx.ALIGN_CENTER, 10)
 
         content_sizer = wx.BoxSizer(wx.HORIZONTAL)
@@ -28,25 +33,25 @@ class ExperienceOneDialog(wx.Dialog):
         form_sizer = wx.GridBagSizer(5, 5)
 
         lbl_voltage = wx.StaticText(form_panel, label="Напряжение пробоя масла, кВ")
-        lbl_voltage.SetFont(wx.Font(10, wx.FONTFAMILY_DEFAULT, wx.FONTSTYLE_NORMAL, wx.FONTWEIGHT_BOLD))
-        lbl_voltage.SetForegroundColour(wx.Colour(85, 0, 255))
+        lbl_voltage.SetFont(font(10))
+        lbl_voltage.SetForegroundColour(colour("label"))
 
         self.txt_voltage = wx.TextCtrl(form_panel, style=wx.TE_PROCESS_ENTER)
         self.txt_voltage.SetValidator(NumberValidator())
 
         lbl_nominal = wx.StaticText(form_panel, label="Паспортное значение, кВ")
-        lbl_nominal.SetFont(wx.Font(10, wx.FONTFAMILY_DEFAULT, wx.FONTSTYLE_NORMAL, wx.FONTWEIGHT_BOLD))
-        lbl_nominal.SetForegroundColour(wx.Colour(85, 0, 255))
+        lbl_nominal.SetFont(font(10))
+        lbl_nominal.SetForegroundColour(colour("label"))
 
         self.txt_nominal = wx.TextCtrl(form_panel, style=wx.TE_PROCESS_ENTER)
         self.txt_nominal.SetValidator(NumberValidator())
 
         lbl_result = wx.StaticText(form_panel, label="Результат")
-        lbl_result.SetFont(wx.Font(10, wx.FONTFAMILY_DEFAULT, wx.FONTSTYLE_NORMAL, wx.FONTWEIGHT_BOLD))
-        lbl_result.SetForegroundColour(wx.Colour(85, 0, 255))
+        lbl_result.SetFont(font(10))
+        lbl_result.SetForegroundColour(colour("label"))
 
         self.txt_result = wx.TextCtrl(form_panel, style=wx.TE_READONLY)
-        self.txt_result.SetFont(wx.Font(10, wx.FONTFAMILY_DEFAULT, wx.FONTSTYLE_NORMAL, wx.FONTWEIGHT_BOLD))
+        self.txt_result.SetFont(font(10))
 
         form_sizer.Add(lbl_voltage, (0, 0), flag=wx.ALIGN_CENTER_VERTICAL)
         form_sizer.Add(self.txt_voltage, (0, 1))
@@ -57,10 +62,10 @@ class ExperienceOneDialog(wx.Dialog):
 
         self.check_first = wx.CheckBox(form_panel, label="Первая обкатка")
         self.check_first.SetValue(True)
-        self.check_first.SetFont(wx.Font(10, wx.FONTFAMILY_DEFAULT, wx.FONTSTYLE_NORMAL, wx.FONTWEIGHT_BOLD))
+        self.check_first.SetFont(font(10))
 
         self.check_second = wx.CheckBox(form_panel, label="Вторая обкатка")
-        self.check_second.SetFont(wx.Font(10, wx.FONTFAMILY_DEFAULT, wx.FONTSTYLE_NORMAL, wx.FONTWEIGHT_BOLD))
+        self.check_second.SetFont(font(10))
 
         form_sizer.Add(self.check_first, (3, 0), flag=wx.TOP, border=10)
         form_sizer.Add(self.check_second, (4, 0), flag=wx.TOP, border=5)
@@ -77,9 +82,9 @@ class ExperienceOneDialog(wx.Dialog):
         main_sizer.Add(content_sizer, 0, wx.EXPAND)
 
         self.btn_save = wx.Button(panel, label="Сохранить")
-        self.btn_save.SetFont(wx.Font(10, wx.FONTFAMILY_DEFAULT, wx.FONTSTYLE_NORMAL, wx.FONTWEIGHT_BOLD))
+        self.btn_save.SetFont(font(10))
         self.btn_save.SetCursor(wx.Cursor(wx.CURSOR_HAND))
-        self.btn_save.SetBackgroundColour(wx.Colour(255, 255, 127))
+        self.btn_save.SetBackgroundColour(colour("save"))
 
         self.btn_save.Bind(wx.EVT_BUTTON, self.on_save)
 
@@ -108,8 +113,16 @@ class ExperienceOneDialog(wx.Dialog):
             wx.MessageBox("Не заполнено одно из полей!", "Предупреждение!", wx.OK | wx.ICON_WARNING)
             return
 
-        nominal = int(self.txt_nominal.GetValue())
-        voltage = int(self.txt_voltage.GetValue())
+        if not (self.check_first.GetValue() or self.check_second.GetValue()):
+            wx.MessageBox("Выберите номер обкатки!", "Предупреждение!", wx.OK | wx.ICON_WARNING)
+            return
+
+        try:
+            nominal = to_float(self.txt_nominal.GetValue())
+            voltage = to_float(self.txt_voltage.GetValue())
+        except ValueError:
+            wx.MessageBox("Введено некорректное число!", "Предупреждение!", wx.OK | wx.ICON_WARNING)
+            return
 
         if nominal > voltage:
             self.txt_result.SetValue("Не годно!")
@@ -117,33 +130,40 @@ class ExperienceOneDialog(wx.Dialog):
             self.txt_result.SetValue("Годно")
 
         self.btn_save.Enable(False)
-        self.btn_save.SetBackgroundColour(wx.Colour(51, 255, 153))
+        self.btn_save.SetBackgroundColour(colour("saved"))
         self.Refresh()
 
-        try:
-            excel = win32.gencache.EnsureDispatch('Excel.Application')
-            excel.Visible = False
-            excel.DisplayAlerts = False
-            workbook = excel.Workbooks.Open(self.file_protocol)
-            sheet = workbook.Worksheets(1)
-            sheet.Cells(22, 19).Value = self.txt_result.GetValue()
-            sheet.Cells(22, 10).Value = nominal
-
-            if self.check_first.GetValue():
-                sheet.Cells(22, 13).Value = voltage
-            elif self.check_second.GetValue():
-                sheet.Cells(22, 16).Value = voltage
-            else:
-                wx.MessageBox("Выберите номер обкатки!", "Предупреждение!", wx.OK | wx.ICON_WARNING)
-                workbook.Close(SaveChanges=False)
-                excel.Quit()
-                return
-
-            workbook.Close(SaveChanges=True)
-            excel.Quit()
+        # Результат сохраняется в хранилище результатов базы станции главного окна, протокол формируется из него
+        station = getattr(wx.GetTopLevelParent(self.GetParent()), 'station', None)
+        store = get_results_store(station.db_path) if station else get_results_store()
+        thread = threading.Thread(target=self.write_protocol,
+                                  args=(store, self.txt_result.GetValue(), nominal, voltage,
+                                        self.check_second.GetValue()))
+        thread.daemon = True
+        thread.start()
 
+    def write_protocol(self, store, result, nominal, voltage, second_run):
+        try:
+            protocol_id = store.open_protocol(self.file_protocol)
+            store.add_results(protocol_id, oil_breakdown_results(result, nominal, voltage, second_run),
+                              OIL_BREAKDOWN_UNITS)
+            store.sync()
+        except Exception as e:
+            wx.CallAfter(self.on_write_done, f"Ошибка при записи результата: {str(e)}")
+            return
+        try:
+            # Файл протокола формируется из сохраненных в базе результатов в контрольной точке
+            store.checkpoint(protocol_id)
         except Exception as e:
-            wx.MessageBox(f"Ошибка при работе с Excel: {str(e)}", "Ошибка", wx.OK | wx.ICON_ERROR)
+            # Результат сохранен в базе и будет записан в протокол при следующем формировании
+            logging.error(f"Ошибка записи протокола {self.file_protocol}: {e}")
+        wx.CallAfter(self.on_write_done, None)
+
+    def on_write_done(self, error):
+        if error:
+            wx.MessageBox(error, "Ошибка", wx.OK | wx.ICON_ERROR)
+            self.btn_save.Enable(True)
+            self.btn_save.SetBackgroundColour(colour("save"))
             return
 
         self.EndModal(wx.ID_OK)
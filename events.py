@@ -2,3 +2,7 @@ import wx.lib.newevent
 
 
 ExperienceOneEndedEvent, EVT_EXPERIENCE_ONE_ENDED = wx.lib.newevent.NewEvent()
+
+# События фоновой очереди формирования протоколов (атрибут job - задание ExportJob)
+ExportProgressEvent, EVT_EXPORT_PROGRESS = wx.lib.newevent.NewEvent()
+ExportDoneEvent, EVT_EXPORT_DONE = wx.lib.newevent.NewEvent()
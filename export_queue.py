@@ -0,0 +1,143 @@
+"""Фоновая очередь формирования файлов протоколов.
+
+Формирование протокола (копия шаблона, запись ячеек, сохранение) выполняется
+рабочим потоком, интерфейс не блокируется. Повторная постановка протокола,
+который уже ожидает в очереди или формируется, не создает нового задания.
+Если файл протокола занят (открыт в Excel), запись повторяется с паузой.
+"""
+import logging
+import os
+import queue
+import threading
+import time
+from protocol import TEMPLATE_PATH, fill_template
+
+# Стадии задания, передаваемые обработчикам
+QUEUED = "queued"  # Задание поставлено в очередь
+RUNNING = "running"  # Выполняется запись протокола
+RETRY = "retry"  # Файл занят, запись будет повторена
+DONE = "done"  # Протокол сформирован
+FAILED = "failed"  # Ошибка формирования протокола
+
+
+class ExportJob:
+    """Задание на формирование одного протокола."""
+
+    def __init__(self, export_path, cells, template_path):
+        self.export_path = export_path
+        self.cells = cells
+        self.template_path = template_path
+        self.stage = QUEUED
+        self.attempt = 0
+        self.error = None
+        self.listeners = []
+        self.finished = threading.Event()
+
+    def notify(self, stage, error=None):
+        """Сообщает обработчикам listener(job) о смене стадии задания."""
+        self.stage = stage
+        self.error = error
+        for listener in list(self.listeners):
+            try:
+                listener(self)
+            except Exception as e:
+                logging.error(f"Ошибка обработчика экспорта {self.export_path}: {e}")
+
+
+class ExportQueue:
+    """Очередь заданий на формирование протоколов с одним рабочим потоком."""
+
+    def __init__(self, retries=5, retry_delay=1.0):
+        """Инициализация очереди.
+
+        Args:
+            retries (int): Количество повторов записи в занятый файл
+            retry_delay (float): Пауза перед первым повтором, сек (удваивается с каждым повтором)
+        """
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.jobs = {}  # Путь к протоколу -> незавершенное задание
+        self.lock = threading.Lock()
+        self.queue = queue.Queue()
+        self.worker = threading.Thread(target=self.run, name="protocol-export", daemon=True)
+        self.worker.start()
+
+    def submit(self, export_path, cells, template_path=TEMPLATE_PATH, listener=None):
+        """Ставит протокол в очередь на формирование.
+
+        Args:
+            export_path (str): Путь к создаваемому файлу протокола
+            cells (dict): {адрес ячейки: значение}
+            template_path (str): Путь к файлу шаблона
+            listener: Обработчик listener(job), вызывается из рабочего потока
+
+        Returns:
+            tuple: (задание, True если задание новое, False если протокол уже в очереди)
+        """
+        key = os.path.abspath(export_path)
+        with self.lock:
+            job = self.jobs.get(key)
+            if job is not None:
+                if listener is not None and listener not in job.listeners:
+                    job.listeners.append(listener)
+                return job, False
+            job = ExportJob(export_path, cells, template_path)
+            if listener is not None:
+                job.listeners.append(listener)
+            self.jobs[key] = job
+        job.notify(QUEUED)
+        self.queue.put(job)
+        return job, True
+
+    def pending(self):
+        """Возвращает количество незавершенных заданий."""
+        with self.lock:
+            return len(self.jobs)
+
+    def run(self):
+        while True:
+            job = self.queue.get()
+            try:
+                self.execute(job)
+            finally:
+                with self.lock:
+                    self.jobs.pop(os.path.abspath(job.export_path), None)
+                job.finished.set()
+                self.queue.task_done()
+
+    def execute(self, job):
+        """Формирует протокол, повторяя запись, пока файл занят другим процессом."""
+        delay = self.retry_delay
+        while True:
+            job.attempt += 1
+            job.notify(RUNNING)
+            try:
+                fill_template(job.export_path, job.cells, job.template_path)
+                if not os.path.exists(job.export_path):
+                    raise RuntimeError(f"Файл не был создан: {job.export_path}")
+            except PermissionError as e:
+                if job.attempt > self.retries:
+                    job.notify(FAILED, e)
+                    return
+                job.notify(RETRY, e)
+                time.sleep(delay)
+                delay *= 2
+                continue
+            except Exception as e:
+                job.notify(FAILED, e)
+                return
+            job.notify(DONE)
+            return
+
+
+_export_queue = None
+_export_queue_lock = threading.Lock()
+
+
+def get_export_queue():
+    """Возвращает общую очередь формирования протоколов процесса."""
+    global _export_queue
+    with _export_queue_lock:
+        if _export_queue is None:
+            _export_queue = ExportQueue()
+        return _export_queue
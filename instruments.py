@@ -0,0 +1,280 @@
+"""Приборы испытательного стенда без графического интерфейса.
+
+Megohmmeter реализует обмен с мегаомметром по последовательному порту
+(команда - ответ "OK", запрос показаний - число). Порт - любой объект с
+интерфейсом serial.Serial (write, read, in_waiting, is_open, close), поэтому
+последовательность измерений выполняется и с реальным прибором, и с
+SimulatedMegohmmeterPort (прогон стенда на Linux и в CI без оборудования).
+
+Пример:
+    port = open_port("sim")
+    values = measure_insulation(Megohmmeter(port), wait_seconds=0)
+"""
+import random
+import re
+import threading
+import time
+from lazy_import import lazy_module
+
+serial = lazy_module("serial")
+
+SIMULATED_PORT = "sim"
+NUMBER_PATTERN = re.compile(r'[-+]?\d*\.\d+|\d+')
+
+
+class InstrumentError(Exception):
+    """Прибор не ответил или ответил не так, как ожидалось."""
+
+
+class SimulatedMegohmmeterPort:
+    """Имитация мегаомметра с интерфейсом serial.Serial.
+
+    Команды управления подтверждаются ответом "OK", команда "Dg" возвращает
+    показание режима, выбранного последней командой "Df": 0040 -
+    сопротивление изоляции (МОм), 0100 - напряжение (В).
+    """
+
+    MODES = {"Df0040": "resistance", "Df0100": "voltage"}
+
+    def __init__(self, resistance=550.0, voltage=5200.0, noise=0.02, latency=0.0, seed=None):
+        """Инициализация имитатора.
+
+        Args:
+            resistance (float): Среднее сопротивление изоляции, МОм
+            voltage (float): Среднее испытательное напряжение, В
+            noise (float): Относительный разброс показаний
+            latency (float): Задержка ответа прибора, с
+            seed: Начальное значение генератора случайных чисел
+        """
+        self.values = {"resistance": resistance, "voltage": voltage}
+        self.noise = noise
+        self.latency = latency
+        self.random = random.Random(seed)
+        self.mode = None
+        self.output = b""
+        self.ready_at = 0.0
+        self.is_open = True
+        self.lock = threading.Lock()
+
+    @property
+    def in_waiting(self):
+        with self.lock:
+            return len(self.output) if time.perf_counter() >= self.ready_at else 0
+
+    def write(self, data):
+        command = data.decode("ascii").strip()
+        if command == "Dg":
+            value = self.values.get(self.mode, 0.0) * (1 + self.random.uniform(-self.noise, self.noise))
+            response = f"{value:.2f}\r"
+        else:
+            self.mode = self.MODES.get(command, self.mode)
+            response = "OK\r\n"
+        with self.lock:
+            self.output += response.encode("ascii")
+            self.ready_at = time.perf_counter() + self.latency
+        return len(data)
+
+    def read(self, size=1):
+        with self.lock:
+            data, self.output = self.output[:size], self.output[size:]
+        return data
+
+    def close(self):
+        self.is_open = False
+
+
+def open_port(name, baudrate=9600, timeout=1):
+    """Открывает порт прибора ("sim" - имитатор мегаомметра)."""
+    if name == SIMULATED_PORT:
+        return SimulatedMegohmmeterPort()
+    return serial.Serial(
+        port=name,
+        baudrate=baudrate,
+        bytesize=serial.EIGHTBITS,
+        parity=serial.PARITY_NONE,
+        stopbits=serial.STOPBITS_ONE,
+        timeout=timeout
+    )
+
+
+class Megohmmeter:
+    """Обмен командами с мегаомметром.
+
+    Объект владеет портом прибора: обмен командами, команда безопасного
+    отключения и закрытие порта выполняются под одной блокировкой, поэтому
+    другие потоки не пишут в порт во время обмена. Все ожидания прерываются
+    признаком остановки stop сразу после его установки.
+    """
+
+    SHUTDOWN_COMMAND = "Bu"
+
+    def __init__(self, port, log=None, stop=None, poll_interval=0.1, retry_delay=0.5):
+        """Инициализация.
+
+        Args:
+            port: Открытый порт прибора (интерфейс serial.Serial)
+            log: Функция записи сообщения о ходе обмена
+            stop (threading.Event): Признак остановки измерений
+            poll_interval (float): Период опроса порта при ожидании ответа, с
+            retry_delay (float): Пауза перед повторной попыткой, с
+        """
+        self.port = port
+        self.log = log or (lambda message: None)
+        self.stop = stop or threading.Event()
+        self.poll_interval = poll_interval
+        self.retry_delay = retry_delay
+        self.lock = threading.Lock()
+        self.shutdown_sent = False
+
+    def _exchange(self, command, terminator, timeout):
+        """Отправляет команду и читает ответ до терминатора, таймаута или остановки"""
+        with self.lock:
+            self.port.write(f"{command}\r\n".encode('ascii'))
+            self.log(f"Отправлено: {command}")
+            response = b''
+            deadline = time.perf_counter() + timeout
+            while True:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                if self.port.in_waiting > 0:
+                    response += self.port.read(self.port.in_waiting)
+                    if response.endswith(terminator):
+                        break
+                elif self.stop.wait(min(self.poll_interval, remaining)):
+                    break
+        response_str = response.decode('ascii', errors='ignore').strip()
+        self.log(f"Получено: {response_str}")
+        return response_str
+
+    def _retry(self, attempt, max_retries):
+        if not self.stop.is_set():
+            self.log(f"Повторная попытка ({attempt + 1}/{max_retries})...")
+            self.stop.wait(self.retry_delay)
+
+    def shutdown(self):
+        """Отправляет прибору команду безопасного отключения (один раз за сессию).
+
+        Returns:
+            bool: True - команда отправлена этим вызовом
+        """
+        with self.lock:
+            if self.shutdown_sent:
+                return False
+            self.shutdown_sent = True
+            try:
+                self.port.write(f"{self.SHUTDOWN_COMMAND}\r\n".encode('ascii'))
+            except (OSError, ValueError) as e:
+                self.log(f"Ошибка отправки команды отключения: {str(e)}")
+                return False
+        self.log("Отправлена команда отключения")
+        return True
+
+    def close(self):
+        """Закрывает порт прибора."""
+        with self.lock:
+            if self.port.is_open:
+                self.port.close()
+
+    def command(self, command, expected_response="OK", max_retries=5, timeout=5):
+        """Отправляет команду с проверкой ответа.
+
+        Returns:
+            bool: True - команда подтверждена, False - измерения остановлены
+
+        Raises:
+            InstrumentError: Ожидаемый ответ не получен
+        """
+        for attempt in range(max_retries):
+            if self.stop.is_set():
+                return False
+            try:
+                if expected_response in self._exchange(command, b'\r\n', timeout):
+                    return True
+            except (OSError, ValueError) as e:
+                self.log(f"Ошибка при отправке команды: {str(e)}")
+            self._retry(attempt, max_retries)
+        if self.stop.is_set():
+            return False
+        raise InstrumentError(f"Не получен ожидаемый ответ на команду: {command}")
+
+    def measure(self, command="Dg", max_retries=3, timeout=2):
+        """Запрашивает числовое показание прибора.
+
+        Returns:
+            float: Показание или None, если измерения остановлены
+
+        Raises:
+            InstrumentError: Значение не получено
+        """
+        for attempt in range(max_retries):
+            if self.stop.is_set():
+                return None
+            try:
+                match = NUMBER_PATTERN.search(self._exchange(command, b'\r', timeout))
+                if match:
+                    return float(match.group())
+            except (OSError, ValueError) as e:
+                self.log(f"Ошибка при получении измерения: {str(e)}")
+            self._retry(attempt, max_retries)
+        if self.stop.is_set():
+            return None
+        raise InstrumentError("Не удалось получить значение измерения")
+
+
+def measure_insulation(meter, wait_seconds=60, progress=None, on_sample=None):
+    """Измерение сопротивления изоляции и испытательного напряжения.
+
+    Args:
+        meter (Megohmmeter): Прибор
+        wait_seconds (int): Выдержка под напряжением перед измерением, с
+        progress: Функция progress(секунд осталось) во время выдержки
+        on_sample: Функция on_sample(имя величины, значение) для каждого показания прибора
+
+    Returns:
+        dict: {"resistance", "voltage", "polarization_index"} или None, если измерения остановлены
+
+    Raises:
+        InstrumentError: Прибор не ответил
+    """
+    measurements = None
+    try:
+        measurements = _insulation_sequence(meter, wait_seconds, progress, on_sample)
+        return measurements
+    finally:
+        if measurements is None:
+            # Остановка или ошибка: прибор отключается (команда отправляется один раз)
+            meter.shutdown()
+
+
+def _insulation_sequence(meter, wait_seconds, progress, on_sample):
+    # Удаленное управление и включение прибора
+    if not (meter.command("Rn") and meter.command("Bd")):
+        return None
+
+    meter.log(f"Ожидание {wait_seconds} с...")
+    for remaining in range(wait_seconds, 0, -1):
+        if progress:
+            progress(remaining)
+        if meter.stop.wait(1):
+            return None
+
+    # Отключение прибора (команда подтверждается со второго раза) и чтение показаний
+    if not (meter.command("Bu") and meter.command("Bu") and meter.command("Df0040")):
+        return None
+    resistance = meter.measure("Dg")
+    if resistance is None:
+        return None
+    if on_sample:
+        on_sample("resistance", resistance)
+    if not meter.command("Df0100"):
+        return None
+    voltage = meter.measure("Dg")
+    if voltage is None:
+        return None
+    if on_sample:
+        on_sample("voltage", voltage)
+
+    # Расчет индекса поляризации (примерная логика)
+    polarization_index = resistance / (voltage / 1000) if voltage > 0 else 0
+    return {"resistance": resistance, "voltage": voltage, "polarization_index": polarization_index}
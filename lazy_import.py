@@ -0,0 +1,50 @@
+"""Отложенный импорт тяжелых необязательных модулей.
+
+lazy_module возвращает заместитель модуля: сам модуль импортируется при
+первом обращении к его атрибуту. Так openpyxl, pyserial и NumPy не
+загружаются при запуске программы, если оператор не формирует протоколы
+и не выполняет измерения.
+"""
+import importlib
+import importlib.util
+import threading
+
+_lock = threading.Lock()
+
+
+class LazyModule:
+    """Заместитель модуля, импортирующий его при первом обращении к атрибуту."""
+
+    __slots__ = ("_name", "_module")
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def _load(self):
+        if self._module is None:
+            with _lock:
+                if self._module is None:
+                    self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __repr__(self):
+        state = "загружен" if self._module is not None else "не загружен"
+        return f"<LazyModule {self._name} ({state})>"
+
+
+def lazy_module(name):
+    """Возвращает заместитель модуля name (модуль импортируется при первом использовании)."""
+    return LazyModule(name)
+
+
+def optional_module(name):
+    """Возвращает заместитель необязательного модуля или None, если модуль не установлен."""
+    try:
+        found = importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        found = False
+    return LazyModule(name) if found else None
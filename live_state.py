@@ -0,0 +1,74 @@
+"""Передача текущих значений измерений из рабочих потоков в окно.
+
+Рабочий поток записывает последние значения и строки журнала в LiveState
+без обращения к очереди событий wx. Окно по таймеру с фиксированной
+частотой забирает только изменившиеся значения и накопленные строки
+(take), поэтому нагрузка на очередь событий не зависит от частоты опроса
+приборов.
+"""
+import threading
+from collections import deque
+
+REFRESH_INTERVAL = 50  # Период обновления окна, мс (20 Гц)
+
+
+class LiveState:
+    """Общий снимок значений для рабочего потока и окна."""
+
+    def __init__(self, max_log_lines=500):
+        """Инициализация.
+
+        Args:
+            max_log_lines (int): Количество хранимых строк журнала между обновлениями окна
+                (более старые строки отбрасываются и учитываются в счетчике)
+        """
+        self.lock = threading.Lock()
+        self.values = {}
+        self.changed = set()
+        self.lines = deque(maxlen=max_log_lines)
+        self.dropped = 0
+
+    def set(self, name, value):
+        """Записывает значение (окно получит его при следующем обновлении, если оно изменилось)."""
+        with self.lock:
+            if name not in self.values or self.values[name] != value:
+                self.values[name] = value
+                self.changed.add(name)
+
+    def update(self, **values):
+        """Записывает несколько значений."""
+        for name, value in values.items():
+            self.set(name, value)
+
+    def get(self, name, default=None):
+        with self.lock:
+            return self.values.get(name, default)
+
+    def log(self, line):
+        """Добавляет строку журнала."""
+        with self.lock:
+            if len(self.lines) == self.lines.maxlen:
+                self.dropped += 1
+            self.lines.append(line)
+
+    def take(self):
+        """Забирает изменения с момента предыдущего вызова.
+
+        Returns:
+            tuple: ({имя: значение} изменившихся значений, [строки журнала], количество отброшенных строк)
+        """
+        with self.lock:
+            changed = {name: self.values[name] for name in self.changed}
+            self.changed.clear()
+            lines = list(self.lines)
+            self.lines.clear()
+            dropped, self.dropped = self.dropped, 0
+        return changed, lines, dropped
+
+    def clear(self):
+        """Сбрасывает значения и журнал."""
+        with self.lock:
+            self.values.clear()
+            self.changed.clear()
+            self.lines.clear()
+            self.dropped = 0
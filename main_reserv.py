@@ -1,17 +1,37 @@
+import startup_profile  # Первым: профилирование импорта при PED_STARTUP_PROFILE
 import os
 import wx
 import wx.adv
 import time
 import math
 import threading
-import serial
-import re
-import wx.grid
 import sqlite3
-import openpyxl
-from openpyxl.utils.exceptions import InvalidFileException
+import zipfile
 import traceback
 import logging
+from catalog import (COLUMNS, COLUMN_NAMES, DATA_COLUMNS, INSERT_NEXT_ID, RANGE_COLUMNS, create_table_sql,
+                     ensure_range_indexes, fetch_model, fetch_model_by_id, find_models_in_ranges,
+                     get_column_bounds)
+from changefeed import get_feed
+from events import EVT_EXPORT_DONE, EVT_EXPORT_PROGRESS, ExportDoneEvent, ExportProgressEvent
+from export_queue import DONE as EXPORT_DONE, FAILED as EXPORT_FAILED, RETRY as EXPORT_RETRY, get_export_queue
+from bench import INSULATION_UNITS, check_insulation, insulation_results, protocol_file_name
+from instruments import InstrumentError, Megohmmeter, measure_insulation, open_port
+from protocol import EXPORT_DIR, TEMPLATE_PATH, read_protocol
+from results_store import get_results_store
+from protocol_map import RESULT, TEST_FIELDS, build_cells
+from catalog_cache import get_catalog_cache
+from validation import validate_rows
+from lazy_import import lazy_module
+from live_state import REFRESH_INTERVAL, LiveState
+from resources import colour, font
+from stations import Station, load_stations
+from trend_chart import TrendChart
+import warmup
+
+# Тяжелые модули загружаются при первом использовании (вкладка базы данных, ошибки книг Excel)
+gridlib = lazy_module("wx.grid")
+openpyxl_exceptions = lazy_module("openpyxl.utils.exceptions")
 
 
 class ModelSelectorPanel(wx.Panel):
@@ -28,7 +48,7 @@ class ModelSelectorPanel(wx.Panel):
         super().__init__(parent)
 
         # Установка цвета фона панели (светло-голубой)
-        self.SetBackgroundColour(wx.Colour(250, 252, 255))
+        self.SetBackgroundColour(colour("panel"))
 
 
         # Инициализация переменных для работы с БД
@@ -36,6 +56,8 @@ class ModelSelectorPanel(wx.Panel):
         self.conn = None  # Будущее соединение с БД
         self.cursor = None  # Будущий курсор для работы с БД
         self.all_models = []  # Список для хранения всех моделей
+        self.range_models = []  # Модели, прошедшие фильтр по диапазонам параметров
+        self.snapshot = None  # Колоночный снимок каталога (None, если NumPy недоступен)
         self.current_model_id = None  # ID текущей выбранной модели
 
         # Создание вертикального контейнера для элементов управления
@@ -44,9 +66,9 @@ class ModelSelectorPanel(wx.Panel):
         # Создание заголовка панели
         title = wx.StaticText(self, label="Выбор модели ЭД")
         # Настройка шрифта заголовка (размер 14, жирный)
-        title.SetFont(wx.Font(14, wx.FONTFAMILY_DEFAULT, wx.FONTSTYLE_NORMAL, wx.FONTWEIGHT_BOLD))
+        title.SetFont(font(14))
         # Установка цвета текста (темно-синий)
-        title.SetForegroundColour(wx.Colour(0, 50, 100))
+        title.SetForegroundColour(colour("title"))
         # Добавление заголовка в контейнер с отступами 10 пикселей со всех сторон
         sizer.Add(title, 0, wx.ALL | wx.ALIGN_CENTER, 10)
 
@@ -75,6 +97,32 @@ class ModelSelectorPanel(wx.Panel):
         # Добавление контейнера поиска в основной контейнер
         sizer.Add(search_sizer, 0, wx.EXPAND | wx.ALL, 5)
 
+        # Создание группы "Фильтр по параметрам" (диапазоны номинальных значений)
+        range_box = wx.StaticBox(self, label="Фильтр по параметрам")
+        range_sizer = wx.StaticBoxSizer(range_box, wx.VERTICAL)
+        range_grid = wx.FlexGridSizer(cols=3, vgap=4, hgap=5)
+        range_grid.AddGrowableCol(1, 1)
+        range_grid.AddGrowableCol(2, 1)
+
+        # Словарь ползунков: {имя колонки: (ползунок "от", ползунок "до")}
+        self.range_sliders = {}
+        for db_name, ru_name in RANGE_COLUMNS:
+            slider_min = wx.Slider(self, style=wx.SL_HORIZONTAL | wx.SL_LABELS)
+            slider_max = wx.Slider(self, style=wx.SL_HORIZONTAL | wx.SL_LABELS)
+            range_grid.Add(wx.StaticText(self, label=f"{ru_name}:"), 0, wx.ALIGN_CENTER_VERTICAL)
+            range_grid.Add(slider_min, 1, wx.EXPAND)
+            range_grid.Add(slider_max, 1, wx.EXPAND)
+            slider_min.Bind(wx.EVT_SLIDER, self.on_range_change)
+            slider_max.Bind(wx.EVT_SLIDER, self.on_range_change)
+            self.range_sliders[db_name] = (slider_min, slider_max)
+
+        range_sizer.Add(range_grid, 0, wx.EXPAND | wx.ALL, 5)
+
+        # Метка с количеством найденных моделей (обновляется при движении ползунков)
+        self.range_count = wx.StaticText(self, label="Найдено моделей: 0")
+        range_sizer.Add(self.range_count, 0, wx.ALL, 5)
+        sizer.Add(range_sizer, 0, wx.EXPAND | wx.ALL, 5)
+
         # Создание группы "Доступные модели"
         models_box = wx.StaticBox(self, label="Доступные модели")
         # Контейнер для списка моделей
@@ -87,10 +135,14 @@ class ModelSelectorPanel(wx.Panel):
         # Добавление контейнера списка в основной контейнер
         sizer.Add(models_sizer, 1, wx.EXPAND | wx.ALL, 5)
 
-        # Создание кнопки "Выбрать модель"
+        # Кнопки "Выбрать модель" и "Похожие модели" (подбор замены по параметрам)
+        select_sizer = wx.BoxSizer(wx.HORIZONTAL)
         self.select_btn = wx.Button(self, label="Выбрать модель")
-        # Добавление кнопки в основной контейнер с отступами сверху и снизу
-        sizer.Add(self.select_btn, 0, wx.ALIGN_CENTER | wx.TOP | wx.BOTTOM, 10)
+        self.similar_btn = wx.Button(self, label="Похожие модели")
+        select_sizer.Add(self.select_btn, 0, wx.RIGHT, 5)
+        select_sizer.Add(self.similar_btn, 0)
+        # Добавление кнопок в основной контейнер с отступами сверху и снизу
+        sizer.Add(select_sizer, 0, wx.ALIGN_CENTER | wx.TOP | wx.BOTTOM, 10)
 
         # Установка основного контейнера для панели
         self.SetSizer(sizer)
@@ -108,14 +160,22 @@ class ModelSelectorPanel(wx.Panel):
         self.models_list.Bind(wx.EVT_LISTBOX_DCLICK, self.on_double_click)
         # - Нажатие кнопки выбора
         self.select_btn.Bind(wx.EVT_BUTTON, self.on_select)
+        # - Нажатие кнопки подбора похожих моделей
+        self.similar_btn.Bind(wx.EVT_BUTTON, self.on_similar)
 
         # Подключение к базе данных
         self.connect_db()
         # Загрузка всех моделей из БД
         self.load_all_models()
 
-        # Начальное состояние кнопки выбора (отключена)
+        # Подписка на изменения каталога (обновление списка и снимка по измененным ID)
+        self.feed = get_feed(self.db_path)
+        self.feed.subscribe(self.refresh_models)
+        self.Bind(wx.EVT_WINDOW_DESTROY, self.on_destroy)
+
+        # Начальное состояние кнопок выбора (отключены)
         self.select_btn.Disable()
+        self.similar_btn.Disable()
 
     def connect_db(self):
         """Устанавливает соединение с базой данных"""
@@ -124,6 +184,8 @@ class ModelSelectorPanel(wx.Panel):
             self.conn = sqlite3.connect(self.db_path)
             # Создание курсора для выполнения запросов
             self.cursor = self.conn.cursor()
+            # Индекс для фильтра по диапазонам параметров
+            ensure_range_indexes(self.conn)
         except sqlite3.Error as e:
             # Вывод сообщения об ошибке при проблемах с подключением к базе
             wx.MessageBox(f"Ошибка подключения к базе данных: {str(e)}", "Ошибка", wx.OK | wx.ICON_ERROR)
@@ -135,16 +197,84 @@ class ModelSelectorPanel(wx.Panel):
             return
 
         try:
-            # Выполнение SQL-запроса для получения всех уникальных моделей
-            self.cursor.execute("SELECT DISTINCT Model FROM Base ORDER BY Model")
-            # Сохранение результатов в список (только непустые значения)
-            self.all_models = [row[0] for row in self.cursor.fetchall() if row[0]]
+            # Общий каталог всех окон и станций (загружается один раз, см. catalog_cache.py)
+            self.catalog = get_catalog_cache(self.db_path)
+            self.all_models = self.catalog.models
+            # Колоночный снимок для векторной фильтрации без запросов к базе (только чтение)
+            self.snapshot = self.catalog.snapshot
+            # Без фильтра по диапазонам доступны все модели
+            self.range_models = self.all_models
+            # Настройка ползунков по границам значений в базе
+            self.init_range_sliders()
             # Заполнение списка моделей в интерфейсе
             self.models_list.Set(self.all_models)
+            self.range_count.SetLabel(f"Найдено моделей: {len(self.all_models)}")
         except sqlite3.Error as e:
             # Вывод сообщения об ошибке при проблемах с загрузкой
             wx.MessageBox(f"Ошибка загрузки моделей: {str(e)}", "Ошибка", wx.OK | wx.ICON_ERROR)
 
+    def init_range_sliders(self):
+        """Устанавливает пределы ползунков по минимальным и максимальным значениям в базе."""
+        if self.snapshot is not None:
+            bounds = {db_name: self.snapshot.stats(db_name)[:2] for db_name, _ in RANGE_COLUMNS}
+        else:
+            bounds = get_column_bounds(self.cursor)
+        for db_name, (slider_min, slider_max) in self.range_sliders.items():
+            low, high = bounds[db_name]
+            low, high = low or 0, high or 0
+            low, high = int(math.floor(low)), int(math.ceil(high))
+            for slider in (slider_min, slider_max):
+                slider.SetRange(low, max(high, low + 1))
+            slider_min.SetValue(low)
+            slider_max.SetValue(max(high, low + 1))
+
+    def get_ranges(self):
+        """Возвращает текущие диапазоны ползунков.
+
+        Returns:
+            dict: {имя колонки: (нижняя граница, верхняя граница)}
+        """
+        ranges = {}
+        for db_name, (slider_min, slider_max) in self.range_sliders.items():
+            low, high = slider_min.GetValue(), slider_max.GetValue()
+            # Ползунок в крайнем положении не ограничивает выборку
+            ranges[db_name] = (
+                None if low <= slider_min.GetMin() else low,
+                None if high >= slider_max.GetMax() else high,
+            )
+        return ranges
+
+    def on_range_change(self, event):
+        """Обновление списка моделей и счетчика при движении ползунков.
+
+        Args:
+            event: Событие wxPython
+        """
+        slider = event.GetEventObject()
+        # Не даем нижней границе превысить верхнюю
+        for slider_min, slider_max in self.range_sliders.values():
+            if slider_min.GetValue() > slider_max.GetValue():
+                if slider is slider_min:
+                    slider_max.SetValue(slider_min.GetValue())
+                else:
+                    slider_min.SetValue(slider_max.GetValue())
+
+        self.apply_ranges()
+
+    def apply_ranges(self):
+        """Применяет фильтр по диапазонам к списку моделей."""
+        try:
+            if self.snapshot is not None:
+                self.range_models = self.snapshot.filter_models(self.get_ranges())
+            else:
+                self.range_models = find_models_in_ranges(self.cursor, self.get_ranges())
+        except sqlite3.Error as e:
+            wx.MessageBox(f"Ошибка фильтрации моделей: {str(e)}", "Ошибка", wx.OK | wx.ICON_ERROR)
+            return
+
+        self.range_count.SetLabel(f"Найдено моделей: {len(self.range_models)}")
+        self.on_search_text(None)
+
     def on_search_text(self, event):
         """Фильтрация списка моделей при вводе текста в поле поиска.
 
@@ -153,15 +283,20 @@ class ModelSelectorPanel(wx.Panel):
         """
         # Получение текста из поля поиска (в нижнем регистре)
         search_str = self.search_text.GetValue().lower()
+        # Set сбрасывает выделение - выбранная модель восстанавливается, если осталась в списке
+        selected = self.models_list.GetStringSelection()
 
         if search_str:
-            # Фильтрация списка моделей по введенному тексту
-            filtered = [m for m in self.all_models if search_str in m.lower()]
+            # Фильтрация списка моделей по введенному тексту (в пределах фильтра по параметрам)
+            filtered = [m for m in self.range_models if search_str in m.lower()]
             # Обновление списка в интерфейсе
             self.models_list.Set(filtered)
         else:
-            # Если поле поиска пустое, показываем все модели
-            self.models_list.Set(self.all_models)
+            # Если поле поиска пустое, показываем модели, прошедшие фильтр по параметрам
+            self.models_list.Set(self.range_models)
+
+        if selected:
+            self.models_list.SetStringSelection(selected)
 
     def on_search(self, event):
         """Обработка поиска модели (по нажатию Enter или кнопки).
@@ -194,6 +329,49 @@ class ModelSelectorPanel(wx.Panel):
         if selection != wx.NOT_FOUND:
             # Активация кнопки выбора, если элемент выбран
             self.select_btn.Enable()
+            # Подбор похожих моделей доступен только при наличии снимка каталога
+            self.similar_btn.Enable(self.snapshot is not None)
+
+    def on_similar(self, event):
+        """Показывает в списке модели, ближайшие к выбранной по номинальным параметрам.
+
+        Args:
+            event: Событие wxPython (не используется)
+        """
+        selection = self.models_list.GetSelection()
+        if selection == wx.NOT_FOUND or self.snapshot is None:
+            return
+        model = self.models_list.GetString(selection)
+        code = self.snapshot.model_index.get(model)
+        if code is None:
+            return
+
+        # Параметры выбранной модели берутся из снимка (первая запись с этим названием)
+        index = int((self.snapshot.model_codes == code).argmax())
+        columns = [db_name for db_name, _ in RANGE_COLUMNS]
+        target = {name: self.snapshot.data[name][index] for name in columns}
+        similar = self.snapshot.nearest_models(target, columns, exclude=model)
+
+        self.models_list.Set([model] + similar)
+        self.models_list.SetSelection(0)
+        self.range_count.SetLabel(f"Похожих моделей: {len(similar)}")
+
+    def on_destroy(self, event):
+        """Отписка от ленты изменений при уничтожении панели."""
+        if event.GetEventObject() is self:
+            self.feed.unsubscribe(self.refresh_models)
+        event.Skip()
+
+    def refresh_models(self, ids):
+        """Обновляет список моделей после изменения записей каталога.
+
+        Args:
+            ids: ID измененных записей
+        """
+        # Снимок общий: изменения применяются один раз для всех панелей
+        self.catalog.refresh(ids)
+        self.all_models = self.catalog.models
+        self.apply_ranges()
 
     def on_double_click(self, event):
         """Обработка двойного клика по модели в списке.
@@ -216,25 +394,14 @@ class ModelSelectorPanel(wx.Panel):
             # Получение названия выбранной модели
             model = self.models_list.GetString(selection)
             try:
-                # Запрос всех параметров выбранной модели из БД
-                self.cursor.execute("SELECT * FROM Base WHERE Model = ?", (model,))
-                row = self.cursor.fetchone()
-                if row:
-                    # Создание словаря параметров модели
-                    params = {}
-                    # Получение названий колонок из описания курсора
-                    columns = [col[0] for col in self.cursor.description]
-
-                    # Заполнение словаря параметров
-                    for i, value in enumerate(row):
-                        col_name = columns[i]
-                        params[col_name] = value
-
+                # Запрос всех параметров выбранной модели из БД (запись MotorModel)
+                motor = fetch_model(self.conn, model)
+                if motor:
                     # Получение родительского элемента (предполагается, что это вкладка)
                     parent_tab = self.GetParent()
                     # Если у родителя есть метод set_selected_model, вызываем его
                     if hasattr(parent_tab, 'set_selected_model'):
-                        parent_tab.set_selected_model(params)
+                        parent_tab.set_selected_model(motor)
                 else:
                     # Если параметры не найдены, показываем сообщение
                     wx.MessageBox(f"Параметры для модели '{model}' не найдены",
@@ -262,7 +429,7 @@ class EDParametersPanel(wx.Panel):
         """
         super().__init__(parent)
         # Установка цвета фона панели
-        self.SetBackgroundColour(wx.Colour(250, 252, 255))
+        self.SetBackgroundColour(colour("panel"))
 
         # Инициализация переменных для работы с БД
         self.db_path = db_path
@@ -277,9 +444,9 @@ class EDParametersPanel(wx.Panel):
         # Создание заголовка панели
         title = wx.StaticText(self, label="Номинальные параметры ЭД")
         # Настройка шрифта заголовка
-        title.SetFont(wx.Font(14, wx.FONTFAMILY_DEFAULT, wx.FONTSTYLE_NORMAL, wx.FONTWEIGHT_BOLD))
+        title.SetFont(font(14))
         # Установка цвета текста заголовка
-        title.SetForegroundColour(wx.Colour(0, 50, 100))
+        title.SetForegroundColour(colour("title"))
         # Добавление заголовка в контейнер
         main_sizer.Add(title, 0, wx.ALL | wx.ALIGN_CENTER, 10)
 
@@ -292,22 +459,13 @@ class EDParametersPanel(wx.Panel):
         # Разрешение растягивания второй колонки
         self.params_sizer.AddGrowableCol(1)
 
-        # Список параметров с их отображаемыми названиями
-        self.param_names = [
-            ("ID", "ID"),  # Скрытый параметр
-            ("Model", "Модель"),
-            ("Power_nom", "Номинальная мощность, кВт"),
-            # ... остальные параметры ...
-        ]
-
-        # Создание элементов управления для каждого параметра
-        for db_name, ru_name in self.param_names:
-            if db_name == "ID":  # Пропускаем поле ID
-                continue
+        # Создание элементов управления для каждого параметра из реестра колонок (без ID)
+        for column in DATA_COLUMNS:
+            db_name = column.name
 
             # Создание метки с названием параметра
-            label = wx.StaticText(self.scrolled_panel, label=f"{ru_name}:")
-            label.SetFont(wx.Font(9, wx.FONTFAMILY_DEFAULT, wx.FONTSTYLE_NORMAL, wx.FONTWEIGHT_NORMAL))
+            label = wx.StaticText(self.scrolled_panel, label=f"{column.title}:")
+            label.SetFont(font(9, bold=False))
 
             # Создание поля ввода для параметра
             if db_name == "Model":
@@ -342,6 +500,11 @@ class EDParametersPanel(wx.Panel):
         # Подключение к базе данных
         self.connect_db()
 
+        # Подписка на изменения каталога (перечитывание текущей модели)
+        self.feed = get_feed(self.db_path)
+        self.feed.subscribe(self.apply_changes)
+        self.Bind(wx.EVT_WINDOW_DESTROY, self.on_destroy)
+
         # Начальное состояние кнопки сохранения (отключена)
         self.save_btn.Disable()
 
@@ -353,19 +516,42 @@ class EDParametersPanel(wx.Panel):
         except sqlite3.Error as e:
             wx.MessageBox(f"Ошибка подключения к базе данных: {str(e)}", "Ошибка", wx.OK | wx.ICON_ERROR)
 
-    def set_parameters(self, params):
-        """Заполняет поля параметров значениями из словаря.
+    def on_destroy(self, event):
+        """Отписка от ленты изменений при уничтожении панели."""
+        if event.GetEventObject() is self:
+            self.feed.unsubscribe(self.apply_changes)
+        event.Skip()
+
+    def apply_changes(self, ids):
+        """Перечитывает текущую модель, если она была изменена.
+
+        Args:
+            ids: ID измененных записей
+        """
+        if self.current_model_id is None or self.current_model_id not in ids:
+            return
+        motor = fetch_model_by_id(self.conn, self.current_model_id)
+        if motor is None:
+            # Модель удалена из каталога
+            self.current_model_id = None
+            for ctrl in self.param_controls.values():
+                ctrl.SetValue("")
+            self.save_btn.Disable()
+        else:
+            self.set_parameters(motor)
+
+    def set_parameters(self, motor):
+        """Заполняет поля параметров значениями записи каталога.
 
         Args:
-            params (dict): Словарь параметров модели
+            motor (MotorModel): Запись каталога
         """
         # Сохранение ID текущей модели
-        self.current_model_id = params.get("ID", None)
+        self.current_model_id = motor.ID
 
-        # Заполнение полей ввода значениями из словаря
+        # Заполнение полей ввода значениями записи
         for db_name, ctrl in self.param_controls.items():
-            value = params.get(db_name, "")
-            ctrl.SetValue(str(value))
+            ctrl.SetValue(str(motor.get(db_name, "")))
 
         # Активация кнопки сохранения
         self.save_btn.Enable()
@@ -381,11 +567,15 @@ class EDParametersPanel(wx.Panel):
             wx.MessageBox("Не выбрана модель для сохранения", "Ошибка", wx.OK | wx.ICON_ERROR)
             return
 
-        # Сбор измененных данных
-        update_data = {}
-        for db_name, ctrl in self.param_controls.items():
-            if db_name != "Model":  # Поле "Модель" не обновляем
-                update_data[db_name] = ctrl.GetValue()
+        # Сбор измененных данных и проверка по реестру колонок (поле "Модель" не обновляем)
+        columns = [column for column in DATA_COLUMNS if column.name != "Model"]
+        cells = [self.param_controls[column.name].GetValue() for column in columns]
+        values, errors = validate_rows([(0, cells)], columns)
+        if errors:
+            wx.MessageBox("Некорректные значения параметров:\n" + "\n".join(error.message for error in errors),
+                          "Ошибка", wx.OK | wx.ICON_ERROR)
+            return
+        update_data = dict(zip((column.name for column in columns), values[0]))
 
         # Формирование SQL-запроса для обновления
         set_clause = ", ".join([f"{k} = ?" for k in update_data.keys()])
@@ -397,6 +587,8 @@ class EDParametersPanel(wx.Panel):
             query = f"UPDATE Base SET {set_clause} WHERE ID = ?"
             self.cursor.execute(query, values)
             self.conn.commit()  # Подтверждение изменений
+            # Рассылка изменений остальным представлениям каталога
+            self.feed.poll()
             wx.MessageBox("Изменения успешно сохранены", "Сохранено", wx.OK | wx.ICON_INFORMATION)
         except sqlite3.Error as e:
             # Обработка ошибок при сохранении
@@ -412,11 +604,18 @@ class EDParametersPanel(wx.Panel):
 class DatabaseTab(wx.Panel):
     def __init__(self, parent):
         super().__init__(parent)
-        self.SetBackgroundColour(wx.Colour(240, 245, 250))  # Основной фон
+        self.SetBackgroundColour(colour("window"))  # Основной фон
 
         self.db_path = "baseReda.db"
         self.conn = None
         self.cursor = None
+        self.dirty_rows = set()  # Строки таблицы, измененные после загрузки
+        self.row_by_id = {}  # ID записи (строка) -> индекс строки таблицы
+        self.error_cells = set()  # Ячейки, подсвеченные как ошибочные
+
+        # Атрибут подсветки ошибочных ячеек создается один раз и разделяется всеми ячейками
+        self.error_attr = gridlib.GridCellAttr()
+        self.error_attr.SetBackgroundColour(colour("error_cell"))
 
         # Создаем соединение с базой данных
         self.connect_db()
@@ -424,30 +623,12 @@ class DatabaseTab(wx.Panel):
         main_sizer = wx.BoxSizer(wx.VERTICAL)
 
         # Создаем таблицу для отображения данных
-        self.grid = wx.grid.Grid(self, -1)
-        self.grid.CreateGrid(0, 22)  # Создаем пустую таблицу
-        self.grid.SetColLabelValue(0, "ID")
-        self.grid.SetColLabelValue(1, "Model")
-        self.grid.SetColLabelValue(2, "Power_nom")
-        self.grid.SetColLabelValue(3, "U_nom")
-        self.grid.SetColLabelValue(4, "I_nom")
-        self.grid.SetColLabelValue(5, "Turning")
-        self.grid.SetColLabelValue(6, "R_ColdWinding")
-        self.grid.SetColLabelValue(7, "R_Insul")
-        self.grid.SetColLabelValue(8, "U_accel")
-        self.grid.SetColLabelValue(9, "BoringMoment")
-        self.grid.SetColLabelValue(10, "U_k_z")
-        self.grid.SetColLabelValue(11, "I_k_z")
-        self.grid.SetColLabelValue(12, "P_h_h")
-        self.grid.SetColLabelValue(13, "I_Iding")
-        self.grid.SetColLabelValue(14, "U_Iding")
-        self.grid.SetColLabelValue(15, "P_k_z")
-        self.grid.SetColLabelValue(16, "Time_RunDown")
-        self.grid.SetColLabelValue(17, "Vibri_evel")
-        self.grid.SetColLabelValue(18, "TurningMoment")
-        self.grid.SetColLabelValue(19, "P_HeatedWaste")
-        self.grid.SetColLabelValue(20, "U_MinInsulWinding")
-        self.grid.SetColLabelValue(21, "U_InsulWinding")
+        self.grid = gridlib.Grid(self, -1)
+        self.grid.CreateGrid(0, len(COLUMNS))  # Создаем пустую таблицу
+        for col_index, column in enumerate(COLUMNS):
+            self.grid.SetColLabelValue(col_index, column.name)
+        # Отслеживаем измененные строки для пакетной проверки и сохранения
+        self.grid.Bind(gridlib.EVT_GRID_CELL_CHANGED, self.on_cell_changed)
 
         main_sizer.Add(self.grid, 1, wx.EXPAND | wx.ALL, 5)
 
@@ -462,8 +643,8 @@ class DatabaseTab(wx.Panel):
 
         # Стилизуем кнопки
         for btn in [self.btn_add, self.btn_delete, self.btn_save, self.btn_refresh]:
-            btn.SetFont(wx.Font(10, wx.FONTFAMILY_DEFAULT, wx.FONTSTYLE_NORMAL, wx.FONTWEIGHT_BOLD))
-            btn.SetBackgroundColour(wx.Colour(70, 130, 180))  # Приятный синий
+            btn.SetFont(font(10))
+            btn.SetBackgroundColour(colour("accent"))  # Приятный синий
             btn.SetForegroundColour(wx.WHITE)
 
         btn_sizer.Add(self.btn_add, 0, wx.ALL, 5)
@@ -485,6 +666,11 @@ class DatabaseTab(wx.Panel):
         # Загрузка данных из базы
         self.load_data()
 
+        # Подписка на изменения каталога (обновление только измененных строк)
+        self.feed = get_feed(self.db_path)
+        self.feed.subscribe(self.apply_changes)
+        self.Bind(wx.EVT_WINDOW_DESTROY, self.on_destroy)
+
     def connect_db(self):
         """Установка соединения с базой данных"""
         try:
@@ -496,32 +682,7 @@ class DatabaseTab(wx.Panel):
 
     def ensure_table_exists(self):
         """Создание таблицы, если она не существует"""
-        create_table_query = """
-        CREATE TABLE IF NOT EXISTS Base (
-            ID INTEGER PRIMARY KEY AUTOINCREMENT,
-            Model TEXT,
-            Power_nom INTEGER,
-            U_nom INTEGER,
-            I_nom REAL,
-            Turning INTEGER,
-            R_ColdWinding REAL,
-            R_Insul INTEGER,
-            U_accel INTEGER,
-            BoringMoment REAL,
-            U_k_z INTEGER,
-            I_k_z INTEGER,
-            P_h_h REAL,
-            I_Iding REAL,
-            U_Iding REAL,
-            P_k_z INTEGER,
-            Time_RunDown REAL,
-            Vibri_evel REAL,
-            TurningMoment REAL,
-            P_HeatedWaste REAL,
-            U_MinInsulWinding INTEGER,
-            U_InsulWinding INTEGER
-        )
-        """
+        create_table_query = create_table_sql()
         self.cursor.execute(create_table_query)
         self.conn.commit()
 
@@ -531,7 +692,7 @@ class DatabaseTab(wx.Panel):
             return
 
         try:
-            self.cursor.execute("SELECT * FROM Base")
+            self.cursor.execute(f"SELECT {', '.join(COLUMN_NAMES)} FROM Base")
             rows = self.cursor.fetchall()
 
             # Очистка таблицы
@@ -546,12 +707,91 @@ class DatabaseTab(wx.Panel):
                     if value is None:
                         value = ""
                     self.grid.SetCellValue(row_index, col_index, str(value))
+
+            # После перезагрузки таблица совпадает с базой
+            self.rebuild_row_index()
+            self.dirty_rows.clear()
+            self.error_cells.clear()
+        except sqlite3.Error as e:
+            wx.MessageBox(f"Ошибка загрузки данных: {str(e)}", "Ошибка", wx.OK | wx.ICON_ERROR)
+
+    def rebuild_row_index(self):
+        """Перестраивает соответствие ID записи и строки таблицы"""
+        self.row_by_id = {self.grid.GetCellValue(row, 0): row for row in range(self.grid.GetNumberRows())}
+
+    def on_destroy(self, event):
+        """Отписка от ленты изменений при уничтожении вкладки"""
+        if event.GetEventObject() is self:
+            self.feed.unsubscribe(self.apply_changes)
+        event.Skip()
+
+    def apply_changes(self, ids):
+        """Обновляет только строки измененных записей
+
+        Строки с несохраненными правками пользователя не перезаписываются.
+
+        Args:
+            ids: ID измененных записей
+        """
+        ids = list(ids)
+        placeholders = ", ".join("?" * len(ids))
+        try:
+            self.cursor.execute(f"SELECT {', '.join(COLUMN_NAMES)} FROM Base WHERE ID IN ({placeholders})", ids)
+            rows = {str(row[0]): row for row in self.cursor.fetchall()}
         except sqlite3.Error as e:
             wx.MessageBox(f"Ошибка загрузки данных: {str(e)}", "Ошибка", wx.OK | wx.ICON_ERROR)
+            return
+
+        removed = []
+        for row_id in map(str, ids):
+            grid_row = self.row_by_id.get(row_id)
+            if grid_row is not None and grid_row in self.dirty_rows:
+                continue
+            values = rows.get(row_id)
+            if values is None:
+                if grid_row is not None:
+                    removed.append(grid_row)
+                continue
+            if grid_row is None:
+                self.grid.AppendRows(1)
+                grid_row = self.grid.GetNumberRows() - 1
+                self.row_by_id[row_id] = grid_row
+            for col_index, value in enumerate(values):
+                self.grid.SetCellValue(grid_row, col_index, "" if value is None else str(value))
+
+        # Удаление строк снизу вверх, чтобы не сдвигать еще не удаленные
+        if removed:
+            for grid_row in sorted(removed, reverse=True):
+                self.grid.DeleteRows(grid_row, 1)
+                self.dirty_rows = {row - 1 if row > grid_row else row for row in self.dirty_rows}
+            self.error_cells.clear()
+            self.rebuild_row_index()
+
+    def on_cell_changed(self, event):
+        """Отмечает строку как измененную"""
+        self.dirty_rows.add(event.GetRow())
+        event.Skip()
 
     def on_add(self, event):  # noqa: unused-argument
         """Добавление новой пустой строки"""
         self.grid.AppendRows(1)
+        self.dirty_rows.add(self.grid.GetNumberRows() - 1)
+
+    def highlight_errors(self, errors):
+        """Подсвечивает ошибочные ячейки и снимает подсветку с исправленных
+
+        Args:
+            errors (list): Список ValidationError
+        """
+        cells = {(error.row, error.col) for error in errors}
+        for row, col in self.error_cells - cells:
+            self.grid.SetAttr(row, col, None)
+        for row, col in cells - self.error_cells:
+            # Таблица забирает ссылку на атрибут, поэтому увеличиваем счетчик ссылок
+            self.error_attr.IncRef()
+            self.grid.SetAttr(row, col, self.error_attr)
+        self.error_cells = cells
+        self.grid.ForceRefresh()
 
     def on_delete(self, event):  # noqa: unused-argument
         """Удаление выбранных строк"""
@@ -569,97 +809,88 @@ class DatabaseTab(wx.Panel):
             except (ValueError, sqlite3.Error) as e:
                 wx.MessageBox(f"Ошибка удаления записи: {str(e)}", "Ошибка", wx.OK | wx.ICON_ERROR)
 
-        # Обновляем таблицу
-        self.load_data()
+        # Обновляем таблицу и остальные представления по ленте изменений
+        self.feed.poll()
 
     def on_save(self, event):  # noqa: unused-argument
         """Сохранение изменений в базе данных"""
         if not self.cursor:
             return
 
+        if not self.dirty_rows:
+            wx.MessageBox("Нет изменений для сохранения", "Сохранение", wx.OK | wx.ICON_INFORMATION)
+            return
+
+        # Проверяем весь набор изменений за один проход, база не затрагивается
+        rows = sorted(self.dirty_rows)
+        edits = [(row, [self.grid.GetCellValue(row, col) for col in range(1, len(COLUMNS))]) for row in rows]
+        values, errors = validate_rows(edits)
+        self.highlight_errors(errors)
+        if errors:
+            details = "\n".join(f"Строка {error.row + 1}: {error.message}" for error in errors[:10])
+            if len(errors) > 10:
+                details += f"\n... и еще {len(errors) - 10}"
+            wx.MessageBox(f"Изменения не сохранены, исправьте ошибки:\n{details}",
+                          "Ошибка проверки", wx.OK | wx.ICON_WARNING)
+            return
+
         try:
-            for row in range(self.grid.GetNumberRows()):
-                row_id = self.grid.GetCellValue(row, 0)
+            # Определяем одним запросом, какие записи уже есть в базе
+            row_ids = {row: self.grid.GetCellValue(row, 0) for row in rows}
+            known_ids = [row_id for row_id in row_ids.values() if row_id]
+            existing = set()
+            if known_ids:
+                placeholders = ", ".join("?" * len(known_ids))
+                self.cursor.execute(f"SELECT ID FROM Base WHERE ID IN ({placeholders})", known_ids)
+                existing = {str(found[0]) for found in self.cursor.fetchall()}
+
+            # Обновление существующих записей одним пакетом
+            updates = [tuple(values[row] + [row_ids[row]]) for row in rows if row_ids[row] in existing]
+            if updates:
+                self.cursor.executemany(self.update_query, updates)
+
+            # Вставка новых записей (параметры ЭД)
+            for row in rows:
+                if row_ids[row] in existing:
+                    continue
+                self.cursor.execute(self.insert_query, tuple(values[row]))
 
-                # Проверяем, существует ли запись в базе
-                if row_id:
-                    self.cursor.execute("SELECT * FROM Base WHERE ID = ?", (row_id,))
-                    exists = self.cursor.fetchone()
-                else:
-                    exists = False
-
-                # Подготавливаем данные
-                data = []
-                for col in range(1, 22):  # Пропускаем ID (col 0)
-                    value = self.grid.GetCellValue(row, col)
-                    # Преобразуем пустые строки в None
-                    if value == "":
-                        data.append(None)
-                    else:
-                        # Пытаемся преобразовать в число
-                        try:
-                            if col in [2, 3, 5, 7, 8, 10, 11, 15, 20, 21]:  # Целочисленные поля
-                                data.append(int(value))
-                            elif col in [4, 6, 9, 12, 13, 14, 16, 17, 18, 19]:  # Вещественные поля
-                                data.append(float(value))
-                            else:
-                                data.append(value)
-                        except ValueError:
-                            data.append(value)
-
-                # Обновление или вставка (параметры ЭД)
-                if exists:
-                    update_query = """
-                    UPDATE Base SET
-                        Model = ?,
-                        Power_nom = ?,
-                        U_nom = ?,
-                        I_nom = ?,
-                        Turning = ?,
-                        R_ColdWinding = ?,
-                        R_Insul = ?,
-                        U_accel = ?,
-                        BoringMoment = ?,
-                        U_k_z = ?,
-                        I_k_z = ?,
-                        P_h_h = ?,
-                        I_Iding = ?,
-                        U_Iding = ?,
-                        P_k_z = ?,
-                        Time_RunDown = ?,
-                        Vibri_evel = ?,
-                        TurningMoment = ?,
-                        P_HeatedWaste = ?,
-                        U_MinInsulWinding = ?,
-                        U_InsulWinding = ?
-                    WHERE ID = ?
-                    """
-                    self.cursor.execute(update_query, tuple(data + [row_id]))
-                else:
-                    insert_query = """
-                    INSERT INTO Base (
-                        Model, Power_nom, U_nom, I_nom, Turning, R_ColdWinding, 
-                        R_Insul, U_accel, BoringMoment, U_k_z, I_k_z, P_h_h, 
-                        I_Iding, U_Iding, P_k_z, Time_RunDown, Vibri_evel, 
-                        TurningMoment, P_HeatedWaste, U_MinInsulWinding, U_InsulWinding
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """
-                    self.cursor.execute(insert_query, tuple(data))
-
-                    # Получаем ID новой записи
-                    new_id = self.cursor.lastrowid
-                    self.grid.SetCellValue(row, 0, str(new_id))
+                # Получаем ID новой записи (назначен при вставке, см. catalog.INSERT_NEXT_ID)
+                self.cursor.execute("SELECT ID FROM Base WHERE rowid = ?", (self.cursor.lastrowid,))
+                new_id = self.cursor.fetchone()[0]
+                self.grid.SetCellValue(row, 0, str(new_id))
+                self.row_by_id[str(new_id)] = row
 
             self.conn.commit()
+            self.dirty_rows.clear()
+            # Рассылка изменений остальным представлениям каталога
+            self.feed.poll()
             wx.MessageBox("Изменения успешно сохранены", "Сохранено", wx.OK | wx.ICON_INFORMATION)
 
         except sqlite3.Error as e:
             wx.MessageBox(f"Ошибка сохранения данных: {str(e)}", "Ошибка", wx.OK | wx.ICON_ERROR)
             self.conn.rollback()
 
+    @property
+    def update_query(self):
+        """Запрос обновления записи, построенный по реестру колонок"""
+        set_clause = ", ".join(f"{column.name} = ?" for column in DATA_COLUMNS)
+        return f"UPDATE Base SET {set_clause} WHERE ID = ?"
+
+    @property
+    def insert_query(self):
+        """Запрос вставки записи, построенный по реестру колонок (ID - следующий за наибольшим)"""
+        names = ", ".join(column.name for column in DATA_COLUMNS)
+        placeholders = ", ".join("?" * len(DATA_COLUMNS))
+        return f"INSERT INTO Base (ID, {names}) VALUES ({INSERT_NEXT_ID}, {placeholders})"
+
     def on_refresh(self, event):  # noqa: unused-argument
         """Обновление данных из базы"""
-        self.load_data()
+        if self.dirty_rows:
+            # Несохраненные правки отменяются полной перезагрузкой
+            self.load_data()
+        else:
+            self.feed.poll()
 
     def __del__(self):
         """Закрытие соединения при уничтожении объекта"""
@@ -669,18 +900,26 @@ class DatabaseTab(wx.Panel):
 
 class ColdInputResistanceDialog(wx.Dialog):
     def __init__(self, parent, title, description):
-        super().__init__(parent, title=title, size=wx.Size(600, 500))
+        super().__init__(parent, title=title, size=wx.Size(600, 700))
         self.parent = parent
-        self.ser = None
-        self.measurement_thread = None
+        self.test_title = title
+        self.measurement_future = None
         self.running = False
-        self.measurement_stop = False
+        self.measurement_stop = threading.Event()
+        self.measurements = None  # Результаты последнего измерения
+        # Значения и журнал из потока измерений применяются к окну по таймеру (см. live_state.py)
+        self.live = LiveState()
+        self.ui_timer = wx.Timer(self)
 
         sizer = wx.BoxSizer(wx.VERTICAL)
 
+        # Сообщения испытания показываются в окне и не блокируют окна других станций
+        self.info_bar = wx.InfoBar(self)
+        sizer.Add(self.info_bar, 0, wx.EXPAND)
+
         # Заголовок теста
         title_label = wx.StaticText(self, label=title)
-        title_label.SetFont(wx.Font(14, wx.FONTFAMILY_DEFAULT, wx.FONTSTYLE_NORMAL, wx.FONTWEIGHT_BOLD))
+        title_label.SetFont(font(14))
         sizer.Add(title_label, 0, wx.ALL | wx.ALIGN_CENTER, 10)
 
         # Описание теста
@@ -721,6 +960,10 @@ class ColdInputResistanceDialog(wx.Dialog):
         params_sizer.Add(grid, 0, wx.EXPAND | wx.ALL, 10)
         sizer.Add(params_sizer, 0, wx.EXPAND | wx.ALL, 10)
 
+        # График показаний прибора
+        self.chart = TrendChart(self, ("resistance", "voltage"))
+        sizer.Add(self.chart, 0, wx.EXPAND | wx.LEFT | wx.RIGHT, 10)
+
         # Чек-боксы обкатки
         run_box = wx.StaticBox(self, label="Тип обкатки")
         run_sizer = wx.StaticBoxSizer(run_box, wx.HORIZONTAL)
@@ -765,12 +1008,42 @@ class ColdInputResistanceDialog(wx.Dialog):
         self.btn_stop.Bind(wx.EVT_BUTTON, self.on_stop)
         self.btn_save.Bind(wx.EVT_BUTTON, self.on_save)
         self.Bind(wx.EVT_CLOSE, self.on_close)
+        self.Bind(wx.EVT_TIMER, self.on_ui_timer, self.ui_timer)
 
-        # Настройка состояния кнопок
-        self.btn_stop.Disable()
+        # Поля окна, обновляемые из снимка значений
+        self.value_labels = {"resistance": self.resistance_value, "voltage": self.voltage_value,
+                             "polarization_index": self.polarization_value}
+
+        self.reset_state()
 
-        # Стартовое сообщение
-        self.log_message(f"Инициализация теста: {title}")
+    def reset_state(self):
+        """Возвращает диалог в начальное состояние (при повторном открытии)"""
+        self.running = False
+        self.measurements = None
+        self.live.clear()
+        self.chart.clear()
+        for label in self.value_labels.values():
+            label.SetLabel("0.00")
+        self.first_run.SetValue(False)
+        self.second_run.SetValue(False)
+        self.btn_start.Enable()
+        self.btn_stop.Disable()
+        self.btn_save.Enable()
+        self.info_bar.Dismiss()
+        self.log_text.Clear()
+        self.log_message(f"Инициализация теста: {self.test_title}")
+        self.ui_timer.Start(REFRESH_INTERVAL)
+
+    def on_ui_timer(self, event):  # noqa: unused-argument
+        """Применяет к окну изменившиеся значения и новые строки журнала"""
+        values, lines, dropped = self.live.take()
+        for name, value in values.items():
+            self.value_labels[name].SetLabel(f"{value:.2f}")
+        self.chart.refresh_plot()
+        if dropped:
+            lines.insert(0, f"... пропущено сообщений: {dropped}")
+        if lines:
+            self.log_text.AppendText("\n".join(lines) + "\n")
 
     def on_checkbox(self, event):
         # Гарантируем, что выбрана только одна обкатка
@@ -780,262 +1053,176 @@ class ColdInputResistanceDialog(wx.Dialog):
             self.first_run.SetValue(False)
 
     def log_message(self, message):
+        """Добавляет сообщение в журнал (из любого потока, выводится по таймеру)"""
         timestamp = time.strftime("%H:%M:%S", time.localtime())
-        self.log_text.AppendText(f"{timestamp} - {message}\n")
+        self.live.log(f"{timestamp} - {message}")
+
+    def notify(self, message, flags=wx.ICON_INFORMATION):
+        """Показывает сообщение в окне испытания без модального окна (в потоке интерфейса)"""
+        if not self:
+            return
+        self.log_message(message.replace("\n", " "))
+        self.info_bar.ShowMessage(message, flags)
 
     def on_start(self, event):  # noqa: unused-argument
         if not (self.first_run.GetValue() or self.second_run.GetValue()):
-            wx.MessageBox("Выберите тип обкатки!", "Ошибка", wx.OK | wx.ICON_WARNING)
+            self.notify("Выберите тип обкатки!", wx.ICON_WARNING)
             return
 
+        self.info_bar.Dismiss()
         self.log_message("Начинаем измерения...")
         self.btn_start.Disable()
         self.btn_stop.Enable()
         self.running = True
-        self.measurement_stop = False
+        # У каждого запуска свой признак остановки: поток предыдущего запуска его не сбросит
+        self.measurement_stop = threading.Event()
 
-        # Запускаем измерения в отдельном потоке
-        self.measurement_thread = threading.Thread(target=self.run_measurements)
-        self.measurement_thread.daemon = True
-        self.measurement_thread.start()
+        # Измерения выполняются рабочим потоком станции (стенды не ждут друг друга)
+        self.measurement_future = self.parent.station.submit(self.run_measurements, self.measurement_stop)
 
-    def run_measurements(self):
+    def run_measurements(self, stop):
         try:
-            # Инициализация COM-порта (указать правильный порт)
-            self.ser = serial.Serial(
-                port='COM7',  # Замените на актуальный порт
-                baudrate=9600,  # Скорость обмена
-                bytesize=serial.EIGHTBITS,
-                parity=serial.PARITY_NONE,
-                stopbits=serial.STOPBITS_ONE,
-                timeout=1  # Таймаут чтения (секунды)
-            )
-            self.log_message("COM-порт открыт")
+            # Порт прибора станции (см. stations.json)
+            port = open_port(self.parent.station.port)
         except Exception as e:
             self.log_message(f"Ошибка открытия COM-порта: {str(e)}")
             wx.CallAfter(self.on_measurement_error, f"Ошибка открытия COM-порта: {str(e)}")
+            wx.CallAfter(self.on_measurements_finished, stop)
             return
+        self.log_message("COM-порт открыт")
 
-        # Шаг 1: Удаленное управление
-        if not self.send_command("Rn", "OK"):
-            self.cleanup()
-            return
-
-        # Шаг 2: Включение прибора
-        if not self.send_command("Bd", "OK"):
-            self.cleanup()
-            return
-
-        # Шаг 3: Ожидание 1 минута
-        self.log_message("Ожидание 1 минута...")
-        for i in range(10): # 60
-            if self.measurement_stop:
-                break
-            time.sleep(1)
-            wx.CallAfter(self.log_message, f"Осталось: {20 - i} секунд") # 59 s
-
-        # Шаг 4: Отключение прибора
-        if not self.send_command("Bu", "OK"):
-            self.cleanup()
-            return
-
-        if not self.send_command("Bu", "OK"):
-            self.cleanup()
-            return
-
-        # Шаг 5: Настройка прибора (Df0040)
-        if not self.send_command("Df0040", "OK"):
-            self.cleanup()
-            return
-
-        # Шаг 6: Запрос показаний (Resistance Isolation)
-        resistance = self.get_measurement("Dg")
-        if resistance is None:
-            self.cleanup()
-            return
-
-        wx.CallAfter(self.resistance_value.SetLabel, f"{resistance:.2f}")
+        # Последовательность измерений выполняется ядром испытаний (instruments.py): порт принадлежит
+        # объекту прибора, ожидания прерываются признаком stop, команда отключения отправляется один раз
+        meter = Megohmmeter(port, log=self.log_message, stop=stop)
+        try:
+            measurements = measure_insulation(
+                meter, wait_seconds=10,  # 60
+                progress=lambda remaining: self.log_message(f"Осталось: {remaining} секунд"),
+                on_sample=lambda name, value: self.chart.add(name, time.monotonic(), value))
+            if measurements is not None:
+                self.show_results(measurements)
+        except InstrumentError as e:
+            wx.CallAfter(self.on_measurement_error, str(e))
+        finally:
+            meter.close()
+            self.log_message("COM-порт закрыт")
+            wx.CallAfter(self.on_measurements_finished, stop)
+
+    def show_results(self, measurements):
+        resistance = measurements["resistance"]
+        voltage = measurements["voltage"]
+        polarization_index = measurements["polarization_index"]
+        self.live.update(resistance=resistance, voltage=voltage, polarization_index=polarization_index)
         self.log_message(f"Сопротивление изоляции: {resistance:.2f} МОм")
-
-        # Шаг 7: Настройка прибора (Df0100)
-        if not self.send_command("Df0100", "OK"):
-            self.cleanup()
-            return
-
-        # Шаг 8: Запрос показаний (Voltage)
-        voltage = self.get_measurement("Dg")
-        if voltage is None:
-            self.cleanup()
-            return
-
-        wx.CallAfter(self.voltage_value.SetLabel, f"{voltage:.2f}")
         self.log_message(f"Напряжение: {voltage:.2f} В")
-
-        # Расчет индекса поляризации (примерная логика)
-        polarization_index = resistance / (voltage / 1000) if voltage > 0 else 0
-        wx.CallAfter(self.polarization_value.SetLabel, f"{polarization_index:.2f}")
         self.log_message(f"Индекс поляризации: {polarization_index:.2f}")
 
         # Проверка результатов
         self.check_results(resistance, voltage, polarization_index)
-
+        self.measurements = measurements
         self.log_message("Измерения завершены")
-        self.cleanup()
-        wx.CallAfter(self.btn_stop.Disable)
-        wx.CallAfter(self.btn_start.Enable)
-
-    def send_command(self, command, expected_response, max_retries=5):
-        """Отправка команды прибору с проверкой ответа"""
-        for attempt in range(max_retries):
-            if self.measurement_stop:
-                return False
-
-            try:
-                self.ser.write(f"{command}\r\n".encode('ascii'))
-                self.log_message(f"Отправлено: {command}")
-                print(self.ser.write(f"{command}\r\n".encode('ascii')))
-                print(f"Отправлено: {command}")
-
-                # Чтение ответа
-                response = b''
-                start_time = time.time()
-                while time.time() - start_time < 5:  # Таймаут 2 секунды
-                    if self.ser.in_waiting > 0:
-                        response += self.ser.read(self.ser.in_waiting)
-                        if response.endswith(b'\r\n'):
-                            break
-                    time.sleep(0.1)
-
-                response_str = response.decode('ascii', errors='ignore').strip()
-                self.log_message(f"Получено: {response_str}")
-
-                if expected_response in response_str:
-                    return True
-
-            except Exception as e:
-                self.log_message(f"Ошибка при отправке команды: {str(e)}")
-
-            self.log_message(f"Повторная попытка ({attempt + 1}/{max_retries})...")
-            time.sleep(0.5)
-
-        wx.CallAfter(self.on_measurement_error, f"Не получен ожидаемый ответ на команду: {command}")
-        return False
-
-    def get_measurement(self, command, max_retries=3):
-        """Получение числового значения измерения от прибора"""
-        for attempt in range(max_retries):
-            if self.measurement_stop:
-                return None
 
-            try:
-                self.ser.write(f"{command}\r\n".encode('ascii'))
-                self.log_message(f"Отправлено: {command}")
-
-                # Чтение ответа
-                response = b''
-                start_time = time.time()
-                while time.time() - start_time < 2:  # Таймаут 2 секунды
-                    if self.ser.in_waiting > 0:
-                        response += self.ser.read(self.ser.in_waiting)
-                        if response.endswith(b'\r'):
-                            break
-                    time.sleep(0.1)
-
-                response_str = response.decode('ascii', errors='ignore').strip()
-                self.log_message(f"Получено: {response_str}")
-
-                # Поиск числового значения в ответе
-                match = re.search(r'[-+]?\d*\.\d+|\d+', response_str)
-                if match:
-                    return float(match.group())
-
-            except Exception as e:
-                self.log_message(f"Ошибка при получении измерения: {str(e)}")
-
-            self.log_message(f"Повторная попытка ({attempt + 1}/{max_retries})...")
-            time.sleep(0.5)
-
-        wx.CallAfter(self.on_measurement_error, "Не удалось получить значение измерения")
-        return None
+    def on_measurements_finished(self, stop):
+        """Завершение потока измерений"""
+        if stop is not self.measurement_stop:
+            return  # Завершился поток предыдущего запуска
+        self.running = False
+        self.btn_stop.Disable()
+        self.btn_start.Enable()
 
-    @staticmethod
-    def check_results(resistance, voltage, polarization_index):
-        """Проверка результатов на соответствие нормативам"""
-        messages = []
-        if resistance < 100:
-            messages.append(f"Сопротивление изоляции {resistance:.2f} МОм < 100 МОм")
-        if voltage < 5000:
-            messages.append(f"Напряжение {voltage:.2f} В < 5000 В")
-        if polarization_index < 2.0:
-            messages.append(f"Индекс поляризации {polarization_index:.2f} < 2.0")
-
-        if messages:
-            message = "Обнаружены проблемы:\n" + "\n".join(messages)
-            wx.CallAfter(lambda: (wx.MessageBox, message, "Результаты проверки", wx.OK | wx.ICON_WARNING))
+    def check_results(self, resistance, voltage, polarization_index):
+        """Проверка результатов на соответствие нормативам (True - все параметры в норме)"""
+        problems = check_insulation(resistance, voltage, polarization_index)
+        if problems:
+            wx.CallAfter(self.notify, "Обнаружены проблемы:\n" + "\n".join(problems), wx.ICON_WARNING)
         else:
-            wx.CallAfter(lambda: wx.MessageBox("Все параметры в норме!", "Результаты проверки",
-                                               wx.OK | wx.ICON_INFORMATION))
+            wx.CallAfter(self.notify, "Все параметры в норме!")
+        return not problems
 
     def on_measurement_error(self, message):
-        self.log_message(f"Ошибка: {message}")
-        wx.MessageBox(message, "Ошибка измерения", wx.OK | wx.ICON_ERROR)
+        if not self:
+            return
+        self.notify(f"Ошибка измерения: {message}", wx.ICON_ERROR)
         self.btn_stop.Disable()
         self.btn_start.Enable()
 
-    def cleanup(self):
-        """Очистка ресурсов после измерений"""
-        if self.ser and self.ser.is_open:
-            try:
-                self.ser.close()
-                self.log_message("COM-порт закрыт")
-            except Exception as e:
-                logging.error(f"Необработанное исключение: {e}")
-        self.running = False
-
     def on_stop(self, event):  # noqa: unused-argument
         if not self.running:
             return
 
-        self.measurement_stop = True
-        self.log_message("Остановка измерений...")
-
-        # Попытка отправить команду отключения
-        if self.ser and self.ser.is_open:
-            try:
-                self.ser.write(b"Bu\r\n")
-                self.log_message("Отправлена команда отключения")
-            except Exception as e:
-                logging.error(f"Необработанное исключение: {e}")
-
-        wx.MessageBox("Остановлено пользователем!", "Внимание", wx.OK | wx.ICON_WARNING)
+        # Поток измерений сразу прерывает ожидание и сам отправляет прибору команду отключения
+        self.measurement_stop.set()
         self.btn_stop.Disable()
-        self.btn_start.Enable()
+        self.notify("Остановлено пользователем!", wx.ICON_WARNING)
 
     def on_save(self, event):  # noqa: unused-argument
-        # Здесь должна быть логика сохранения результатов
-        wx.MessageBox("Результаты измерений сохранены", "Сохранение", wx.OK | wx.ICON_INFORMATION)
+        if not self.measurements:
+            self.notify("Нет результатов измерений для сохранения", wx.ICON_WARNING)
+            return
+        station = self.parent.station
+        if station.session is None:
+            self.notify("Не открыт протокол испытаний", wx.ICON_WARNING)
+            return
+
+        # Поля строки протокола и исходные измеренные величины
+        results = insulation_results(self.measurements, self.second_run.GetValue())
+        self.btn_save.Disable()
+        # Запись в базу (ожидание общей очереди записи) и формирование протокола - в рабочем потоке станции
+        station.submit(self.save_results, station.session, results)
+
+    def save_results(self, session, results):
+        """Сохраняет результаты в хранилище и формирует протокол (рабочий поток станции)"""
+        try:
+            session.save(results, INSULATION_UNITS)
+        except sqlite3.Error as e:
+            wx.CallAfter(self.on_save_done, results, f"Ошибка сохранения результатов:\n{str(e)}")
+            return
+        wx.CallAfter(self.on_save_done, results, None)
+        self.render_protocol(session)
+
+    def on_save_done(self, results, error):
+        if not self:
+            return
+        self.btn_save.Enable()
+        if error:
+            self.notify(error, wx.ICON_ERROR)
+            return
+        if hasattr(self.parent, 'update_test_results'):
+            self.parent.update_test_results(results)
+        self.notify("Результаты измерений сохранены")
+
+    def render_protocol(self, session):
+        try:
+            for test in session.checkpoint() or []:
+                self.log_message(f"Испытание {test} не записано в файл протокола: ячейки шаблона не подтверждены "
+                                 "(результаты сохранены в базе)")
+        except Exception as e:
+            logging.error(f"Ошибка записи протокола: {e}")
+            wx.CallAfter(self.notify, f"Ошибка записи протокола:\n{str(e)}", wx.ICON_ERROR)
 
     def on_close(self, event):  # noqa: unused-argument
         if self.running:
             self.on_stop(None)
-        self.cleanup()
+        self.ui_timer.Stop()
         if self.parent:
             self.parent.Enable(True)
-        self.Destroy()
+        # Диалог скрывается и используется повторно (см. DialogPool)
+        self.Hide()
 
 
 class TestDialog(wx.Dialog):
     def __init__(self, parent, title, description):
         super().__init__(parent, title=title, size=wx.Size(600, 400))
-        self.SetBackgroundColour(wx.Colour(245, 248, 252))  # Светлый фон
+        self.SetBackgroundColour(colour("dialog"))  # Светлый фон
         self.parent = parent
+        self.test_title = title
 
         sizer = wx.BoxSizer(wx.VERTICAL)
 
         # Заголовок теста
         title_label = wx.StaticText(self, label=title)
-        title_label.SetFont(wx.Font(14, wx.FONTFAMILY_DEFAULT, wx.FONTSTYLE_NORMAL, wx.FONTWEIGHT_BOLD))
-        title_label.SetForegroundColour(wx.Colour(0, 50, 100))  # Темно-синий цвет
+        title_label.SetFont(font(14))
+        title_label.SetForegroundColour(colour("title"))  # Темно-синий цвет
         sizer.Add(title_label, 0, wx.ALL | wx.ALIGN_CENTER, 10)
 
         # Описание теста
@@ -1058,6 +1245,7 @@ class TestDialog(wx.Dialog):
         ]
 
         self.controls = []
+        self.defaults = [default for _, default in params]
         for label, default in params:
             grid.Add(wx.StaticText(self, label=label), 0, wx.ALIGN_CENTER_VERTICAL | wx.ALL, 5)
             ctrl = wx.TextCtrl(self, value=default)
@@ -1075,8 +1263,8 @@ class TestDialog(wx.Dialog):
 
         # Стилизуем кнопки
         for btn in [self.btn_start, self.btn_stop, self.btn_save]:
-            btn.SetFont(wx.Font(10, wx.FONTFAMILY_DEFAULT, wx.FONTSTYLE_NORMAL, wx.FONTWEIGHT_BOLD))
-            btn.SetBackgroundColour(wx.Colour(70, 130, 180))  # Приятный синий
+            btn.SetFont(font(10))
+            btn.SetBackgroundColour(colour("accent"))  # Приятный синий
             btn.SetForegroundColour(wx.WHITE)
 
         btn_sizer.Add(self.btn_start, 0, wx.ALL, 5)
@@ -1102,8 +1290,16 @@ class TestDialog(wx.Dialog):
         self.btn_save.Bind(wx.EVT_BUTTON, self.on_save)
         self.Bind(wx.EVT_CLOSE, self.on_close)
 
-        # Стартовое сообщение
-        self.log_message(f"Инициализация теста: {title}")
+        self.reset_state()
+
+    def reset_state(self):
+        """Возвращает диалог в начальное состояние (при повторном открытии)"""
+        for ctrl, default in zip(self.controls, self.defaults):
+            ctrl.ChangeValue(default)
+        self.btn_start.Enable()
+        self.btn_stop.Enable()
+        self.log_text.Clear()
+        self.log_message(f"Инициализация теста: {self.test_title}")
 
     def log_message(self, message):
         timestamp = time.strftime("%H:%M:%S", time.localtime())
@@ -1120,18 +1316,26 @@ class TestDialog(wx.Dialog):
         self.btn_stop.Disable()
 
     def on_save(self, event):  # noqa: unused-argument
-        self.log_message("Результаты сохранены")
-        wx.MessageBox("Результаты теста успешно сохранены", "Сохранение", wx.OK | wx.ICON_INFORMATION)
+        self.log_message("Результаты теста успешно сохранены")
 
     def on_close(self, event):  # noqa: unused-argument
         # Разблокируем основное окно при закрытии диалога
         if self.parent:
             self.parent.Enable(True)
-        self.Destroy()
+        # Диалог скрывается и используется повторно (см. DialogPool)
+        self.Hide()
 
 
 class SplashScreen(wx.Frame):
-    def __init__(self, on_close_callback=None):
+    def __init__(self, on_close_callback=None, warm_up=None, min_duration=2.0, max_duration=30.0):
+        """Заставка, показываемая на время подготовки программы.
+
+        Args:
+            on_close_callback: Вызывается после закрытия заставки
+            warm_up (warmup.WarmUp): Подготовка, завершения которой ожидает заставка
+            min_duration (float): Минимальное время показа, сек (длительность анимации)
+            max_duration (float): Максимальное время ожидания подготовки, сек
+        """
         # Создаем полноэкранное окно с черным фоном
         style = wx.STAY_ON_TOP | wx.FRAME_NO_TASKBAR | wx.BORDER_NONE
         super().__init__(None, style=style)
@@ -1148,21 +1352,31 @@ class SplashScreen(wx.Frame):
 
         # Изменяем цвет текста заставки
         self.text = wx.StaticText(self.panel, label='ООО "РИНПО"\nСлужба\nАвтоматизации\nПроизводственных\nПроцессов')
-        self.text.SetForegroundColour(wx.Colour(220, 230, 255))  # Светло-голубой
-        self.text.SetFont(wx.Font(12, wx.FONTFAMILY_DEFAULT, wx.FONTSTYLE_NORMAL, wx.FONTWEIGHT_BOLD))
+        self.text.SetForegroundColour(colour("splash_text"))  # Светло-голубой
+        self.text.SetFont(font(12))
+
+        # Строка состояния подготовки
+        self.status = wx.StaticText(self.panel, label="")
+        self.status.SetForegroundColour(colour("splash_status"))
 
         # Центрируем надпись
         sizer = wx.BoxSizer(wx.VERTICAL)
         sizer.AddStretchSpacer()
         sizer.Add(self.text, 0, wx.ALIGN_CENTER | wx.ALL, 5)
         sizer.AddStretchSpacer()
+        sizer.Add(self.status, 0, wx.ALIGN_CENTER | wx.ALL, 20)
         self.panel.SetSizer(sizer)
 
+        # Заставка закрывается после завершения подготовки, но не раньше окончания анимации
+        self.warm_up = warm_up
+        self.max_duration = max_duration
+
         # Переменные для анимации
         self.start_time = time.time()
-        self.animation_duration = 5.0  # 5 секунд
+        self.animation_duration = min_duration
         self.min_font_size = 1
         self.max_font_size = 72
+        self.font_size = None  # Текущий размер шрифта надписи
 
         # Таймер для анимации
         self.timer = wx.Timer(self)
@@ -1179,19 +1393,27 @@ class SplashScreen(wx.Frame):
         elapsed = current_time - self.start_time
 
         if elapsed >= self.animation_duration:
-            self.timer.Stop()
-            if self.on_close_callback:
-                wx.CallAfter(self.on_close_callback)
-            self.Destroy()
+            ready = self.warm_up is None or self.warm_up.done()
+            if ready or elapsed >= self.max_duration:
+                self.timer.Stop()
+                if self.on_close_callback:
+                    wx.CallAfter(self.on_close_callback)
+                self.Destroy()
+                return
+            self.status.SetLabel("Подготовка: " + ", ".join(self.warm_up.pending()))
+            self.panel.Layout()
             return
 
         # Рассчитываем прогресс (0.0 - 1.0)
         progress = elapsed / self.animation_duration
 
         # Плавное увеличение размера шрифта
-        font_size = self.min_font_size + (self.max_font_size - self.min_font_size) * self.ease_out(progress)
-        self.text.SetFont(wx.Font(int(font_size), wx.FONTFAMILY_DEFAULT,
-                                  wx.FONTSTYLE_NORMAL, wx.FONTWEIGHT_BOLD))
+        font_size = int(self.min_font_size + (self.max_font_size - self.min_font_size) * self.ease_out(progress))
+        if font_size == self.font_size:
+            return
+        # Шрифты каждого размера создаются один раз (см. resources.py)
+        self.font_size = font_size
+        self.text.SetFont(font(font_size))
 
         # Центрируем текст
         self.panel.Layout()
@@ -1203,9 +1425,13 @@ class SplashScreen(wx.Frame):
 
 
 class CombinedTab(wx.Panel):
+    # Поля шапки протокола -> индекс поля формы "Параметры протокола"
+    HEADER_CONTROLS = {"protocol_number": 0, "execution_group": 1}
+
     def __init__(self, parent):
         super().__init__(parent)
-        self.SetBackgroundColour(wx.Colour(240, 245, 250))  # Основной фон
+        self.export_info = {}
+        self.SetBackgroundColour(colour("window"))  # Основной фон
         sizer = wx.BoxSizer(wx.HORIZONTAL)
 
         # Левая панель: Выбор модели ЭД
@@ -1222,8 +1448,8 @@ class CombinedTab(wx.Panel):
 
         # Изменяем стиль заголовка в правой панели
         title = wx.StaticText(self.right_panel, label="Параметры протокола")
-        title.SetFont(wx.Font(12, wx.FONTFAMILY_DEFAULT, wx.FONTSTYLE_NORMAL, wx.FONTWEIGHT_BOLD))
-        title.SetForegroundColour(wx.Colour(0, 50, 100))  # Темно-синий цвет
+        title.SetFont(font(12))
+        title.SetForegroundColour(colour("title"))  # Темно-синий цвет
         right_sizer.Add(title, 0, wx.ALL | wx.ALIGN_CENTER, 10)
 
         # Форма протокола
@@ -1272,16 +1498,18 @@ class CombinedTab(wx.Panel):
         self.btn_search = wx.Button(self.right_panel, label="Редактировать")
         self.btn_clear = wx.Button(self.right_panel, label="Очистить форму")
         self.btn_export = wx.Button(self.right_panel, label="Сохранить")
+        self.btn_open = wx.Button(self.right_panel, label="Открыть протокол")
 
         # Стилизуем кнопки
-        for btn in [self.btn_search, self.btn_clear, self.btn_export]:
-            btn.SetFont(wx.Font(10, wx.FONTFAMILY_DEFAULT, wx.FONTSTYLE_NORMAL, wx.FONTWEIGHT_BOLD))
-            btn.SetBackgroundColour(wx.Colour(70, 130, 180))  # Приятный синий
+        for btn in [self.btn_search, self.btn_clear, self.btn_export, self.btn_open]:
+            btn.SetFont(font(10))
+            btn.SetBackgroundColour(colour("accent"))  # Приятный синий
             btn.SetForegroundColour(wx.WHITE)
 
         btn_sizer.Add(self.btn_search, 0, wx.ALL, 5)
         btn_sizer.Add(self.btn_clear, 0, wx.ALL, 5)
         btn_sizer.Add(self.btn_export, 0, wx.ALL, 5)
+        btn_sizer.Add(self.btn_open, 0, wx.ALL, 5)
 
         right_sizer.Add(btn_sizer, 0, wx.ALIGN_CENTER | wx.TOP, 10)
 
@@ -1294,11 +1522,75 @@ class CombinedTab(wx.Panel):
         self.btn_search.Bind(wx.EVT_BUTTON, self.on_search_protocols)
         self.btn_clear.Bind(wx.EVT_BUTTON, self.on_clear_search)
         self.btn_export.Bind(wx.EVT_BUTTON, self.on_export)
+        self.btn_open.Bind(wx.EVT_BUTTON, self.on_open_protocol)
+        self.Bind(EVT_EXPORT_PROGRESS, self.on_export_progress)
+        self.Bind(EVT_EXPORT_DONE, self.on_export_done)
 
-    def set_selected_model(self, params):
+    def set_selected_model(self, motor):
         """Обработчик выбора модели из левой панели"""
         # Передаем параметры в центральную панель
-        self.center_panel.set_parameters(params)
+        self.center_panel.set_parameters(motor)
+
+    def on_open_protocol(self, event):  # noqa: unused-argument
+        """Открытие существующего протокола для продолжения испытаний"""
+        with wx.FileDialog(self, "Открыть протокол", defaultDir=EXPORT_DIR,
+                           wildcard="Протоколы (*.xlsx)|*.xlsx",
+                           style=wx.FD_OPEN | wx.FD_FILE_MUST_EXIST) as dlg:
+            if dlg.ShowModal() != wx.ID_OK:
+                return
+            protocol_path = dlg.GetPath()
+
+        try:
+            # Читаются только ячейки карты протокола; результаты хранилища добавляются в set_protocol
+            header, results = read_protocol(protocol_path)
+        except (openpyxl_exceptions.InvalidFileException, zipfile.BadZipFile, OSError) as e:
+            wx.MessageBox(f"Ошибка чтения протокола:\n{str(e)}", "Ошибка", wx.OK | wx.ICON_ERROR)
+            return
+
+        for name, index in self.HEADER_CONTROLS.items():
+            if name in header:
+                self.search_controls[index].SetValue(str(header[name]))
+
+        # Протокол уже сформирован - форма блокируется так же, как после экспорта
+        self.disable_all_controls()
+        self.set_protocol(protocol_path, results, header=header)
+
+    def set_protocol(self, protocol_path, results, **info):
+        """Регистрирует протокол в хранилище результатов и передает его главному окну"""
+        station = getattr(wx.GetTopLevelParent(self), 'station', None)
+        # Запись в базу (ожидание общей очереди записи) и чтение результатов - в рабочем потоке станции
+        if station:
+            station.submit(self.register_protocol, station, protocol_path, results, info)
+        else:
+            thread = threading.Thread(target=self.register_protocol, args=(None, protocol_path, results, info))
+            thread.daemon = True
+            thread.start()
+
+    def register_protocol(self, station, protocol_path, results, info):
+        """Регистрирует протокол в базе станции и добавляет к results результаты хранилища (рабочий поток)"""
+        try:
+            store = get_results_store(station.db_path) if station else get_results_store()
+            protocol_id = store.open_protocol(protocol_path, **info)
+            # Результаты хранилища, еще не отображенные в файле протокола
+            for number, fields in store.results(protocol_id, TEST_FIELDS).items():
+                results.setdefault(number, {}).update(fields)
+        except sqlite3.Error as e:
+            wx.CallAfter(self.on_protocol_registered, protocol_path, results, None,
+                         f"Ошибка регистрации протокола в базе данных:\n{str(e)}")
+            return
+        wx.CallAfter(self.on_protocol_registered, protocol_path, results, protocol_id, None)
+
+    def on_protocol_registered(self, protocol_path, results, protocol_id, error):
+        if not self:
+            return
+        frame = wx.GetTopLevelParent(self)
+        if error:
+            if hasattr(frame, 'notify'):
+                frame.notify(error, wx.ICON_ERROR)
+            else:
+                wx.MessageBox(error, "Ошибка", wx.OK | wx.ICON_ERROR)
+        if hasattr(frame, 'set_protocol'):
+            frame.set_protocol(protocol_path, results, protocol_id)
 
     def on_search_protocols(self, event):  # noqa: unused-argument
         """Поиск протоколов по критериям"""
@@ -1365,22 +1657,16 @@ class CombinedTab(wx.Panel):
             execution_group = field_values[1]  # Группа исполнения
             ed_number = field_values[2]  # Номер ЭД
             model = field_values[-1]  # Модель
+            operator = field_values[len(fields_right) - 1]  # Оператор
 
-            # Проверяем допустимость символов в имени файла
-            invalid_chars = r'[\\/*?:"<>|]'
-            if re.search(invalid_chars, protocol_number) or re.search(invalid_chars, ed_number) or re.search(
-                    invalid_chars, model):
-                wx.MessageBox(
-                    "Номер протокола, номер ЭД и модель не должны содержать следующие символы:\n"
-                    "\\ / : * ? \" < > |",
-                    "Недопустимые символы", wx.OK | wx.ICON_WARNING
-                )
+            # Формируем имя файла (с проверкой допустимости символов)
+            try:
+                file_name = protocol_file_name(protocol_number, ed_number, model)
+            except ValueError as e:
+                wx.MessageBox(str(e), "Недопустимые символы", wx.OK | wx.ICON_WARNING)
                 return
-
-            # Формируем имя файла
-            file_name = f"{protocol_number}{ed_number}{model}.xlsx"
-            template_path = r"C:\pattern\pattern.xlsx"
-            export_path = os.path.join(r"C:\dumpProtocols", file_name)
+            template_path = TEMPLATE_PATH
+            export_path = os.path.join(EXPORT_DIR, file_name)
 
             # Проверяем существование шаблона
             if not os.path.exists(template_path):
@@ -1400,48 +1686,17 @@ class CombinedTab(wx.Panel):
                 )
                 return
 
-            # Копируем и заполняем шаблон
-            try:
-                # Загружаем шаблон
-                wb = openpyxl.load_workbook(template_path)
-                sheet = wb.active
-
-                # Записываем данные в ячейки
-                sheet['L4'] = protocol_number
-                sheet['F7'] = execution_group
-
-                # Сохраняем файл
-                wb.save(export_path)
-
-                # Проверяем, что файл действительно создан
-                if not os.path.exists(export_path):
-                    raise RuntimeError(f"Файл не был создан: {export_path}")
-
-                # Деактивируем все поля ввода
-                self.disable_all_controls()
-
-                # Выводим сообщение об успехе
-                dlg = wx.MessageDialog(
-                    self,
-                    f"Протокол успешно создан:\n{file_name}\n\n"
-                    f"Путь: {export_path}",
-                    "Экспорт завершен",
-                    wx.OK | wx.ICON_INFORMATION
-                )
-                dlg.ShowModal()
-                dlg.Destroy()
-
-            except (InvalidFileException, PermissionError, OSError, RuntimeError) as e:
-                wx.MessageBox(
-                    f"Ошибка при создании файла протокола:\n{str(e)}",
-                    "Ошибка экспорта", wx.OK | wx.ICON_ERROR
-                )
-            except Exception as e:
-                wx.MessageBox(
-                    f"Неизвестная ошибка при создании протокола:\n{str(e)}\n\n"
-                    f"Детали:\n{traceback.format_exc()}",
-                    "Ошибка", wx.OK | wx.ICON_ERROR
-                )
+            # Протокол формируется в фоновой очереди (разобранный шаблон берется из кэша),
+            # повторное нажатие до завершения не создает нового задания
+            header = {"protocol_number": protocol_number, "execution_group": execution_group}
+            _, created = get_export_queue().submit(export_path, build_cells(header=header), template_path,
+                                                   listener=self.post_export_event)
+            if created:
+                # Данные для регистрации протокола в хранилище результатов после экспорта
+                self.export_info = {"model_id": self.center_panel.current_model_id, "header": header,
+                                    "ed_number": ed_number, "operator": operator}
+                self.btn_export.Disable()
+                self.btn_export.SetLabel("Сохранение...")
 
         except Exception as e:
             wx.MessageBox(
@@ -1450,6 +1705,47 @@ class CombinedTab(wx.Panel):
                 "Ошибка", wx.OK | wx.ICON_ERROR
             )
 
+    def post_export_event(self, job):
+        """Передает состояние задания экспорта из рабочего потока в интерфейс"""
+        if job.stage in (EXPORT_DONE, EXPORT_FAILED):
+            wx.PostEvent(self, ExportDoneEvent(job=job))
+        else:
+            wx.PostEvent(self, ExportProgressEvent(job=job))
+
+    def on_export_progress(self, event):
+        """Отображение хода формирования протокола"""
+        job = event.job
+        if job.stage == EXPORT_RETRY:
+            self.btn_export.SetLabel(f"Файл занят, повтор {job.attempt}...")
+        else:
+            self.btn_export.SetLabel("Сохранение...")
+
+    def on_export_done(self, event):
+        """Завершение формирования протокола"""
+        job = event.job
+        self.btn_export.SetLabel("Сохранить")
+
+        # Сообщения выводятся в окне станции без модальных окон (другие станции не блокируются)
+        frame = wx.GetTopLevelParent(self)
+        if job.stage == EXPORT_FAILED:
+            self.btn_export.Enable()
+            error = job.error
+            if isinstance(error, (openpyxl_exceptions.InvalidFileException, OSError, RuntimeError)):
+                frame.notify(f"Ошибка при создании файла протокола: {str(error)}", wx.ICON_ERROR)
+            else:
+                details = "".join(traceback.format_exception(type(error), error, error.__traceback__))
+                logging.error(f"Неизвестная ошибка при создании протокола:\n{details}")
+                frame.notify(f"Неизвестная ошибка при создании протокола: {str(error)} (подробности в журнале)",
+                             wx.ICON_ERROR)
+            return
+
+        # Деактивируем все поля ввода
+        self.disable_all_controls()
+        self.set_protocol(job.export_path, {}, **self.export_info)
+
+        # Выводим сообщение об успехе
+        frame.notify(f"Протокол успешно создан: {os.path.basename(job.export_path)} (путь: {job.export_path})")
+
     def disable_all_controls(self):
         """Деактивирует все элементы управления на вкладке"""
         # Деактивируем элементы в левой панели
@@ -1472,12 +1768,94 @@ class CombinedTab(wx.Panel):
         self.btn_export.Disable()
 
 
+class LazyPage(wx.Panel):
+    """Страница вкладки, содержимое которой создается при первом показе"""
+
+    def __init__(self, parent, builder):
+        """Инициализация страницы.
+
+        Args:
+            parent: Notebook
+            builder: Функция builder(parent), создающая содержимое страницы
+        """
+        super().__init__(parent)
+        self.SetBackgroundColour(colour("window"))
+        self.builder = builder
+        self.content = None
+
+        self.sizer = wx.BoxSizer(wx.VERTICAL)
+        self.placeholder = wx.StaticText(self, label="Загрузка...")
+        self.sizer.Add(self.placeholder, 0, wx.ALL | wx.ALIGN_CENTER, 20)
+        self.SetSizer(self.sizer)
+
+    @property
+    def built(self):
+        return self.content is not None
+
+    def ensure_built(self):
+        """Создает содержимое страницы, если оно еще не создано"""
+        if self.content is None:
+            with wx.BusyCursor():
+                self.Freeze()
+                try:
+                    self.content = self.builder(self)
+                    self.placeholder.Destroy()
+                    self.sizer.Add(self.content, 1, wx.EXPAND)
+                    self.Layout()
+                finally:
+                    self.Thaw()
+        return self.content
+
+
+class DialogPool:
+    """Диалоги испытаний, создаваемые один раз при первом открытии.
+
+    Закрытый диалог скрывается, а при повторном открытии сбрасывается
+    (reset_state) и показывается снова - без пересоздания элементов окна.
+    Диалоги уничтожаются вместе с родительским окном.
+    """
+
+    def __init__(self, parent):
+        self.parent = parent
+        self.dialogs = {}  # Название испытания -> диалог
+
+    def get(self, dialog_class, title, description):
+        """Возвращает диалог испытания, создавая его при первом обращении"""
+        dlg = self.dialogs.get(title)
+        if not dlg:  # Не создан или уже уничтожен
+            dlg = dialog_class(self.parent, title, description)
+            self.dialogs[title] = dlg
+        elif not dlg.IsShown():
+            dlg.reset_state()
+        return dlg
+
+    def show(self, dialog_class, title, description):
+        """Показывает диалог испытания, блокируя родительское окно"""
+        dlg = self.get(dialog_class, title, description)
+        self.parent.Enable(False)
+        dlg.Show()
+        dlg.Raise()
+        return dlg
+
+
 class PEDTestingApp(wx.Frame):
-    def __init__(self, parent, title):
+    # Порядок фоновой подготовки вкладок (индексы страниц): тестирование, база данных, подключения
+    PREFETCH_ORDER = (2, 3, 1)
+
+    def __init__(self, parent, title, station=None, prefetch=True):
+        """Инициализация главного окна.
+
+        Args:
+            parent: Родительское окно
+            title (str): Заголовок окна
+            station (Station): Станция, испытаниями которой управляет окно (по умолчанию - одна на COM7)
+            prefetch (bool): Подготовка остальных вкладок в простое
+        """
         super().__init__(parent, id=wx.ID_ANY, title=title, size=wx.Size(1500, 1000))
+        self.station = station or Station("Стенд 1")
 
         # Устанавливаем основной цвет фона
-        self.SetBackgroundColour(wx.Colour(240, 245, 250))
+        self.SetBackgroundColour(colour("window"))
 
         self.test_buttons = None
         self.btn_export = None
@@ -1486,31 +1864,94 @@ class PEDTestingApp(wx.Frame):
         self.left_panel = None
         self.center_panel = None
         self.search_controls = None
+        self.export_info = {}
+        self.test_dialogs = DialogPool(self)  # Диалоги испытаний создаются при первом открытии
         # Создаем панель и основной сайзер
         panel = wx.Panel(self)
         main_sizer = wx.BoxSizer(wx.VERTICAL)
 
+        # Сообщения окна станции (немодальные - окна других станций остаются доступными)
+        self.info_bar = wx.InfoBar(panel)
+        main_sizer.Add(self.info_bar, 0, wx.EXPAND)
+
         # Создаем Notebook (вкладки)
         self.notebook = wx.Notebook(panel)
         main_sizer.Add(self.notebook, 1, wx.EXPAND | wx.ALL, 5)
 
-        # Создаем вкладки
-        self.setup_combined_tab()
-        self.setup_connection_tab()
-        self.setup_testing_tab()
-        self.setup_database_tab()
+        # Создаем вкладки: содержимое страницы строится при первом показе
+        self.add_lazy_page(self.build_combined_tab, "Параметры ПЭД")
+        self.add_lazy_page(self.build_connection_tab, "Настройка подключений")
+        self.add_lazy_page(self.build_testing_tab, "Тестирование ПЭД")
+        self.add_lazy_page(self.build_database_tab, "База данных ПЭД")
+        self.notebook.Bind(wx.EVT_NOTEBOOK_PAGE_CHANGED, self.on_page_changed)
 
         panel.SetSizer(main_sizer)
         self.Centre()
+        self.Bind(wx.EVT_CLOSE, self.on_close)
+
+        # Первая вкладка строится после запуска цикла событий, остальные - в простое
+        wx.CallAfter(self.ensure_page, 0)
+        if prefetch:
+            self.Bind(wx.EVT_IDLE, self.on_idle_prefetch)
 
-    def setup_database_tab(self):
+        # Периодический опрос ленты изменений каталога (правки из других окон и программ)
+        self.feed_timer = wx.Timer(self)
+        self.Bind(wx.EVT_TIMER, self.on_feed_timer, self.feed_timer)
+        self.feed_timer.Start(1000)
+
+    def notify(self, message, flags=wx.ICON_INFORMATION):
+        """Показывает сообщение в окне станции без модального окна"""
+        self.info_bar.ShowMessage(message, flags)
+
+    @staticmethod
+    def on_feed_timer(event):  # noqa: unused-argument
+        """Рассылка изменений каталога всем представлениям"""
+        get_feed().poll()
+
+    def add_lazy_page(self, builder, title):
+        """Добавляет вкладку-заглушку, содержимое которой создает builder(parent)"""
+        self.notebook.AddPage(LazyPage(self.notebook, builder), title)
+
+    def ensure_page(self, index):
+        """Создает содержимое вкладки с указанным индексом"""
+        if not self:
+            return
+        page = self.notebook.GetPage(index)
+        if page.built:
+            return
+        with startup_profile.phase(f"Вкладка «{self.notebook.GetPageText(index)}»"):
+            page.ensure_built()
+        if index == 0:
+            # Первая вкладка построена - программа готова к работе
+            startup_profile.mark("Главное окно готово к работе")
+            startup_profile.write_report()
+
+    def on_page_changed(self, event):
+        """Создание содержимого вкладки при первом переходе на нее"""
+        self.ensure_page(event.GetSelection())
+        event.Skip()
+
+    def on_idle_prefetch(self, event):
+        """Подготовка следующей вероятной вкладки во время простоя (по одной за событие)"""
+        if not self.notebook.GetPage(0).built:
+            return
+        pending = [index for index in self.PREFETCH_ORDER if not self.notebook.GetPage(index).built]
+        if not pending:
+            self.Unbind(wx.EVT_IDLE, handler=self.on_idle_prefetch)
+            return
+        self.ensure_page(pending[0])
+        if len(pending) > 1:
+            event.RequestMore()
+
+    @staticmethod
+    def build_database_tab(parent):
         """Вкладка работы с базой данных"""
-        tab = DatabaseTab(self.notebook)
-        self.notebook.AddPage(tab, "База данных ПЭД")
+        return DatabaseTab(parent)
 
-    def setup_connection_tab(self):
+    @staticmethod
+    def build_connection_tab(parent):
         """Вкладка настройки подключений"""
-        tab = wx.Panel(self.notebook)
+        tab = wx.Panel(parent)
         sizer = wx.BoxSizer(wx.VERTICAL)
 
         # Группа настроек подключения
@@ -1550,11 +1991,11 @@ class PEDTestingApp(wx.Frame):
         sizer.AddStretchSpacer()
 
         tab.SetSizer(sizer)
-        self.notebook.AddPage(tab, "Настройка подключений")
+        return tab
 
-    def setup_testing_tab(self):
+    def build_testing_tab(self, parent):
         """Вкладка тестирования ПЭД"""
-        tab = wx.Panel(self.notebook)
+        tab = wx.Panel(parent)
         sizer = wx.BoxSizer(wx.VERTICAL)
 
         # Список типов ПЭД с короткими названиями для кнопок
@@ -1585,10 +2026,9 @@ class PEDTestingApp(wx.Frame):
             btn.SetToolTip(full_name)  # Полное название в подсказке
 
             # Настройка внешнего вида кнопки
-            btn.SetBackgroundColour(wx.BLACK)
+            btn.SetBackgroundColour(colour("test_button"))
             btn.SetForegroundColour(wx.WHITE)
-            font = wx.Font(12, wx.FONTFAMILY_DEFAULT, wx.FONTSTYLE_NORMAL, wx.FONTWEIGHT_BOLD)
-            btn.SetFont(font)
+            btn.SetFont(font(12))
 
             # Обработка наведения курсора
             btn.Bind(wx.EVT_ENTER_WINDOW, self.on_enter_button)
@@ -1609,33 +2049,78 @@ class PEDTestingApp(wx.Frame):
         sizer.Add(grid_sizer, 0, wx.EXPAND | wx.ALL, 5)
 
         tab.SetSizer(sizer)
-        self.notebook.AddPage(tab, "Тестирование ПЭД")
+
+        # Отметка испытаний протокола, открытого до создания вкладки
+        self.update_test_results({})
+        return tab
+
+    # Текущий протокол и результаты хранятся в станции окна
+    @property
+    def protocol_path(self):
+        return self.station.protocol_path
+
+    @property
+    def protocol_id(self):
+        return self.station.protocol_id
+
+    @property
+    def test_results(self):
+        return self.station.test_results
+
+    def set_protocol(self, protocol_path, results, protocol_id=None):
+        """Устанавливает текущий протокол и отмечает выполненные испытания"""
+        self.station.set_protocol(protocol_path, protocol_id)
+        self.update_test_results(results)
+
+    def on_close(self, event):
+        """Остановка измерений и рабочих потоков станции при закрытии окна"""
+        for dlg in self.test_dialogs.dialogs.values():
+            if dlg and getattr(dlg, 'running', False) and hasattr(dlg, 'measurement_stop'):
+                dlg.measurement_stop.set()
+        self.station.shutdown()
+        event.Skip()
+
+    def update_test_results(self, results):
+        """Добавляет результаты испытаний и отмечает выполненные испытания"""
+        for number, fields in results.items():
+            self.test_results.setdefault(number, {}).update(fields)
+        for number, btn in enumerate(self.test_buttons or [], start=1):
+            current = btn.GetLabel()
+            label = current.removeprefix("✔ ")
+            done = RESULT in self.test_results.get(number, {})
+            if done:
+                label = "✔ " + label
+            if label == current:
+                continue  # Отметка не изменилась - кнопка не перерисовывается
+            btn.SetLabel(label)
+            btn.SetForegroundColour(colour("test_done") if done else wx.WHITE)
+            btn.Refresh(False)
 
     @staticmethod
-    def on_enter_button(event):
+    def set_button_hover(button, hovered):
+        """Меняет цвет кнопки испытания под курсором (только при смене состояния)"""
+        background = colour("test_button_hover" if hovered else "test_button")
+        if button.GetBackgroundColour() != background:
+            button.SetBackgroundColour(background)
+            button.Refresh(False)
+
+    def on_enter_button(self, event):
         """Обработчик наведения курсора на кнопку"""
-        button = event.GetEventObject()
-        button.SetBackgroundColour(wx.Colour(50, 50, 50))  # Темно-серый цвет при наведении
-        button.Refresh()
+        self.set_button_hover(event.GetEventObject(), True)  # Темно-серый цвет при наведении
+        event.Skip()
 
-    @staticmethod
-    def on_leave_button(event):
+    def on_leave_button(self, event):
         """Обработчик ухода курсора с кнопки"""
-        button = event.GetEventObject()
-        button.SetBackgroundColour(wx.BLACK)  # Возвращаем черный цвет
-        button.Refresh()
+        self.set_button_hover(event.GetEventObject(), False)  # Возвращаем черный цвет
+        event.Skip()
 
     def open_cold_input_dialog(self, event, title, description):  # noqa: unused-argument
         """Открывает специальный диалог для измерения сопротивления вводов"""
-        self.Enable(False)
-        dlg = ColdInputResistanceDialog(self, title, description)
-        dlg.Show()
+        self.test_dialogs.show(ColdInputResistanceDialog, title, description)
 
     def open_test_dialog(self, event, title, description):  # noqa: unused-argument
         """Открывает диалоговое окно для конкретного теста"""
-        self.Enable(False)
-        dlg = TestDialog(self, title, description)
-        dlg.Show()
+        self.test_dialogs.show(TestDialog, title, description)
 
     def on_export(self, event):  # noqa: unused-argument
         """Экспорт результатов поиска в Excel"""
@@ -1689,22 +2174,16 @@ class PEDTestingApp(wx.Frame):
             execution_group = field_values[1]  # Группа исполнения
             ed_number = field_values[2]  # Номер ЭД
             model = field_values[-1]  # Модель
+            operator = field_values[len(fields_right) - 1]  # Оператор
 
-            # Проверяем допустимость символов в имени файла
-            invalid_chars = r'[\\/*?:"<>|]'
-            if re.search(invalid_chars, protocol_number) or re.search(invalid_chars, ed_number) or re.search(
-                    invalid_chars, model):
-                wx.MessageBox(
-                    "Номер протокола, номер ЭД и модель не должны содержать следующие символы:\n"
-                    "\\ / : * ? \" < > |",
-                    "Недопустимые символы", wx.OK | wx.ICON_WARNING
-                )
+            # Формируем имя файла (с проверкой допустимости символов)
+            try:
+                file_name = protocol_file_name(protocol_number, ed_number, model)
+            except ValueError as e:
+                wx.MessageBox(str(e), "Недопустимые символы", wx.OK | wx.ICON_WARNING)
                 return
-
-            # Формируем имя файла
-            file_name = f"{protocol_number}{ed_number}{model}.xlsx"
-            template_path = r"C:\pattern\pattern.xlsx"
-            export_path = os.path.join(r"C:\dumpProtocols", file_name)
+            template_path = TEMPLATE_PATH
+            export_path = os.path.join(EXPORT_DIR, file_name)
 
             # Проверяем существование шаблона
             if not os.path.exists(template_path):
@@ -1724,48 +2203,17 @@ class PEDTestingApp(wx.Frame):
                 )
                 return
 
-            # Копируем и заполняем шаблон
-            try:
-                # Загружаем шаблон
-                wb = openpyxl.load_workbook(template_path)
-                sheet = wb.active
-
-                # Записываем данные в ячейки
-                sheet['L4'] = protocol_number
-                sheet['F7'] = execution_group
-
-                # Сохраняем файл
-                wb.save(export_path)
-
-                # Проверяем, что файл действительно создан
-                if not os.path.exists(export_path):
-                    raise RuntimeError(f"Файл не был создан: {export_path}")
-
-                # Деактивируем все поля ввода
-                self.disable_all_controls()
-
-                # Выводим сообщение об успехе
-                dlg = wx.MessageDialog(
-                    self,
-                    f"Протокол успешно создан:\n{file_name}\n\n"
-                    f"Путь: {export_path}",
-                    "Экспорт завершен",
-                    wx.OK | wx.ICON_INFORMATION
-                )
-                dlg.ShowModal()
-                dlg.Destroy()
-
-            except (InvalidFileException, PermissionError, OSError, RuntimeError) as e:
-                wx.MessageBox(
-                    f"Ошибка при создании файла протокола:\n{str(e)}",
-                    "Ошибка экспорта", wx.OK | wx.ICON_ERROR
-                )
-            except Exception as e:
-                wx.MessageBox(
-                    f"Неизвестная ошибка при создании протокола:\n{str(e)}\n\n"
-                    f"Детали:\n{traceback.format_exc()}",
-                    "Ошибка", wx.OK | wx.ICON_ERROR
-                )
+            # Протокол формируется в фоновой очереди (разобранный шаблон берется из кэша),
+            # повторное нажатие до завершения не создает нового задания
+            header = {"protocol_number": protocol_number, "execution_group": execution_group}
+            _, created = get_export_queue().submit(export_path, build_cells(header=header), template_path,
+                                                   listener=self.post_export_event)
+            if created:
+                # Данные для регистрации протокола в хранилище результатов после экспорта
+                self.export_info = {"model_id": self.center_panel.current_model_id, "header": header,
+                                    "ed_number": ed_number, "operator": operator}
+                self.btn_export.Disable()
+                self.btn_export.SetLabel("Сохранение...")
 
         except Exception as e:
             wx.MessageBox(
@@ -1774,6 +2222,47 @@ class PEDTestingApp(wx.Frame):
                 "Ошибка", wx.OK | wx.ICON_ERROR
             )
 
+    def post_export_event(self, job):
+        """Передает состояние задания экспорта из рабочего потока в интерфейс"""
+        if job.stage in (EXPORT_DONE, EXPORT_FAILED):
+            wx.PostEvent(self, ExportDoneEvent(job=job))
+        else:
+            wx.PostEvent(self, ExportProgressEvent(job=job))
+
+    def on_export_progress(self, event):
+        """Отображение хода формирования протокола"""
+        job = event.job
+        if job.stage == EXPORT_RETRY:
+            self.btn_export.SetLabel(f"Файл занят, повтор {job.attempt}...")
+        else:
+            self.btn_export.SetLabel("Сохранение...")
+
+    def on_export_done(self, event):
+        """Завершение формирования протокола"""
+        job = event.job
+        self.btn_export.SetLabel("Сохранить")
+
+        # Сообщения выводятся в окне станции без модальных окон (другие станции не блокируются)
+        frame = wx.GetTopLevelParent(self)
+        if job.stage == EXPORT_FAILED:
+            self.btn_export.Enable()
+            error = job.error
+            if isinstance(error, (openpyxl_exceptions.InvalidFileException, OSError, RuntimeError)):
+                frame.notify(f"Ошибка при создании файла протокола: {str(error)}", wx.ICON_ERROR)
+            else:
+                details = "".join(traceback.format_exception(type(error), error, error.__traceback__))
+                logging.error(f"Неизвестная ошибка при создании протокола:\n{details}")
+                frame.notify(f"Неизвестная ошибка при создании протокола: {str(error)} (подробности в журнале)",
+                             wx.ICON_ERROR)
+            return
+
+        # Деактивируем все поля ввода
+        self.disable_all_controls()
+        self.set_protocol(job.export_path, {}, **self.export_info)
+
+        # Выводим сообщение об успехе
+        frame.notify(f"Протокол успешно создан: {os.path.basename(job.export_path)} (путь: {job.export_path})")
+
     def disable_all_controls(self):
         """Деактивирует все элементы управления на вкладке"""
         # Деактивируем элементы в левой панели
@@ -1795,18 +2284,18 @@ class PEDTestingApp(wx.Frame):
         self.btn_clear.Disable()
         self.btn_export.Disable()
 
-    def setup_combined_tab(self):
+    @staticmethod
+    def build_combined_tab(parent):
         """Параметры ПЭД"""
-        tab = CombinedTab(self.notebook)  # Используем новый класс
-        self.notebook.AddPage(tab, "Параметры ПЭД")
+        return CombinedTab(parent)  # Используем новый класс
 
-    def set_selected_model(self, params):
+    def set_selected_model(self, motor):
         """Обработчик выбора модели из левой панели"""
         # Передаем параметры в центральную панель
-        self.center_panel.set_parameters(params)
+        self.center_panel.set_parameters(motor)
 
         # Автоматическое заполнение поля "Номер ЭД" в форме протокола
-        model = params.get("Model", "")
+        model = motor.get("Model", "")
         if model:
             # Поле "Номер ЭД" - третий элемент в search_controls
             if len(self.search_controls) > 2:
@@ -1828,20 +2317,37 @@ class PEDTestingApp(wx.Frame):
 
 
 if __name__ == "__main__":
-    app = wx.App()
+    startup_profile.mark("Модули загружены")
+    with startup_profile.phase("Создание приложения wx"):
+        app = wx.App()
 
-    # Создаем главное окно, но пока скрыто
-    main_frame = PEDTestingApp(None, "Программный комплекс тестирования ПЭД")
-    main_frame.Hide()
+    # Подготовка (каталог, шаблон протокола, незаписанные протоколы)
+    # выполняется в фоновых потоках во время показа заставки
+    warm_up = warmup.start()
 
 
     def after_splash():
-        # Максимизируем и показываем главное окно
-        main_frame.Maximize(True)
-        main_frame.Show()
+        startup_profile.mark("Заставка закрыта")
+        try:
+            stations = load_stations()
+        except (OSError, ValueError) as e:
+            wx.MessageBox(f"Ошибка чтения состава станций:\n{str(e)}", "Ошибка", wx.OK | wx.ICON_ERROR)
+            stations = [Station("Стенд 1")]
+        # Главное окно на каждую станцию (вкладки строятся по мере показа); одна станция - на весь экран
+        with startup_profile.phase("Создание главного окна"):
+            title = "Программный комплекс тестирования ПЭД"
+            for number, station in enumerate(stations):
+                main_frame = PEDTestingApp(None, title if len(stations) == 1 else f"{title} — {station.name}",
+                                           station=station)
+                if len(stations) == 1:
+                    main_frame.Maximize(True)
+                else:
+                    main_frame.SetPosition(wx.Point(40 * number, 40 * number))
+                main_frame.Show()
 
 
     # Создаем заставку, передаем колбэк
-    splash = SplashScreen(after_splash)
+    with startup_profile.phase("Создание заставки"):
+        splash = SplashScreen(after_splash, warm_up)
 
     app.MainLoop()
@@ -0,0 +1,233 @@
+"""Формирование файлов протоколов испытаний по шаблону Excel."""
+import io
+import os
+import pickle
+import threading
+from lazy_import import lazy_module
+from protocol_map import CURRENT_VERSION, FIRST, NOMINAL, RESULT, SECOND, build_cells, resolve_cells
+from xlsx_patch import XlsxPatchError, patch_workbook, read_cells
+
+# openpyxl нужен только при разборе шаблона и для файлов, не поддерживаемых xlsx_patch
+openpyxl = lazy_module("openpyxl")
+
+TEMPLATE_PATH = r"C:\pattern\pattern.xlsx"
+EXPORT_DIR = r"C:\dumpProtocols"
+
+
+class TemplateCache:
+    """Кэш разобранных шаблонов протоколов.
+
+    Шаблон разбирается openpyxl один раз и хранится как неизменяемый образ
+    (сериализованная книга). Образ сбрасывается при изменении времени
+    модификации или размера файла. Каждая копия для протокола получается
+    восстановлением образа, без повторного разбора стилей, объединенных
+    ячеек и листов.
+    """
+
+    def __init__(self):
+        self._images = {}  # Путь к шаблону -> (отметка файла, образ книги)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _stamp(path):
+        stat = os.stat(path)
+        return stat.st_mtime_ns, stat.st_size
+
+    def image(self, path):
+        """Возвращает образ шаблона, разбирая файл только при его изменении.
+
+        Args:
+            path (str): Путь к файлу шаблона
+
+        Returns:
+            bytes: Неизменяемый образ книги
+        """
+        stamp = self._stamp(path)
+        with self._lock:
+            entry = self._images.get(path)
+            if entry is not None and entry[0] == stamp:
+                return entry[1]
+            image = pickle.dumps(openpyxl.load_workbook(path), pickle.HIGHEST_PROTOCOL)
+            self._images[path] = (stamp, image)
+            return image
+
+    def workbook(self, path):
+        """Возвращает новую копию книги шаблона для заполнения.
+
+        Args:
+            path (str): Путь к файлу шаблона
+
+        Returns:
+            openpyxl.Workbook: Независимая копия шаблона
+        """
+        return pickle.loads(self.image(path))
+
+    def invalidate(self, path=None):
+        """Сбрасывает образ шаблона (или все образы, если путь не указан)."""
+        with self._lock:
+            if path is None:
+                self._images.clear()
+            else:
+                self._images.pop(path, None)
+
+
+# Общий кэш шаблонов процесса
+template_cache = TemplateCache()
+
+
+def _set_cells(sheet, cells):
+    """Записывает значения в ячейки листа openpyxl (адрес "L4" или (строка, колонка))."""
+    for address, value in cells.items():
+        if isinstance(address, tuple):
+            sheet.cell(row=address[0], column=address[1], value=value)
+        else:
+            sheet[address] = value
+
+
+def fill_template(export_path, cells, template_path=TEMPLATE_PATH, template_data=None):
+    """Создает файл протокола из шаблона, записывая значения в ячейки первого листа.
+
+    Сначала используется быстрая запись в XML листа (xlsx_patch), при
+    неподдерживаемой структуре файла - копия разобранного шаблона openpyxl.
+
+    Args:
+        export_path (str): Путь к создаваемому файлу протокола
+        cells (dict): {адрес ячейки ("L4"): значение}
+        template_path (str): Путь к файлу шаблона
+        template_data (bytes): Содержимое файла шаблона, прочитанное заранее (необязательно)
+    """
+    source = io.BytesIO(template_data) if template_data is not None else template_path
+    try:
+        patch_workbook(source, export_path, cells)
+        return
+    except XlsxPatchError:
+        pass
+
+    wb = template_cache.workbook(template_path)
+    _set_cells(wb.active, cells)
+    wb.save(export_path)
+
+
+def update_protocol(protocol_path, cells):
+    """Записывает значения в ячейки первого листа существующего протокола.
+
+    Args:
+        protocol_path (str): Путь к файлу протокола
+        cells (dict): {адрес ("L4" или (строка, колонка)): значение}
+    """
+    try:
+        patch_workbook(protocol_path, protocol_path, cells)
+        return
+    except XlsxPatchError:
+        pass
+
+    wb = openpyxl.load_workbook(protocol_path)
+    _set_cells(wb.worksheets[0], cells)
+    wb.save(protocol_path)
+
+
+def protocol_number(value):
+    """Приводит измеренное значение к виду для протокола (целые числа без дробной части)."""
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+# Единицы измерения полей испытания "Пробой масла" в хранилище результатов
+OIL_BREAKDOWN_UNITS = {NOMINAL: "кВ", FIRST: "кВ", SECOND: "кВ"}
+
+
+def oil_breakdown_results(result, nominal, voltage, second_run=False):
+    """Формирует результаты измерения напряжения пробоя масла (испытание 1).
+
+    Args:
+        result (str): Заключение ("Годно" / "Не годно!")
+        nominal: Паспортное значение, кВ
+        voltage: Измеренное значение, кВ
+        second_run (bool): Измерение выполнено на второй обкатке
+
+    Returns:
+        dict: {номер испытания: {поле: значение}}
+    """
+    return {1: {
+        RESULT: result,
+        NOMINAL: protocol_number(nominal),
+        SECOND if second_run else FIRST: protocol_number(voltage),
+    }}
+
+
+def write_oil_breakdown(protocol_path, result, nominal, voltage, second_run=False):
+    """Записывает результат измерения напряжения пробоя масла в протокол.
+
+    Args:
+        protocol_path (str): Путь к файлу протокола
+        result (str): Заключение ("Годно" / "Не годно!")
+        nominal: Паспортное значение, кВ
+        voltage: Измеренное значение, кВ
+        second_run (bool): Измерение выполнено на второй обкатке
+    """
+    write_results(protocol_path, oil_breakdown_results(result, nominal, voltage, second_run))
+
+
+def write_results(protocol_path, results, header=None, version=CURRENT_VERSION):
+    """Записывает набор результатов испытаний в протокол за одну операцию.
+
+    Args:
+        protocol_path (str): Путь к файлу протокола
+        results (dict): {номер испытания: {поле: значение}} (поля см. protocol_map)
+        header (dict): {имя поля шапки: значение}
+        version (int): Версия карты ячеек шаблона
+    """
+    update_protocol(protocol_path, build_cells(results, header, version))
+
+
+def _read_cells_openpyxl(protocol_path, addresses):
+    """Читает значения ячеек первого листа через openpyxl в режиме только для чтения."""
+    rows = [row for row, _ in addresses]
+    cols = [col for _, col in addresses]
+    min_row, min_col = min(rows), min(cols)
+    wb = openpyxl.load_workbook(protocol_path, read_only=True, data_only=True)
+    try:
+        values = {}
+        sheet_rows = wb.worksheets[0].iter_rows(min_row=min_row, max_row=max(rows), min_col=min_col,
+                                                max_col=max(cols), values_only=True)
+        for row, row_values in enumerate(sheet_rows, start=min_row):
+            for col, value in enumerate(row_values, start=min_col):
+                if value is not None and (row, col) in addresses:
+                    values[(row, col)] = value
+        return values
+    finally:
+        wb.close()
+
+
+def read_protocol(protocol_path, version=CURRENT_VERSION):
+    """Читает поля шапки и записанные результаты испытаний из протокола.
+
+    Читаются только ячейки карты протокола; XML листа разбирается потоково,
+    при неподдерживаемой структуре файла используется openpyxl (read_only).
+
+    Args:
+        protocol_path (str): Путь к файлу протокола
+        version (int): Версия карты ячеек шаблона
+
+    Returns:
+        tuple: ({имя поля шапки: значение}, {номер испытания: {поле: значение}})
+    """
+    cells = resolve_cells(version)
+    addresses = set(cells.values())
+    try:
+        values = read_cells(protocol_path, addresses)
+    except XlsxPatchError:
+        values = _read_cells_openpyxl(protocol_path, addresses)
+
+    header = {}
+    results = {}
+    for (owner, field), address in cells.items():
+        value = values.get(address)
+        if value is None or value == "":
+            continue
+        if owner == "header":
+            header[field] = value
+        else:
+            results.setdefault(owner, {})[field] = value
+    return header, results
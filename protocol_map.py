@@ -0,0 +1,138 @@
+"""Декларативная карта ячеек протокола испытаний ПЭД.
+
+Карта связывает поля шапки протокола и результаты испытаний с ячейками
+шаблона. Карты версионируются вместе с шаблоном: при изменении разметки
+шаблона добавляется новая версия, а адреса ячеек для версии вычисляются
+один раз (resolve_cells).
+
+В карту вносятся только ячейки, подтвержденные шаблоном. Испытания, строка
+которых в шаблоне не подтверждена, описаны без строки (row=None): их
+результаты хранятся в базе, но в протокол не записываются - build_cells
+отклоняет их с ошибкой UnmappedCellError.
+"""
+from collections import namedtuple
+from functools import lru_cache
+from xlsx_patch import normalize_address
+
+# Поля результата испытания
+NOMINAL = "nominal"  # Паспортное (допустимое) значение
+FIRST = "first"  # Значение, измеренное на первой обкатке
+SECOND = "second"  # Значение, измеренное на второй обкатке
+RESULT = "result"  # Заключение ("Годно" / "Не годно!")
+
+TEST_FIELDS = (NOMINAL, FIRST, SECOND, RESULT)
+
+# Колонки результатов испытания в строке протокола (номера колонок листа)
+TestColumns = namedtuple("TestColumns", TEST_FIELDS)
+
+# Описание испытания: номер (как на кнопке вкладки "Тестирование ПЭД"), название и строка протокола
+# (None - строка в шаблоне не подтверждена)
+TestCells = namedtuple("TestCells", "number name row")
+
+ProtocolMap = namedtuple("ProtocolMap", "version header columns tests")
+
+PROTOCOL_MAPS = {
+    1: ProtocolMap(
+        version=1,
+        # Поля шапки: {имя поля: адрес ячейки}
+        header={
+            "protocol_number": "L4",  # Номер протокола
+            "execution_group": "F7",  # Группа исполнения
+        },
+        columns=TestColumns(nominal=10, first=13, second=16, result=19),
+        # Подтверждена только строка 22 (испытание 1); строки испытаний 2-15
+        # будут внесены после сверки с разметкой шаблона.
+        tests=(
+            TestCells(1, "Пробой масла (хол.)", 22),
+            TestCells(2, "Сопр. обмоток (хол.)", None),
+            TestCells(3, "Сопр. вводов (хол.)", None),
+            TestCells(4, "Подержание вала", None),
+            TestCells(5, "КЗ трансформатора", None),
+            TestCells(6, "Напряжение травма", None),
+            TestCells(7, "Обязательная проверка", None),
+            TestCells(8, "Выбег ПЭД", None),
+            TestCells(9, "Сопр. обмоток (гор.)", None),
+            TestCells(10, "Изоляция (гор.)", None),
+            TestCells(11, "Пробой масла (гор.)", None),
+            TestCells(12, "Обмотки на эл.проч.", None),
+            TestCells(13, "Обмотки-корпус", None),
+            TestCells(14, "Герметичность", None),
+            TestCells(15, "Показания ТИС", None),
+        ),
+    ),
+}
+
+CURRENT_VERSION = max(PROTOCOL_MAPS)
+
+
+class UnmappedCellError(KeyError):
+    """Поле отсутствует в карте ячеек протокола или его ячейка не подтверждена шаблоном."""
+
+    def __str__(self):
+        return self.args[0]
+
+
+def mapped_tests(version=CURRENT_VERSION):
+    """Номера испытаний, ячейки которых подтверждены шаблоном версии version."""
+    return frozenset(test.number for test in PROTOCOL_MAPS[version].tests if test.row is not None)
+
+
+@lru_cache(maxsize=None)
+def resolve_cells(version=CURRENT_VERSION):
+    """Вычисляет адреса всех ячеек карты указанной версии.
+
+    Args:
+        version (int): Версия карты (шаблона)
+
+    Returns:
+        dict: {("header", имя поля) или (номер испытания, поле): (строка, колонка)}
+              (только подтвержденные ячейки)
+    """
+    protocol_map = PROTOCOL_MAPS[version]
+    cells = {("header", name): normalize_address(address) for name, address in protocol_map.header.items()}
+    for test in protocol_map.tests:
+        if test.row is None:
+            continue
+        for field, col in zip(TEST_FIELDS, protocol_map.columns):
+            cells[(test.number, field)] = (test.row, col)
+    return cells
+
+
+def build_cells(results=None, header=None, version=CURRENT_VERSION):
+    """Преобразует набор результатов и полей шапки в значения ячеек.
+
+    Args:
+        results (dict): {номер испытания: {поле: значение}}
+        header (dict): {имя поля шапки: значение}
+        version (int): Версия карты (шаблона)
+
+    Returns:
+        dict: {(строка, колонка): значение}
+
+    Raises:
+        UnmappedCellError: Поле отсутствует в карте или ячейка испытания не подтверждена шаблоном
+    """
+    addresses = resolve_cells(version)
+    cells = {}
+    for name, value in (header or {}).items():
+        cells[_address(addresses, ("header", name), version)] = value
+    for number, fields in (results or {}).items():
+        for field, value in fields.items():
+            cells[_address(addresses, (number, field), version)] = value
+    return cells
+
+
+def _address(addresses, key, version):
+    address = addresses.get(key)
+    if address is not None:
+        return address
+    owner, field = key
+    if owner == "header":
+        raise UnmappedCellError(f"Поле шапки {field} отсутствует в карте протокола версии {version}")
+    test = next((test for test in PROTOCOL_MAPS[version].tests if test.number == owner), None)
+    if test is None:
+        raise UnmappedCellError(f"Испытание {owner} отсутствует в карте протокола версии {version}")
+    if test.row is None:
+        raise UnmappedCellError(f"Испытание {owner} ({test.name}): строка протокола версии {version} "
+                                "не подтверждена шаблоном")
+    raise UnmappedCellError(f"Поле {field} испытания {owner} отсутствует в карте протокола версии {version}")
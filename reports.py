@@ -0,0 +1,331 @@
+"""Сводные отчеты по результатам испытаний ПЭД.
+
+Отчеты строятся по хранилищу результатов (results_store) за один проход
+курсора SQLite: значения не накапливаются, для каждого периода (или модели)
+обновляются счетчики "годно"/"не годно" по испытаниям и текущая статистика
+распределений (количество, минимум, максимум, среднее, СКО). Агрегаты
+завершенных периодов кэшируются в базе и пересчитываются, только если
+после расчета появились новые измерения этого периода.
+
+Результат записывается в xlsx (openpyxl write_only) и CSV построчно.
+
+Пример:
+    python reports.py --period week --from 2026-01-01 --to 2026-04-01 --xlsx report.xlsx --csv report.csv
+"""
+import argparse
+import csv
+import json
+import math
+import sqlite3
+import sys
+import time
+from datetime import date, datetime, timedelta
+import openpyxl
+from protocol_map import CURRENT_VERSION, FIRST, PROTOCOL_MAPS, RESULT, SECOND
+from results_store import install_results_schema
+
+PASSED = "Годно"
+
+# Распределения: название -> измерения (номер испытания, поле), из которых оно строится.
+# Только измерения, которые программа записывает в хранилище: пробой масла (диалог испытания 1)
+# и сопротивление изоляции (диалог испытания 3).
+DISTRIBUTIONS = {
+    "Напряжение пробоя масла, кВ": ((1, FIRST), (1, SECOND)),
+    "Сопротивление изоляции, МОм": ((3, "resistance"),),
+}
+DISTRIBUTION_BY_FIELD = {field: name for name, fields in DISTRIBUTIONS.items() for field in fields}
+
+TEST_NAMES = {test.number: test.name for test in PROTOCOL_MAPS[CURRENT_VERSION].tests}
+
+REPORT_CACHE_DDL = """
+CREATE TABLE IF NOT EXISTS ReportCache (
+    granularity TEXT NOT NULL,
+    period TEXT NOT NULL,
+    max_measurement_id INTEGER NOT NULL,
+    payload TEXT NOT NULL,
+    PRIMARY KEY (granularity, period)
+)
+"""
+
+# Последнее значение каждого поля испытания протокола (повторные измерения не учитываются дважды)
+ROWS_QUERY = """
+SELECT COALESCE(b.Model, ''), m.test, m.field, m.value
+FROM Measurements m
+JOIN Protocols p ON p.ID = m.protocol_id
+JOIN TestSessions s ON s.ID = p.session_id
+LEFT JOIN Base b ON b.ID = s.model_id
+WHERE s.started_at >= ? AND s.started_at < ?
+  AND NOT EXISTS (SELECT 1 FROM Measurements n
+                  WHERE n.protocol_id = m.protocol_id AND n.test = m.test AND n.field = m.field AND n.ID > m.ID)
+"""
+
+CHANGED_QUERY = """
+SELECT 1 FROM Measurements m
+JOIN Protocols p ON p.ID = m.protocol_id
+JOIN TestSessions s ON s.ID = p.session_id
+WHERE m.ID > ? AND s.started_at >= ? AND s.started_at < ?
+LIMIT 1
+"""
+
+
+class RunningStats:
+    """Статистика распределения, обновляемая по одному значению (алгоритм Уэлфорда)."""
+
+    __slots__ = ("count", "mean", "m2", "min", "max")
+
+    def __init__(self, count=0, mean=0.0, m2=0.0, minimum=None, maximum=None):
+        self.count = count
+        self.mean = mean
+        self.m2 = m2
+        self.min = minimum
+        self.max = maximum
+
+    def add(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    @property
+    def std(self):
+        """Выборочное среднеквадратичное отклонение."""
+        return math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else 0.0
+
+    def as_list(self):
+        return [self.count, self.mean, self.m2, self.min, self.max]
+
+
+class Aggregate:
+    """Агрегаты одного периода или одной модели."""
+
+    def __init__(self):
+        self.tests = {}  # Номер испытания -> [годно, не годно]
+        self.distributions = {}  # Название распределения -> RunningStats
+
+    def add(self, test, field, value):
+        if field == RESULT:
+            counts = self.tests.setdefault(test, [0, 0])
+            counts[0 if value == PASSED else 1] += 1
+            return
+        name = DISTRIBUTION_BY_FIELD.get((test, field))
+        if name is not None and isinstance(value, (int, float)):
+            stats = self.distributions.get(name)
+            if stats is None:
+                stats = self.distributions[name] = RunningStats()
+            stats.add(value)
+
+    def to_json(self):
+        return json.dumps({
+            "tests": {str(test): counts for test, counts in self.tests.items()},
+            "distributions": {name: stats.as_list() for name, stats in self.distributions.items()},
+        })
+
+    @classmethod
+    def from_json(cls, payload):
+        data = json.loads(payload)
+        aggregate = cls()
+        aggregate.tests = {int(test): counts for test, counts in data["tests"].items()}
+        aggregate.distributions = {name: RunningStats(*values) for name, values in data["distributions"].items()}
+        return aggregate
+
+
+def period_bounds(granularity, day):
+    """Возвращает период, содержащий дату.
+
+    Args:
+        granularity (str): "day", "week" или "month"
+        day (date): Дата
+
+    Returns:
+        tuple: (название периода, первый день, первый день следующего периода)
+    """
+    if granularity == "day":
+        return day.isoformat(), day, day + timedelta(days=1)
+    if granularity == "week":
+        start = day - timedelta(days=day.weekday())
+        year, week, _ = start.isocalendar()
+        return f"{year}-W{week:02d}", start, start + timedelta(days=7)
+    if granularity == "month":
+        start = day.replace(day=1)
+        end = (start + timedelta(days=32)).replace(day=1)
+        return start.strftime("%Y-%m"), start, end
+    raise ValueError(f"Неизвестный период отчета: {granularity}")
+
+
+def iter_periods(granularity, start, end):
+    """Перебирает периоды, пересекающиеся с интервалом [start, end)."""
+    day = start
+    while day < end:
+        period = period_bounds(granularity, day)
+        yield period
+        day = period[2]
+
+
+def _timestamp(day):
+    return time.mktime(datetime.combine(day, datetime.min.time()).timetuple())
+
+
+class ReportBuilder:
+    """Построение сводных отчетов по хранилищу результатов."""
+
+    def __init__(self, db_path="baseReda.db"):
+        self.conn = sqlite3.connect(db_path)
+        install_results_schema(self.conn)
+        self.conn.execute(REPORT_CACHE_DDL)
+        self.conn.commit()
+
+    def _max_measurement_id(self):
+        return self.conn.execute("SELECT COALESCE(MAX(ID), 0) FROM Measurements").fetchone()[0]
+
+    def _aggregate(self, start_ts, end_ts, key=None):
+        """Один проход по измерениям интервала.
+
+        Args:
+            key: Функция model -> ключ группы (None - одна группа)
+
+        Returns:
+            dict: {ключ: Aggregate}
+        """
+        groups = {}
+        cursor = self.conn.execute(ROWS_QUERY, (start_ts, end_ts))
+        while True:
+            rows = cursor.fetchmany(1000)
+            if not rows:
+                break
+            for model, test, field, value in rows:
+                group = key(model) if key else None
+                aggregate = groups.get(group)
+                if aggregate is None:
+                    aggregate = groups[group] = Aggregate()
+                aggregate.add(test, field, value)
+        return groups
+
+    def period_report(self, granularity, start, end):
+        """Отчет по периодам (день, неделя, месяц).
+
+        Args:
+            granularity (str): "day", "week" или "month"
+            start (date): Первый день отчета
+            end (date): День, следующий за последним днем отчета
+
+        Returns:
+            list: [(название периода, Aggregate)]
+        """
+        today = date.today()
+        report = []
+        for name, period_start, period_end in iter_periods(granularity, start, end):
+            start_ts, end_ts = _timestamp(period_start), _timestamp(period_end)
+            finished = period_end <= today
+            aggregate = self._cached(granularity, name, start_ts, end_ts) if finished else None
+            if aggregate is None:
+                max_id = self._max_measurement_id()
+                aggregate = self._aggregate(start_ts, end_ts).get(None, Aggregate())
+                if finished:
+                    with self.conn:
+                        self.conn.execute(
+                            "INSERT OR REPLACE INTO ReportCache (granularity, period, max_measurement_id, payload) "
+                            "VALUES (?, ?, ?, ?)", (granularity, name, max_id, aggregate.to_json()))
+            report.append((name, aggregate))
+        return report
+
+    def _cached(self, granularity, name, start_ts, end_ts):
+        """Возвращает агрегаты завершенного периода из кэша, если они не устарели."""
+        row = self.conn.execute(
+            "SELECT max_measurement_id, payload FROM ReportCache WHERE granularity = ? AND period = ?",
+            (granularity, name)).fetchone()
+        if row is None:
+            return None
+        max_id, payload = row
+        if self.conn.execute(CHANGED_QUERY, (max_id, start_ts, end_ts)).fetchone():
+            return None
+        return Aggregate.from_json(payload)
+
+    def model_report(self, start, end):
+        """Отчет по моделям ПЭД за интервал [start, end).
+
+        Returns:
+            list: [(модель, Aggregate)] в порядке названий моделей
+        """
+        groups = self._aggregate(_timestamp(start), _timestamp(end), key=lambda model: model)
+        return sorted(groups.items())
+
+    def close(self):
+        self.conn.close()
+
+
+def test_rows(report):
+    """Строки таблицы "годно/не годно" по испытаниям."""
+    yield ["Группа", "№", "Испытание", "Годно", "Не годно", "Всего"]
+    for group, aggregate in report:
+        for test in sorted(aggregate.tests):
+            passed, failed = aggregate.tests[test]
+            yield [group, test, TEST_NAMES.get(test, ""), passed, failed, passed + failed]
+
+
+def distribution_rows(report):
+    """Строки таблицы распределений измеренных величин."""
+    yield ["Группа", "Величина", "Количество", "Минимум", "Максимум", "Среднее", "СКО"]
+    for group, aggregate in report:
+        for name in DISTRIBUTIONS:
+            stats = aggregate.distributions.get(name)
+            if stats is not None:
+                yield [group, name, stats.count, stats.min, stats.max, round(stats.mean, 4), round(stats.std, 4)]
+
+
+def write_xlsx(report, path):
+    """Записывает отчет в книгу xlsx построчно (режим write_only)."""
+    wb = openpyxl.Workbook(write_only=True)
+    for title, rows in (("Испытания", test_rows(report)), ("Распределения", distribution_rows(report))):
+        sheet = wb.create_sheet(title)
+        for row in rows:
+            sheet.append(row)
+    wb.save(path)
+
+
+def write_csv(report, path):
+    """Записывает отчет в CSV (разделитель ";"): таблица испытаний, пустая строка, таблица распределений."""
+    with open(path, "w", newline="", encoding="utf-8-sig") as f:
+        writer = csv.writer(f, delimiter=";")
+        writer.writerows(test_rows(report))
+        writer.writerow([])
+        writer.writerows(distribution_rows(report))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Сводные отчеты по результатам испытаний ПЭД")
+    parser.add_argument("--db", default="baseReda.db", help="Путь к базе данных")
+    parser.add_argument("--period", choices=("day", "week", "month", "model"), default="day",
+                        help="Группировка: по дням, неделям, месяцам или моделям")
+    parser.add_argument("--from", dest="start", type=date.fromisoformat, required=True,
+                        help="Первый день отчета (ГГГГ-ММ-ДД)")
+    parser.add_argument("--to", dest="end", type=date.fromisoformat, required=True,
+                        help="День, следующий за последним днем отчета (ГГГГ-ММ-ДД)")
+    parser.add_argument("--xlsx", help="Файл отчета xlsx")
+    parser.add_argument("--csv", help="Файл отчета CSV")
+    args = parser.parse_args(argv)
+
+    if not (args.xlsx or args.csv):
+        parser.error("Укажите файл отчета: --xlsx и/или --csv")
+
+    started = time.perf_counter()
+    builder = ReportBuilder(args.db)
+    try:
+        if args.period == "model":
+            report = builder.model_report(args.start, args.end)
+        else:
+            report = builder.period_report(args.period, args.start, args.end)
+    finally:
+        builder.close()
+
+    if args.xlsx:
+        write_xlsx(report, args.xlsx)
+    if args.csv:
+        write_csv(report, args.csv)
+    print(f"Отчет сформирован за {time.perf_counter() - started:.2f} с: групп {len(report)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,69 @@
+"""Общие шрифты, цвета, кисти и перья интерфейса.
+
+Объекты создаются при первом запросе (после создания wx.App) и хранятся в
+кэше, поэтому окна программы используют одни и те же объекты вместо
+создания новых в каждом конструкторе и обработчике. Цвета задаются
+кортежем (R, G, B) или именем из THEME.
+"""
+import wx
+
+# Цвета оформления программы
+THEME = {
+    "window": (240, 245, 250),  # Фон главного окна
+    "panel": (250, 252, 255),  # Фон панелей выбора модели и параметров
+    "dialog": (245, 248, 252),  # Фон диалогов испытаний
+    "title": (0, 50, 100),  # Заголовки
+    "accent": (70, 130, 180),  # Кнопки диалогов
+    "test_button": (0, 0, 0),  # Кнопки испытаний
+    "test_button_hover": (50, 50, 50),  # Кнопка испытания под курсором
+    "test_done": (51, 255, 153),  # Выполненное испытание
+    "save": (255, 255, 127),  # Кнопка сохранения
+    "saved": (51, 255, 153),  # Кнопка сохранения после записи
+    "label": (85, 0, 255),  # Подписи полей ввода результатов
+    "error_cell": (255, 200, 200),  # Ячейка с ошибкой проверки
+    "chart": (255, 255, 255),  # Фон графика
+    "chart_grid": (225, 230, 238),  # Сетка графика
+    "splash_text": (220, 230, 255),
+    "splash_status": (120, 130, 160),
+}
+
+_fonts = {}
+_colours = {}
+_brushes = {}
+_pens = {}
+
+
+def font(size, bold=True):
+    """Шрифт по умолчанию заданного размера (полужирный или обычный)."""
+    key = (int(size), bold)
+    cached = _fonts.get(key)
+    if cached is None:
+        cached = _fonts[key] = wx.Font(key[0], wx.FONTFAMILY_DEFAULT, wx.FONTSTYLE_NORMAL,
+                                       wx.FONTWEIGHT_BOLD if bold else wx.FONTWEIGHT_NORMAL)
+    return cached
+
+
+def colour(*value):
+    """Цвет: colour("accent") или colour(70, 130, 180)."""
+    key = THEME[value[0]] if len(value) == 1 else value
+    cached = _colours.get(key)
+    if cached is None:
+        cached = _colours[key] = wx.Colour(*key)
+    return cached
+
+
+def brush(*value):
+    """Сплошная кисть цвета (см. colour)."""
+    cached = _brushes.get(value)
+    if cached is None:
+        cached = _brushes[value] = wx.Brush(colour(*value))
+    return cached
+
+
+def pen(*value, width=1):
+    """Сплошное перо цвета (см. colour)."""
+    key = (value, width)
+    cached = _pens.get(key)
+    if cached is None:
+        cached = _pens[key] = wx.Pen(colour(*value), width)
+    return cached
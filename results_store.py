@@ -0,0 +1,399 @@
+"""Хранилище результатов испытаний ПЭД в базе данных SQLite.
+
+Сессии испытаний, протоколы и отдельные измерения хранятся в
+нормализованных таблицах рядом с каталогом (таблица Base). Файл протокола
+xlsx формируется из этих данных (render_protocol), а история, статистика и
+повторный экспорт выполняются индексированными SQL-запросами.
+
+Каждое сохранение надежно фиксируется в базе, а файл протокола
+перезаписывается одной объединенной записью в контрольных точках
+(checkpoint), при смене протокола и при завершении программы. Протоколы,
+не записанные до сбоя, дописываются при следующем запуске (render_pending).
+
+Измерения накапливаются в буфере и записываются пакетом в одной транзакции.
+Все записи выполняются общей очередью записи базы (db_queue.py), поэтому
+станции, сохраняющие результаты одновременно, не блокируют друг друга;
+чтение выполняется на собственном соединении хранилища после завершения
+поставленных им записей.
+"""
+import atexit
+import logging
+import os
+import sqlite3
+import threading
+import time
+from db_queue import get_write_queue
+from protocol import write_results
+from protocol_map import CURRENT_VERSION, TEST_FIELDS, mapped_tests
+
+RESULTS_DDL = (
+    """
+    CREATE TABLE IF NOT EXISTS TestSessions (
+        ID INTEGER PRIMARY KEY AUTOINCREMENT,
+        model_id INTEGER REFERENCES Base(ID),
+        ed_number TEXT,
+        operator TEXT,
+        started_at REAL NOT NULL,
+        finished_at REAL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS Protocols (
+        ID INTEGER PRIMARY KEY AUTOINCREMENT,
+        session_id INTEGER NOT NULL REFERENCES TestSessions(ID),
+        path TEXT NOT NULL UNIQUE,
+        number TEXT,
+        execution_group TEXT,
+        template_version INTEGER NOT NULL,
+        created_at REAL NOT NULL,
+        rendered_id INTEGER
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS Measurements (
+        ID INTEGER PRIMARY KEY AUTOINCREMENT,
+        protocol_id INTEGER NOT NULL REFERENCES Protocols(ID),
+        test INTEGER NOT NULL,
+        field TEXT NOT NULL,
+        value,
+        unit TEXT,
+        measured_at REAL NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_sessions_model ON TestSessions (model_id, started_at)",
+    "CREATE INDEX IF NOT EXISTS idx_sessions_started ON TestSessions (started_at)",
+    "CREATE INDEX IF NOT EXISTS idx_protocols_session ON Protocols (session_id)",
+    "CREATE INDEX IF NOT EXISTS idx_measurements_protocol ON Measurements (protocol_id, test, field)",
+    "CREATE INDEX IF NOT EXISTS idx_measurements_test ON Measurements (test, field)",
+)
+
+
+def install_results_schema(conn):
+    """Создает таблицы и индексы хранилища результатов, если их нет.
+
+    Args:
+        conn: Соединение с базой данных SQLite
+    """
+    for statement in RESULTS_DDL:
+        conn.execute(statement)
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(Protocols)")]
+    if "rendered_id" not in columns:
+        # ID последнего измерения, записанного в файл протокола; прежние протоколы записывались при каждом сохранении
+        conn.execute("ALTER TABLE Protocols ADD COLUMN rendered_id INTEGER")
+        conn.execute("UPDATE Protocols SET rendered_id = "
+                     "(SELECT MAX(ID) FROM Measurements WHERE protocol_id = Protocols.ID)")
+    conn.commit()
+
+
+class ResultsStore:
+    """Запись и чтение результатов испытаний."""
+
+    def __init__(self, db_path="baseReda.db", batch_size=500, checkpoint_interval=300.0):
+        """Инициализация хранилища.
+
+        Args:
+            db_path (str): Путь к файлу базы данных SQLite
+            batch_size (int): Размер буфера измерений, при котором выполняется запись
+            checkpoint_interval (float): Интервал контрольных точек записи протокола, сек
+        """
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.checkpoint_interval = checkpoint_interval
+        self.checkpoints = {}  # ID протокола -> время последней записи файла (time.monotonic)
+        self.buffer = []  # Незаписанные измерения
+        self.pending = []  # Незавершенные и неудачные записи в очереди (Future), см. sync
+        self.lock = threading.RLock()
+        self.writer = get_write_queue(db_path)
+        self.writer.call(install_results_schema)
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+
+    def open_protocol(self, path, model_id=None, header=None, ed_number=None, operator=None,
+                      version=CURRENT_VERSION):
+        """Возвращает ID протокола по пути к файлу, регистрируя новый протокол и сессию.
+
+        Args:
+            path (str): Путь к файлу протокола
+            model_id (int): ID модели ПЭД в таблице Base
+            header (dict): Поля шапки протокола (protocol_number, execution_group)
+            ed_number (str): Номер ЭД
+            operator (str): Оператор
+            version (int): Версия карты ячеек шаблона
+
+        Returns:
+            int: ID протокола
+        """
+        path = os.path.abspath(path)
+        header = header or {}
+        with self.lock:
+            row = self.conn.execute("SELECT ID FROM Protocols WHERE path = ?", (path,)).fetchone()
+        if row:
+            return row[0]
+
+        def register(conn):
+            # Повторная проверка в потоке записи: протокол мог зарегистрировать другой поток
+            row = conn.execute("SELECT ID FROM Protocols WHERE path = ?", (path,)).fetchone()
+            if row:
+                return row[0]
+            now = time.time()
+            cursor = conn.execute(
+                "INSERT INTO TestSessions (model_id, ed_number, operator, started_at) VALUES (?, ?, ?, ?)",
+                (model_id, ed_number, operator, now))
+            cursor = conn.execute(
+                "INSERT INTO Protocols (session_id, path, number, execution_group, template_version, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (cursor.lastrowid, path, header.get("protocol_number"), header.get("execution_group"),
+                 version, now))
+            return cursor.lastrowid
+
+        return self.writer.call(register)
+
+    def finish_session(self, protocol_id):
+        """Отмечает завершение сессии испытаний протокола."""
+        self.flush()
+        with self.lock:
+            self._submit(
+                lambda conn, *params: conn.execute(
+                    "UPDATE TestSessions SET finished_at = ? WHERE ID = "
+                    "(SELECT session_id FROM Protocols WHERE ID = ?)", params),
+                time.time(), protocol_id)
+
+    def add_measurement(self, protocol_id, test, field, value, unit=None):
+        """Добавляет измерение в буфер (запись - пакетом, см. flush)."""
+        with self.lock:
+            self.buffer.append((protocol_id, test, field, value, unit, time.time()))
+            if len(self.buffer) >= self.batch_size:
+                self.flush()
+
+    def add_results(self, protocol_id, results, units=None):
+        """Добавляет набор значений в буфер.
+
+        Args:
+            protocol_id (int): ID протокола
+            results (dict): {номер испытания: {поле: значение}}
+            units (dict): {поле: единица измерения}
+        """
+        units = units or {}
+        now = time.time()
+        with self.lock:
+            self.buffer.extend((protocol_id, test, field, value, units.get(field), now)
+                               for test, fields in results.items() for field, value in fields.items())
+            if len(self.buffer) >= self.batch_size:
+                self.flush()
+
+    def flush(self):
+        """Ставит буфер измерений в очередь записи (одна транзакция, без ожидания)."""
+        with self.lock:
+            if not self.buffer:
+                return
+            self._submit(
+                lambda conn, rows: conn.executemany(
+                    "INSERT INTO Measurements (protocol_id, test, field, value, unit, measured_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)", rows),
+                self.buffer)
+            self.buffer = []
+
+    def _submit(self, func, *args):
+        """Ставит запись в очередь (под self.lock); успешно завершенные записи больше не отслеживаются"""
+        self.pending = [future for future in self.pending if not future.done() or future.exception() is not None]
+        self.pending.append(self.writer.submit(func, *args))
+
+    def sync(self):
+        """Записывает буфер и ожидает завершения всех поставленных хранилищем записей.
+
+        Ошибка записи сообщается вызовам sync, начавшим ожидание до ее получения.
+
+        Raises:
+            sqlite3.Error: Первая ошибка среди ожидаемых записей
+        """
+        with self.lock:
+            self.flush()
+            pending = list(self.pending)
+        errors = []
+        for future in pending:
+            try:
+                future.result()
+            except Exception as e:
+                errors.append(e)
+        with self.lock:
+            self.pending = [future for future in self.pending if future not in pending]
+        if errors:
+            raise errors[0]
+
+    def results(self, protocol_id, fields=None):
+        """Возвращает последние значения измерений протокола.
+
+        Args:
+            protocol_id (int): ID протокола
+            fields: Отбираемые поля (по умолчанию - все)
+
+        Returns:
+            dict: {номер испытания: {поле: значение}}
+        """
+        return self._latest(protocol_id, fields)[0]
+
+    def _latest(self, protocol_id, fields=None):
+        """Возвращает последние значения измерений протокола и ID последнего измерения."""
+        self.sync()
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT ID, test, field, value FROM Measurements WHERE ID IN "
+                "(SELECT MAX(ID) FROM Measurements WHERE protocol_id = ? GROUP BY test, field)",
+                (protocol_id,)).fetchall()
+        results = {}
+        last_id = 0
+        for measurement_id, test, field, value in rows:
+            last_id = max(last_id, measurement_id)
+            if fields is None or field in fields:
+                results.setdefault(test, {})[field] = value
+        return results, last_id
+
+    def render_protocol(self, protocol_id):
+        """Записывает в файл протокола шапку и последние результаты испытаний.
+
+        Результаты испытаний, ячейки которых не подтверждены шаблоном
+        (см. protocol_map.mapped_tests), остаются только в базе.
+
+        Args:
+            protocol_id (int): ID протокола
+
+        Returns:
+            list: Номера испытаний, результаты которых не записаны в файл
+        """
+        with self.lock:
+            path, number, group, version = self.conn.execute(
+                "SELECT path, number, execution_group, template_version FROM Protocols WHERE ID = ?",
+                (protocol_id,)).fetchone()
+        header = {name: value for name, value in (("protocol_number", number), ("execution_group", group))
+                  if value is not None}
+        results, last_id = self._latest(protocol_id, TEST_FIELDS)
+        mapped = mapped_tests(version)
+        write_results(path, {test: fields for test, fields in results.items() if test in mapped}, header, version)
+        with self.lock:
+            self.checkpoints[protocol_id] = time.monotonic()
+            self._submit(
+                lambda conn, *params: conn.execute(
+                    "UPDATE Protocols SET rendered_id = MAX(COALESCE(rendered_id, 0), ?) WHERE ID = ?", params),
+                last_id, protocol_id)
+        return sorted(set(results) - mapped)
+
+    def checkpoint(self, protocol_id, force=False):
+        """Записывает протокол, если наступила контрольная точка и есть незаписанные результаты.
+
+        Args:
+            protocol_id (int): ID протокола
+            force (bool): Записать, не дожидаясь контрольной точки
+
+        Returns:
+            list: Номера испытаний, не записанные в файл (см. render_protocol), или None, если запись отложена
+        """
+        now = time.monotonic()
+        with self.lock:
+            last = self.checkpoints.setdefault(protocol_id, now)
+        if not force and now - last < self.checkpoint_interval:
+            return None
+        if not self._unrendered(protocol_id):
+            return []
+        return self.render_protocol(protocol_id)
+
+    def _unrendered(self, protocol_id=None):
+        """Возвращает [(ID, путь)] протоколов с результатами, не записанными в файл."""
+        self.sync()
+        query = ("SELECT p.ID, p.path FROM Protocols p WHERE EXISTS (SELECT 1 FROM Measurements m "
+                 "WHERE m.protocol_id = p.ID AND m.ID > COALESCE(p.rendered_id, 0))")
+        params = []
+        if protocol_id is not None:
+            query += " AND p.ID = ?"
+            params.append(protocol_id)
+        with self.lock:
+            return self.conn.execute(query, params).fetchall()
+
+    def render_pending(self):
+        """Записывает все протоколы с незаписанными результатами (завершение программы, сбой).
+
+        Returns:
+            list: Пути записанных протоколов
+        """
+        rendered = []
+        for protocol_id, path in self._unrendered():
+            if not os.path.exists(path):
+                continue
+            try:
+                self.render_protocol(protocol_id)
+                rendered.append(path)
+            except Exception as e:
+                logging.error(f"Ошибка записи протокола {path}: {e}")
+        return rendered
+
+    def history(self, model_id):
+        """Возвращает протоколы испытаний модели, начиная с последних.
+
+        Returns:
+            list: [(ID протокола, номер протокола, номер ЭД, оператор, начало сессии, путь)]
+        """
+        self.sync()
+        with self.lock:
+            return self.conn.execute(
+                "SELECT p.ID, p.number, s.ed_number, s.operator, s.started_at, p.path "
+                "FROM TestSessions s JOIN Protocols p ON p.session_id = s.ID "
+                "WHERE s.model_id = ? ORDER BY s.started_at DESC", (model_id,)).fetchall()
+
+    def statistics(self, test, field, model_id=None):
+        """Возвращает статистику числовых значений измерения.
+
+        Args:
+            test (int): Номер испытания
+            field (str): Поле (измеряемая величина)
+            model_id (int): ID модели (по умолчанию - все модели)
+
+        Returns:
+            tuple: (количество, минимум, максимум, среднее)
+        """
+        self.sync()
+        query = ("SELECT COUNT(m.value), MIN(m.value), MAX(m.value), AVG(m.value) FROM Measurements m "
+                 "JOIN Protocols p ON p.ID = m.protocol_id JOIN TestSessions s ON s.ID = p.session_id "
+                 "WHERE m.test = ? AND m.field = ? AND typeof(m.value) IN ('integer', 'real')")
+        params = [test, field]
+        if model_id is not None:
+            query += " AND s.model_id = ?"
+            params.append(model_id)
+        with self.lock:
+            return self.conn.execute(query, params).fetchone()
+
+    def close(self):
+        self.sync()
+        self.conn.close()
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_results_store(db_path="baseReda.db"):
+    """Возвращает общее хранилище результатов для файла базы данных.
+
+    Args:
+        db_path (str): Путь к файлу базы данных SQLite
+
+    Returns:
+        ResultsStore: Хранилище (одно на файл базы в процессе)
+    """
+    key = os.path.abspath(db_path)
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = ResultsStore(db_path)
+            _stores[key] = store
+        return store
+
+
+@atexit.register
+def render_all():
+    """Записывает незаписанные протоколы всех хранилищ при завершении программы."""
+    with _stores_lock:
+        stores = list(_stores.values())
+    for store in stores:
+        try:
+            store.render_pending()
+            store.sync()
+        except Exception as e:
+            logging.error(f"Ошибка записи протоколов {store.db_path}: {e}")
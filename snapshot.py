@@ -0,0 +1,287 @@
+"""Колоночный снимок каталога электродвигателей в памяти (таблица Base).
+
+Числовые колонки хранятся в массивах NumPy, названия моделей - в таблице
+строк с целочисленными кодами. Фильтры, сортировки, статистика и поиск
+ближайших моделей выполняются векторно, без обращения к базе.
+"""
+import sqlite3
+from catalog import COLUMN_NAMES, NUMERIC_COLUMNS
+from lazy_import import optional_module
+
+# NumPy загружается при первом построении снимка; если он не установлен -
+# работаем через SQL-запросы (см. catalog.py)
+np = optional_module("numpy")
+
+
+def to_float(value):
+    """Приводит значение ячейки к числу (поддерживает десятичную запятую).
+
+    Args:
+        value: Значение из базы данных
+
+    Returns:
+        float: Число или NaN, если значение пустое или не является числом
+    """
+    if value is None or value == "":
+        return float("nan")
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return float(str(value).replace(",", "."))
+    except ValueError:
+        return float("nan")
+
+
+class CatalogSnapshot:
+    """Колоночный снимок таблицы Base, оптимизированный для чтения."""
+
+    def __init__(self, columns):
+        """Инициализация пустого снимка.
+
+        Args:
+            columns (list): Имена числовых колонок
+        """
+        self.columns = list(columns)
+        self.ids = np.empty(0, dtype=np.int64)
+        self.model_codes = np.empty(0, dtype=np.int32)
+        self.model_names = []  # Таблица строк: код модели -> название
+        self.model_index = {}  # Название модели -> код
+        self.data = {name: np.empty(0, dtype=np.float64) for name in self.columns}
+        self.id_positions = {}  # ID записи -> позиция в массивах
+
+    @staticmethod
+    def available():
+        """Проверяет, доступен ли NumPy для построения снимка."""
+        return np is not None
+
+    @classmethod
+    def load(cls, conn):
+        """Строит снимок по всей таблице Base.
+
+        Args:
+            conn: Соединение с базой данных SQLite
+
+        Returns:
+            CatalogSnapshot: Заполненный снимок
+        """
+        cursor = conn.execute(f"SELECT {', '.join(COLUMN_NAMES)} FROM Base")
+        snapshot = cls(NUMERIC_COLUMNS)
+        snapshot._append_rows(COLUMN_NAMES, cursor.fetchall())
+        return snapshot
+
+    def __len__(self):
+        return len(self.ids)
+
+    @property
+    def nbytes(self):
+        """Объем памяти, занимаемый массивами снимка (байт)."""
+        total = self.ids.nbytes + self.model_codes.nbytes
+        total += sum(array.nbytes for array in self.data.values())
+        total += sum(len(name.encode("utf-8")) for name in self.model_names)
+        return total
+
+    def _model_code(self, model):
+        """Возвращает код модели в таблице строк, добавляя новую при необходимости."""
+        model = model or ""
+        code = self.model_index.get(model)
+        if code is None:
+            code = len(self.model_names)
+            self.model_names.append(model)
+            self.model_index[model] = code
+        return code
+
+    def _append_rows(self, names, rows):
+        """Добавляет строки выборки в конец массивов."""
+        if not rows:
+            return
+        positions = {name: i for i, name in enumerate(names)}
+        id_pos, model_pos = positions["ID"], positions["Model"]
+
+        self.ids = np.concatenate([self.ids, np.array([row[id_pos] for row in rows], dtype=np.int64)])
+        codes = np.array([self._model_code(row[model_pos]) for row in rows], dtype=np.int32)
+        self.model_codes = np.concatenate([self.model_codes, codes])
+        for name in self.columns:
+            pos = positions.get(name)
+            values = np.array([to_float(row[pos]) if pos is not None else float("nan") for row in rows],
+                              dtype=np.float64)
+            self.data[name] = np.concatenate([self.data[name], values])
+        self._rebuild_positions()
+
+    def _rebuild_positions(self):
+        self.id_positions = {int(row_id): i for i, row_id in enumerate(self.ids)}
+
+    def update_rows(self, conn, ids):
+        """Инкрементально обновляет снимок для измененных записей.
+
+        Записи, которых больше нет в базе, удаляются из снимка, новые - добавляются.
+
+        Args:
+            conn: Соединение с базой данных SQLite
+            ids: ID измененных записей
+        """
+        ids = [int(row_id) for row_id in ids]
+        if not ids:
+            return
+        placeholders = ", ".join("?" * len(ids))
+        cursor = conn.execute(f"SELECT {', '.join(COLUMN_NAMES)} FROM Base WHERE ID IN ({placeholders})", ids)
+        names = COLUMN_NAMES
+        rows = cursor.fetchall()
+        positions = {name: i for i, name in enumerate(names)}
+        id_pos, model_pos = positions["ID"], positions["Model"]
+
+        # Обновление существующих записей на месте
+        new_rows = []
+        found = set()
+        for row in rows:
+            row_id = int(row[id_pos])
+            found.add(row_id)
+            index = self.id_positions.get(row_id)
+            if index is None:
+                new_rows.append(row)
+                continue
+            self.model_codes[index] = self._model_code(row[model_pos])
+            for name in self.columns:
+                pos = positions.get(name)
+                self.data[name][index] = to_float(row[pos]) if pos is not None else float("nan")
+
+        # Удаление записей, отсутствующих в базе
+        removed = [self.id_positions[row_id] for row_id in ids
+                   if row_id not in found and row_id in self.id_positions]
+        if removed:
+            keep = np.ones(len(self.ids), dtype=bool)
+            keep[removed] = False
+            self.ids = self.ids[keep]
+            self.model_codes = self.model_codes[keep]
+            for name in self.columns:
+                self.data[name] = self.data[name][keep]
+            self._rebuild_positions()
+
+        self._append_rows(names, new_rows)
+
+    def models(self, mask=None):
+        """Возвращает отсортированный список уникальных моделей.
+
+        Args:
+            mask: Булев массив отбора строк (None - все строки)
+
+        Returns:
+            list: Названия моделей
+        """
+        codes = self.model_codes if mask is None else self.model_codes[mask]
+        return sorted(name for name in (self.model_names[code] for code in np.unique(codes)) if name)
+
+    def range_mask(self, ranges):
+        """Строит маску строк, попадающих в заданные диапазоны.
+
+        Args:
+            ranges (dict): {имя колонки: (нижняя граница, верхняя граница)},
+                граница None означает отсутствие ограничения
+
+        Returns:
+            numpy.ndarray: Булев массив отбора строк
+        """
+        mask = np.ones(len(self.ids), dtype=bool)
+        for name, (low, high) in ranges.items():
+            column = self.data[name]
+            if low is not None:
+                mask &= column >= low
+            if high is not None:
+                mask &= column <= high
+        return mask
+
+    def filter_models(self, ranges):
+        """Возвращает модели, попадающие в диапазоны (аналог catalog.find_models_in_ranges)."""
+        return self.models(self.range_mask(ranges))
+
+    def sorted_ids(self, column, descending=False, mask=None):
+        """Возвращает ID записей, отсортированные по значению колонки.
+
+        Пустые значения (NaN) всегда располагаются в конце.
+
+        Args:
+            column (str): Имя колонки
+            descending (bool): Сортировка по убыванию
+            mask: Булев массив отбора строк (None - все строки)
+
+        Returns:
+            numpy.ndarray: ID записей
+        """
+        values = self.data[column]
+        ids = self.ids
+        if mask is not None:
+            values, ids = values[mask], ids[mask]
+        order = np.argsort(-values if descending else values, kind="stable")
+        return ids[order]
+
+    def stats(self, column, mask=None):
+        """Возвращает минимум, максимум и среднее значение колонки без учета пустых значений.
+
+        Args:
+            column (str): Имя колонки
+            mask: Булев массив отбора строк (None - все строки)
+
+        Returns:
+            tuple: (минимум, максимум, среднее) или (None, None, None) при отсутствии значений
+        """
+        values = self.data[column] if mask is None else self.data[column][mask]
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return None, None, None
+        return float(values.min()), float(values.max()), float(values.mean())
+
+    def nearest_models(self, target, columns, count=10, exclude=None):
+        """Ищет модели с наиболее близкими значениями параметров.
+
+        Расстояние считается по колонкам, нормированным на их размах;
+        пустые значения в строке считаются максимальным отклонением.
+
+        Args:
+            target (dict): {имя колонки: значение} - параметры искомой модели
+            columns: Колонки, участвующие в сравнении
+            count (int): Количество возвращаемых моделей
+            exclude (str): Модель, исключаемая из результата (обычно сама искомая)
+
+        Returns:
+            list: Названия ближайших моделей в порядке возрастания расстояния
+        """
+        if not len(self.ids):
+            return []
+        distance = np.zeros(len(self.ids), dtype=np.float64)
+        for name in columns:
+            value = to_float(target.get(name))
+            if np.isnan(value):
+                continue
+            column = self.data[name]
+            low, high, _ = self.stats(name)
+            span = (high - low) or 1.0
+            delta = np.abs(column - value) / span
+            distance += np.where(np.isnan(delta), 1.0, delta) ** 2
+
+        result = []
+        seen = set()
+        for index in np.argsort(distance, kind="stable"):
+            name = self.model_names[self.model_codes[index]]
+            if not name or name == exclude or name in seen:
+                continue
+            seen.add(name)
+            result.append(name)
+            if len(result) >= count:
+                break
+        return result
+
+
+def load_snapshot(conn):
+    """Строит снимок каталога, если доступен NumPy.
+
+    Args:
+        conn: Соединение с базой данных SQLite
+
+    Returns:
+        CatalogSnapshot или None, если NumPy не установлен или чтение не удалось
+    """
+    if not CatalogSnapshot.available():
+        return None
+    try:
+        return CatalogSnapshot.load(conn)
+    except sqlite3.Error:
+        return None
@@ -0,0 +1,103 @@
+"""Профилирование запуска программы.
+
+Включается переменной окружения PED_STARTUP_PROFILE: значение "1" -
+отчет записывается в startup_profile.txt, иначе значение - путь к файлу
+отчета. Модуль должен импортироваться первым: с этого момента измеряются
+время импорта каждого модуля (собственное и с вложенными импортами) и
+длительность этапов запуска (phase). Без переменной окружения phase и
+mark ничего не делают.
+"""
+import builtins
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+ENV_VAR = "PED_STARTUP_PROFILE"
+DEFAULT_REPORT = "startup_profile.txt"
+
+_setting = os.environ.get(ENV_VAR, "")
+enabled = bool(_setting)
+report_path = DEFAULT_REPORT if _setting in ("", "1") else _setting
+
+_started = time.perf_counter()
+_original_import = builtins.__import__
+_imports = {}  # Имя модуля -> [время с вложенными импортами, собственное время]
+_phases = []  # (этап, время от запуска, длительность)
+_local = threading.local()
+_reported = False
+
+
+def _timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+    if level == 0 and name in sys.modules:
+        return _original_import(name, globals, locals, fromlist, level)
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    stack.append(0.0)
+    start = time.perf_counter()
+    try:
+        return _original_import(name, globals, locals, fromlist, level)
+    finally:
+        elapsed = time.perf_counter() - start
+        children = stack.pop()
+        if stack:
+            stack[-1] += elapsed
+        entry = _imports.setdefault(name, [0.0, 0.0])
+        entry[0] += elapsed
+        entry[1] += elapsed - children
+
+
+@contextmanager
+def phase(name):
+    """Измеряет длительность этапа запуска."""
+    if not enabled:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _phases.append((name, start - _started, time.perf_counter() - start))
+
+
+def mark(name):
+    """Отмечает момент запуска (этап нулевой длительности)."""
+    if enabled:
+        _phases.append((name, time.perf_counter() - _started, 0.0))
+
+
+def write_report(path=None, limit=40):
+    """Записывает отчет о запуске (один раз за процесс).
+
+    Args:
+        path (str): Путь к файлу отчета (по умолчанию - из переменной окружения)
+        limit (int): Количество самых долгих импортов в отчете
+    """
+    global _reported
+    if not enabled or _reported:
+        return
+    _reported = True
+    builtins.__import__ = _original_import
+
+    total = time.perf_counter() - _started
+    lines = [f"Профиль запуска: {time.strftime('%Y-%m-%d %H:%M:%S')}",
+             f"Время от начала профилирования: {total * 1000:.1f} мс", "",
+             "Этапы запуска:",
+             f"{'Начало, мс':>12} {'Длит., мс':>12}  Этап"]
+    for name, offset, duration in sorted(_phases, key=lambda item: item[1]):
+        lines.append(f"{offset * 1000:12.1f} {duration * 1000:12.1f}  {name}")
+
+    lines += ["", f"Импорт модулей (первые {limit} по времени с вложенными импортами):",
+              f"{'Всего, мс':>12} {'Собств., мс':>12}  Модуль"]
+    ranked = sorted(_imports.items(), key=lambda item: item[1][0], reverse=True)
+    for name, (cumulative, own) in ranked[:limit]:
+        lines.append(f"{cumulative * 1000:12.1f} {own * 1000:12.1f}  {name}")
+
+    with open(path or report_path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+if enabled:
+    builtins.__import__ = _timed_import
@@ -0,0 +1,104 @@
+"""Испытательные станции (стенды), обслуживаемые одной программой.
+
+Каждая станция имеет собственный порт прибора, пул рабочих потоков
+(измерения, формирование протокола) и текущий протокол с результатами,
+поэтому измерения на одном стенде не задерживают другие. Каталог моделей
+(catalog_cache.py) и запись в базу данных (db_queue.py) общие для всех
+станций.
+
+Состав станций задается файлом stations.json:
+    [{"name": "Стенд 1", "port": "COM7"}, {"name": "Стенд 2", "port": "COM8"}]
+Без файла используется одна станция на порту COM7.
+"""
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from bench import BenchSession
+from results_store import get_results_store
+
+STATIONS_PATH = "stations.json"
+DEFAULT_STATIONS = [{"name": "Стенд 1", "port": "COM7"}]
+
+
+class Station:
+    """Испытательная станция: порт прибора, рабочие потоки и текущий протокол."""
+
+    def __init__(self, name, port="COM7", db_path="baseReda.db", workers=2):
+        """Инициализация станции.
+
+        Args:
+            name (str): Название станции
+            port (str): Порт прибора ("sim" - имитатор, см. instruments.open_port)
+            db_path (str): Путь к файлу базы данных SQLite
+            workers (int): Количество рабочих потоков станции
+        """
+        self.name = name
+        self.port = port
+        self.db_path = db_path
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"station-{name}")
+        self.protocol_path = None  # Путь к файлу протокола
+        self.protocol_id = None  # ID протокола в хранилище результатов
+        self.session = None  # Сессия испытаний открытого протокола (bench.BenchSession)
+        self.test_results = {}  # Номер испытания -> {поле: значение}
+
+    def submit(self, func, *args):
+        """Выполняет func(*args) в рабочем потоке станции.
+
+        Returns:
+            Future: Результат func
+        """
+        return self.executor.submit(func, *args)
+
+    def set_protocol(self, protocol_path, protocol_id=None):
+        """Назначает текущий протокол станции (результаты прежнего протокола сбрасываются).
+
+        Args:
+            protocol_path (str): Путь к файлу протокола
+            protocol_id (int): ID протокола в хранилище результатов базы станции (None - не зарегистрирован)
+        """
+        if self.session is not None:
+            # Результаты прежнего протокола, отложенные до контрольной точки, записываются в его файл
+            self.submit(self.session.checkpoint, True)
+        self.protocol_path = protocol_path
+        self.protocol_id = protocol_id
+        self.session = None
+        if protocol_id is not None:
+            self.session = BenchSession(protocol_path, get_results_store(self.db_path), protocol_id)
+        self.test_results = {}
+
+    def shutdown(self, wait=False):
+        """Останавливает рабочие потоки станции (выполняемые задания завершаются)."""
+        self.executor.shutdown(wait=wait)
+
+
+def load_stations(path=STATIONS_PATH, db_path="baseReda.db"):
+    """Загружает состав станций.
+
+    Args:
+        path (str): Путь к файлу состава станций (JSON)
+        db_path (str): Путь к файлу базы данных SQLite
+
+    Returns:
+        list: [Station]
+
+    Raises:
+        ValueError: Ошибка в файле состава станций
+    """
+    config = DEFAULT_STATIONS
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            config = json.load(f)  # json.JSONDecodeError - подкласс ValueError
+        if not isinstance(config, list) or not config:
+            raise ValueError(f"{path}: ожидается непустой список станций")
+
+    stations = []
+    names = set()
+    for number, entry in enumerate(config, 1):
+        if not isinstance(entry, dict) or not entry.get("port"):
+            raise ValueError(f"{path}: у станции {number} не указан порт прибора")
+        name = str(entry.get("name") or f"Стенд {number}")
+        if name in names:
+            raise ValueError(f"{path}: повторяется название станции {name}")
+        names.add(name)
+        stations.append(Station(name, entry["port"], db_path, entry.get("workers", 2)))
+    return stations
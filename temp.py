@@ -1,8 +1,14 @@
 import wx
 import wx.lib.scrolledpanel as scrolled
 import wx.lib.newevent
-import win32com.client as win32
+import logging
+import threading
 from pathlib import Path
+from validators import NumberValidator
+from resources import colour, font
+from catalog import to_float
+from protocol import OIL_BREAKDOWN_UNITS, oil_breakdown_results
+from results_store import get_results_store
 
 # Создаем пользовательское событие для сигнала о завершении опыта
 ExperienceOneEndedEvent, EVT_EXPERIENCE_ONE_ENDED = wx.lib.newevent.NewEvent()
@@ -24,8 +30,8 @@ class ExperienceOneDialog(wx.Dialog):
         instruction_text = ("Возьмите пробу масла. Произведите измерение напряжения пробоя масла. Введите измеренное и "
                             "паспортное значение:")
         instruction = wx.StaticText(panel, label=instruction_text)
-        instruction.SetFont(wx.Font(10, wx.FONTFAMILY_DEFAULT, wx.FONTSTYLE_NORMAL, wx.FONTWEIGHT_BOLD))
-        instruction.SetForegroundColour(wx.Colour(85, 0, 255))
+        instruction.SetFont(font(10))
+        instruction.SetForegroundColour(colour("label"))
         main_sizer.Add(instruction, 0, wx.ALL | wx.ALIGN_CENTER, 10)
 
         # Создаем горизонтальный сайзер для основного содержимого
@@ -36,22 +42,22 @@ class ExperienceOneDialog(wx.Dialog):
         form_sizer = wx.GridBagSizer(5, 5)
 
         lbl_voltage = wx.StaticText(form_panel, label="Напряжение пробоя масла, кВ")
-        lbl_voltage.SetFont(wx.Font(10, wx.FONTFAMILY_DEFAULT, wx.FONTSTYLE_NORMAL, wx.FONTWEIGHT_BOLD))
-        lbl_voltage.SetForegroundColour(wx.Colour(85, 0, 255))
+        lbl_voltage.SetFont(font(10))
+        lbl_voltage.SetForegroundColour(colour("label"))
         self.txt_voltage = wx.TextCtrl(form_panel, style=wx.TE_PROCESS_ENTER)
         self.txt_voltage.SetValidator(NumberValidator())
 
         lbl_nominal = wx.StaticText(form_panel, label="Паспортное значение, кВ")
-        lbl_nominal.SetFont(wx.Font(10, wx.FONTFAMILY_DEFAULT, wx.FONTSTYLE_NORMAL, wx.FONTWEIGHT_BOLD))
-        lbl_nominal.SetForegroundColour(wx.Colour(85, 0, 255))
+        lbl_nominal.SetFont(font(10))
+        lbl_nominal.SetForegroundColour(colour("label"))
         self.txt_nominal = wx.TextCtrl(form_panel, style=wx.TE_PROCESS_ENTER)
         self.txt_nominal.SetValidator(NumberValidator())
 
         lbl_result = wx.StaticText(form_panel, label="Результат")
-        lbl_result.SetFont(wx.Font(10, wx.FONTFAMILY_DEFAULT, wx.FONTSTYLE_NORMAL, wx.FONTWEIGHT_BOLD))
-        lbl_result.SetForegroundColour(wx.Colour(85, 0, 255))
+        lbl_result.SetFont(font(10))
+        lbl_result.SetForegroundColour(colour("label"))
         self.txt_result = wx.TextCtrl(form_panel, style=wx.TE_READONLY)
-        self.txt_result.SetFont(wx.Font(10, wx.FONTFAMILY_DEFAULT, wx.FONTSTYLE_NORMAL, wx.FONTWEIGHT_BOLD))
+        self.txt_result.SetFont(font(10))
 
         form_sizer.Add(lbl_voltage, (0, 0), flag=wx.ALIGN_CENTER_VERTICAL)
         form_sizer.Add(self.txt_voltage, (0, 1))
@@ -63,10 +69,10 @@ class ExperienceOneDialog(wx.Dialog):
         # Чекбоксы
         self.check_first = wx.CheckBox(form_panel, label="Первая обкатка")
         self.check_first.SetValue(True)
-        self.check_first.SetFont(wx.Font(10, wx.FONTFAMILY_DEFAULT, wx.FONTSTYLE_NORMAL, wx.FONTWEIGHT_BOLD))
+        self.check_first.SetFont(font(10))
 
         self.check_second = wx.CheckBox(form_panel, label="Вторая обкатка")
-        self.check_second.SetFont(wx.Font(10, wx.FONTFAMILY_DEFAULT, wx.FONTSTYLE_NORMAL, wx.FONTWEIGHT_BOLD))
+        self.check_second.SetFont(font(10))
 
         form_sizer.Add(self.check_first, (3, 0), flag=wx.TOP, border=10)
         form_sizer.Add(self.check_second, (4, 0), flag=wx.TOP, border=5)
@@ -84,9 +90,9 @@ class ExperienceOneDialog(wx.Dialog):
 
         # Кнопка сохранения
         self.btn_save = wx.Button(panel, label="Сохранить")
-        self.btn_save.SetFont(wx.Font(10, wx.FONTFAMILY_DEFAULT, wx.FONTSTYLE_NORMAL, wx.FONTWEIGHT_BOLD))
+        self.btn_save.SetFont(font(10))
         self.btn_save.SetCursor(wx.Cursor(wx.CURSOR_HAND))
-        self.btn_save.SetBackgroundColour(wx.Colour(255, 255, 127))
+        self.btn_save.SetBackgroundColour(colour("save"))
         self.btn_save.Bind(wx.EVT_BUTTON, self.on_save)
 
         main_sizer.Add(self.btn_save, 0, wx.ALIGN_RIGHT | wx.RIGHT | wx.BOTTOM, 10)
@@ -117,10 +123,18 @@ class ExperienceOneDialog(wx.Dialog):
             wx.MessageBox("Не заполнено одно из полей!", "Предупреждение!", wx.OK | wx.ICON_WARNING)
             return
 
-        # Сравнение значений
-        nominal = int(self.txt_nominal.GetValue())
-        voltage = int(self.txt_voltage.GetValue())
+        if not (self.check_first.GetValue() or self.check_second.GetValue()):
+            wx.MessageBox("Выберите номер обкатки!", "Предупреждение!", wx.OK | wx.ICON_WARNING)
+            return
+
+        try:
+            nominal = to_float(self.txt_nominal.GetValue())
+            voltage = to_float(self.txt_voltage.GetValue())
+        except ValueError:
+            wx.MessageBox("Введено некорректное число!", "Предупреждение!", wx.OK | wx.ICON_WARNING)
+            return
 
+        # Сравнение значений
         if nominal > voltage:
             self.txt_result.SetValue("Не годно!")
         else:
@@ -128,36 +142,40 @@ class ExperienceOneDialog(wx.Dialog):
 
         # Изменение вида кнопки
         self.btn_save.Enable(False)
-        self.btn_save.SetBackgroundColour(wx.Colour(51, 255, 153))
+        self.btn_save.SetBackgroundColour(colour("saved"))
         self.Refresh()
 
-        # Сохранение в Excel
-        try:
-            excel = win32.gencache.EnsureDispatch('Excel.Application')
-            excel.Visible = False
-            excel.DisplayAlerts = False
-
-            workbook = excel.Workbooks.Open(self.file_protocol)
-            sheet = workbook.Worksheets(1)
-
-            sheet.Cells(22, 19).Value = self.txt_result.GetValue()
-            sheet.Cells(22, 10).Value = nominal
-
-            if self.check_first.GetValue():
-                sheet.Cells(22, 13).Value = voltage
-            elif self.check_second.GetValue():
-                sheet.Cells(22, 16).Value = voltage
-            else:
-                wx.MessageBox("Выберите номер обкатки!", "Предупреждение!", wx.OK | wx.ICON_WARNING)
-                workbook.Close(SaveChanges=False)
-                excel.Quit()
-                return
-
-            workbook.Close(SaveChanges=True)
-            excel.Quit()
+        # Результат сохраняется в хранилище результатов базы станции главного окна, протокол формируется из него
+        station = getattr(wx.GetTopLevelParent(self.GetParent()), 'station', None)
+        store = get_results_store(station.db_path) if station else get_results_store()
+        thread = threading.Thread(target=self.write_protocol,
+                                  args=(store, self.txt_result.GetValue(), nominal, voltage,
+                                        self.check_second.GetValue()))
+        thread.daemon = True
+        thread.start()
 
+    def write_protocol(self, store, result, nominal, voltage, second_run):
+        try:
+            protocol_id = store.open_protocol(self.file_protocol)
+            store.add_results(protocol_id, oil_breakdown_results(result, nominal, voltage, second_run),
+                              OIL_BREAKDOWN_UNITS)
+            store.sync()
         except Exception as e:
-            wx.MessageBox(f"Ошибка при работе с Excel: {str(e)}", "Ошибка", wx.OK | wx.ICON_ERROR)
+            wx.CallAfter(self.on_write_done, f"Ошибка при записи результата: {str(e)}")
+            return
+        try:
+            # Файл протокола формируется из сохраненных в базе результатов в контрольной точке
+            store.checkpoint(protocol_id)
+        except Exception as e:
+            # Результат сохранен в базе и будет записан в протокол при следующем формировании
+            logging.error(f"Ошибка записи протокола {self.file_protocol}: {e}")
+        wx.CallAfter(self.on_write_done, None)
+
+    def on_write_done(self, error):
+        if error:
+            wx.MessageBox(error, "Ошибка", wx.OK | wx.ICON_ERROR)
+            self.btn_save.Enable(True)
+            self.btn_save.SetBackgroundColour(colour("save"))
             return
 
         # Закрытие окна и отправка события
@@ -173,7 +191,7 @@ class ExperienceOneDialog(wx.Dialog):
         self.txt_nominal.SetValue("")
         self.txt_voltage.SetValue("")
         self.btn_save.Enable(True)
-        self.btn_save.SetBackgroundColour(wx.Colour(255, 255, 127))
+        self.btn_save.SetBackgroundColour(colour("save"))
         self.check_first.SetValue(True)
         self.check_second.SetValue(False)
 
@@ -183,43 +201,13 @@ class ExperienceOneDialog(wx.Dialog):
 
 
 
-class NumberValidator(wx.Validator):
-    def __init__(self):
-        super().__init__()
-        self.Bind(wx.EVT_CHAR, self.on_char)
-
-    def on_char(self, event):
-        key = event.GetKeyCode()
-        if key < wx.WXK_SPACE or key == wx.WXK_DELETE or key > 255:
-            event.Skip()
-            return
-
-        if chr(key).isdigit():
-            event.Skip()
-            return
-
-        if not wx.Validator.IsSilent():
-            wx.Bell()
-
-    def Clone(self):
-        return NumberValidator()
-
-    def Validate(self, parent):
-        return True
-
-    def TransferToWindow(self):
-        return True
-
-    def TransferFromWindow(self):
-        return True
-
-
 class MyFrame(wx.Frame):
     def __init__(self):
         super().__init__(None, title="Приложение с параметрами ПЭД",
                          style=wx.DEFAULT_FRAME_STYLE, size=(1600, 900))
 
         self.SetMinSize((1400, 700))
+        self.experience_dialog = None  # Создается при первом открытии
 
         # Создаем Notebook с вкладками
         self.notebook = wx.Notebook(self)
@@ -317,12 +305,14 @@ class MyFrame(wx.Frame):
 
     def on_load_button(self, event):
         """Обработчик нажатия кнопки Загрузить"""
-        # Создаем и показываем модальное диалоговое окно ExperienceOneDialog
-        dlg = ExperienceOneDialog(self)
-        # Установите file_protocol если нужно
-        dlg.set_file_protocol("file_protocol.xlsx")
-        dlg.ShowModal()
-        dlg.Destroy()  # Уничтожаем диалог после закрытия
+        # Диалог ExperienceOneDialog создается один раз и показывается повторно
+        if self.experience_dialog is None:
+            self.experience_dialog = ExperienceOneDialog(self)
+            # Установите file_protocol если нужно
+            self.experience_dialog.set_file_protocol("file_protocol.xlsx")
+        else:
+            self.experience_dialog.reset_state()
+        self.experience_dialog.ShowModal()
 
     def setup_controls_column(self, parent):
         sizer = wx.BoxSizer(wx.VERTICAL)
@@ -371,7 +361,7 @@ class MyFrame(wx.Frame):
         for param, param_type in parameters:
             if param_type == "header":
                 header = wx.StaticText(parent, label=param)
-                header.SetFont(wx.Font(10, wx.FONTFAMILY_DEFAULT, wx.FONTSTYLE_NORMAL, wx.FONTWEIGHT_BOLD))
+                header.SetFont(font(10))
                 grid.Add(header, 0, wx.ALIGN_CENTER_VERTICAL | wx.ALL, 3)
                 grid.Add((0, 0), 0)
             else:
@@ -388,7 +378,7 @@ class MyFrame(wx.Frame):
         sizer = wx.BoxSizer(wx.VERTICAL)
 
         title = wx.StaticText(parent, label="Найти протокол:")
-        title.SetFont(wx.Font(11, wx.FONTFAMILY_DEFAULT, wx.FONTSTYLE_NORMAL, wx.FONTWEIGHT_BOLD))
+        title.SetFont(font(11))
         sizer.Add(title, 0, wx.ALL, 5)
 
         # Параметры протокола
@@ -421,7 +411,7 @@ class MyFrame(wx.Frame):
         for param, param_type in protocol_params:
             if param_type == "header":
                 header = wx.StaticText(parent, label=param)
-                header.SetFont(wx.Font(10, wx.FONTFAMILY_DEFAULT, wx.FONTSTYLE_NORMAL, wx.FONTWEIGHT_BOLD))
+                header.SetFont(font(10))
                 grid.Add(header, 0, wx.ALIGN_CENTER_VERTICAL | wx.ALL, 3)
                 grid.Add((0, 0), 0)
             else:
@@ -450,5 +440,7 @@ class MyFrame(wx.Frame):
 
 if __name__ == "__main__":
     app = wx.App()
+    # Дописываем в протоколы результаты, не записанные до аварийного завершения
+    get_results_store().render_pending()
     frame = MyFrame()
     app.MainLoop()
@@ -0,0 +1,64 @@
+"""Проверка записи ячеек xlsx на месте (xlsx_patch.patch_workbook)."""
+import os
+import shutil
+import stat
+import tempfile
+import unittest
+from unittest import mock
+import xlsx_patch
+
+TEMPLATE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "file_protocol.xlsx")
+
+
+def open_handles(path):
+    """Дескрипторы процесса, открытые на файл path (по /proc/self/fd)."""
+    target = os.path.realpath(path)
+    handles = []
+    for fd in os.listdir("/proc/self/fd"):
+        try:
+            if os.path.realpath(os.readlink(os.path.join("/proc/self/fd", fd))) == target:
+                handles.append(fd)
+        except OSError:
+            pass
+    return handles
+
+
+class PatchInPlaceTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "protocol.xlsx")
+        shutil.copy(TEMPLATE, self.path)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    @unittest.skipUnless(os.path.isdir("/proc/self/fd"), "нужен /proc/self/fd")
+    def test_source_closed_before_replace(self):
+        replace = os.replace
+        handles_at_replace = []
+
+        def checked_replace(src, dst):
+            handles_at_replace.extend(open_handles(dst))
+            return replace(src, dst)
+
+        with mock.patch.object(xlsx_patch.os, "replace", checked_replace):
+            xlsx_patch.patch_workbook(self.path, self.path, {"L4": "П-17", "M22": 45})
+
+        self.assertEqual(handles_at_replace, [])
+        self.assertEqual(open_handles(self.path), [])
+        self.assertEqual(xlsx_patch.read_cells(self.path, ["L4", "M22"]), {(4, 12): "П-17", (22, 13): 45})
+
+    def test_keeps_file_mode(self):
+        os.chmod(self.path, 0o644)
+        xlsx_patch.patch_workbook(self.path, self.path, {"L4": "П-17"})
+        self.assertEqual(stat.S_IMODE(os.stat(self.path).st_mode), 0o644)
+
+    def test_new_file_uses_umask(self):
+        result = os.path.join(self.directory, "new.xlsx")
+        xlsx_patch.patch_workbook(self.path, result, {"L4": "П-17"})
+        self.assertEqual(stat.S_IMODE(os.stat(result).st_mode), 0o666 & ~xlsx_patch._UMASK)
+        self.assertEqual([name for name in os.listdir(self.directory) if name.startswith("tmp")], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
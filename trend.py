@@ -0,0 +1,128 @@
+"""Прореживание временных рядов измерений для графиков.
+
+MinMaxBuffer хранит ряд в виде интервалов времени фиксированной длины: для
+каждого интервала - минимум, максимум, первое и последнее значения. Когда
+интервалов становится больше емкости, соседние интервалы объединяются
+попарно, а длина интервала удваивается. Поэтому память и время построения
+графика ограничены емкостью буфера при любом количестве отсчетов
+(многочасовая обкатка с миллионами отсчетов), а изломы и выбросы сигнала
+сохраняются в минимумах и максимумах.
+
+Отсчеты добавляются из любого потока; columns сводит интервалы к
+столбцам графика шириной в один пиксель.
+"""
+import threading
+
+MIN, MAX, FIRST, LAST = range(4)
+
+
+def _merge(left, right):
+    """Объединяет два соседних интервала (любой из них может быть None)."""
+    if left is None:
+        return right
+    if right is None:
+        return left
+    return [min(left[MIN], right[MIN]), max(left[MAX], right[MAX]), left[FIRST], right[LAST]]
+
+
+class MinMaxBuffer:
+    """Ряд отсчетов (время, значение) с прореживанием по минимуму и максимуму."""
+
+    def __init__(self, capacity=4096, resolution=0.05):
+        """Инициализация.
+
+        Args:
+            capacity (int): Максимальное количество интервалов
+            resolution (float): Начальная длина интервала, с
+        """
+        self.capacity = capacity
+        self.initial_resolution = resolution
+        self.lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        with self.lock:
+            self.resolution = self.initial_resolution
+            self.buckets = []  # [минимум, максимум, первое, последнее] или None - нет отсчетов
+            self.origin = None  # Время первого отсчета
+            self.last_time = None
+            self.last_value = None
+            self.low = None
+            self.high = None
+            self.count = 0
+
+    def add(self, t, value):
+        """Добавляет отсчет (время отсчетов не убывает)."""
+        with self.lock:
+            if self.origin is None:
+                self.origin = t
+            index = int((t - self.origin) / self.resolution)
+            while index >= self.capacity:
+                self._compact()
+                index = int((t - self.origin) / self.resolution)
+            if index >= len(self.buckets):
+                self.buckets.extend([None] * (index + 1 - len(self.buckets)))
+            bucket = self.buckets[index]
+            if bucket is None:
+                self.buckets[index] = [value, value, value, value]
+            else:
+                if value < bucket[MIN]:
+                    bucket[MIN] = value
+                elif value > bucket[MAX]:
+                    bucket[MAX] = value
+                bucket[LAST] = value
+            self.low = value if self.low is None else min(self.low, value)
+            self.high = value if self.high is None else max(self.high, value)
+            self.last_time = t
+            self.last_value = value
+            self.count += 1
+
+    def _compact(self):
+        """Объединяет интервалы попарно (длина интервала удваивается)."""
+        buckets = self.buckets
+        self.buckets = [_merge(buckets[i], buckets[i + 1] if i + 1 < len(buckets) else None)
+                        for i in range(0, len(buckets), 2)]
+        self.resolution *= 2
+
+    def bounds(self):
+        """Возвращает (время первого отсчета, время последнего, минимум, максимум) или None, если ряд пуст."""
+        with self.lock:
+            if self.origin is None:
+                return None
+            return self.origin, self.last_time, self.low, self.high
+
+    def columns(self, width, start, end, first=0, last=None):
+        """Сводит ряд к столбцам графика.
+
+        Args:
+            width (int): Количество столбцов на интервале времени [start, end)
+            start (float): Время левой границы графика
+            end (float): Время правой границы графика
+            first (int): Первый возвращаемый столбец
+            last (int): Последний возвращаемый столбец (по умолчанию - width - 1)
+
+        Returns:
+            list: Для столбцов first..last - [минимум, максимум, первое, последнее] или None
+        """
+        last = width - 1 if last is None else min(last, width - 1)
+        result = [None] * max(last - first + 1, 0)
+        with self.lock:
+            if self.origin is None or not result:
+                return result
+            step = (end - start) / width
+            resolution = self.resolution
+            # Первый интервал, попадающий в столбец first
+            index = max(int((start + first * step - self.origin) / resolution), 0)
+            for index in range(index, len(self.buckets)):
+                bucket = self.buckets[index]
+                if bucket is None:
+                    continue
+                bucket_start = self.origin + index * resolution
+                column = int((bucket_start - start) / step)
+                if column > last:
+                    break
+                column_end = min(int((bucket_start + resolution - start) / step - 1e-9), last)
+                for column in range(max(column, first), column_end + 1):
+                    current = result[column - first]
+                    result[column - first] = list(bucket) if current is None else _merge(current, bucket)
+        return result
@@ -0,0 +1,205 @@
+"""График измерений в реальном времени для диалогов испытаний.
+
+TrendChart рисует несколько рядов (сопротивление изоляции, напряжение,
+частота вращения при выбеге, температура) с прореживанием по минимуму и
+максимуму до ширины в пиксель (см. trend.py). Изображение хранится в
+растре: при поступлении новых отсчетов перерисовываются только столбцы
+от последнего нарисованного до текущего. Полная перерисовка выполняется
+при изменении размера окна, удвоении шкалы времени или выходе значения за
+шкалу ряда.
+
+Отсчеты добавляются методом add из любого потока, а окно обновляется
+вызовом refresh_plot по таймеру (см. live_state.REFRESH_INTERVAL).
+"""
+import wx
+from resources import brush, colour, pen
+from trend import FIRST, LAST, MAX, MIN, MinMaxBuffer
+
+# Стандартные ряды диалогов испытаний: имя -> (подпись, единица измерения, цвет (R, G, B))
+TREND_SERIES = {
+    "resistance": ("Сопротивление изоляции", "МОм", (0, 90, 180)),
+    "voltage": ("Напряжение", "В", (200, 60, 40)),
+    "speed": ("Частота вращения", "об/мин", (40, 150, 60)),
+    "temperature": ("Температура", "°C", (150, 80, 170)),
+}
+
+
+class TrendChart(wx.Panel):
+    """График рядов измерений с инкрементальной перерисовкой."""
+
+    MIN_WINDOW = 60.0  # Начальная длительность шкалы времени, с
+    MARGIN_LEFT, MARGIN_RIGHT, MARGIN_TOP, MARGIN_BOTTOM = 10, 10, 10, 22
+    GRID_LINES = 4
+
+    def __init__(self, parent, series, size=wx.Size(-1, 200)):
+        """Инициализация графика.
+
+        Args:
+            parent: Родительское окно
+            series: Имена рядов из TREND_SERIES или кортежи (имя, подпись, единица, цвет (R, G, B))
+            size: Размер графика
+        """
+        super().__init__(parent, size=size)
+        self.SetBackgroundStyle(wx.BG_STYLE_PAINT)
+        self.specs = []
+        self.buffers = {}
+        for spec in series:
+            name, label, unit, rgb = (spec, *TREND_SERIES[spec]) if isinstance(spec, str) else spec
+            self.specs.append((name, label, unit, rgb))
+            self.buffers[name] = MinMaxBuffer()
+        self.bitmap = None
+        self.reset_view()
+
+        self.Bind(wx.EVT_PAINT, self.on_paint)
+        self.Bind(wx.EVT_SIZE, self.on_size)
+
+    def reset_view(self):
+        self.origin = None  # Время левой границы графика
+        self.window = self.MIN_WINDOW
+        self.ranges = {}  # Имя ряда -> (нижняя, верхняя граница шкалы)
+        self.drawn_column = 0  # Последний нарисованный столбец
+        self.drawn_count = {}  # Имя ряда -> количество отсчетов на момент рисования
+        self.full_redraw = True
+
+    def add(self, name, t, value):
+        """Добавляет отсчет ряда (время в секундах, из любого потока)."""
+        self.buffers[name].add(t, value)
+
+    def clear(self):
+        """Удаляет все отсчеты."""
+        for buffer in self.buffers.values():
+            buffer.clear()
+        self.reset_view()
+        self.Refresh(False)
+
+    def plot_rect(self):
+        width, height = self.GetClientSize()
+        return wx.Rect(self.MARGIN_LEFT, self.MARGIN_TOP,
+                       max(width - self.MARGIN_LEFT - self.MARGIN_RIGHT, 1),
+                       max(height - self.MARGIN_TOP - self.MARGIN_BOTTOM, 1))
+
+    def refresh_plot(self):
+        """Дорисовывает новые отсчеты (вызывается по таймеру в потоке интерфейса)."""
+        bounds = {name: buffer.bounds() for name, buffer in self.buffers.items()}
+        bounds = {name: value for name, value in bounds.items() if value is not None}
+        if not bounds:
+            return
+        counts = {name: self.buffers[name].count for name in bounds}
+        if counts == self.drawn_count and not self.full_redraw:
+            return
+
+        origin = min(value[0] for value in bounds.values())
+        latest = max(value[1] for value in bounds.values())
+        if origin != self.origin:
+            self.origin = origin
+            self.full_redraw = True
+        while latest - origin >= self.window:
+            self.window *= 2
+            self.full_redraw = True
+        for name, (_, _, low, high) in bounds.items():
+            scale = self.ranges.get(name)
+            if scale is None or low < scale[0] or high > scale[1]:
+                # Шкала с запасом, чтобы не перерисовывать график при каждом новом экстремуме
+                margin = (high - low) * 0.25 or abs(high) * 0.1 or 1.0
+                self.ranges[name] = (low - margin, high + margin)
+                self.full_redraw = True
+
+        rect = self.plot_rect()
+        last_column = min(int((latest - origin) / self.window * rect.width), rect.width - 1)
+        if self.full_redraw or self.bitmap is None:
+            self.draw_background(rect)
+            self.draw_columns(rect, 0, last_column)
+            self.full_redraw = False
+        else:
+            self.draw_columns(rect, self.drawn_column, last_column)
+        self.drawn_column = last_column
+        self.drawn_count = counts
+        self.Refresh(False)
+
+    def draw_background(self, rect):
+        """Создает растр графика с сеткой и шкалой времени"""
+        width, height = self.GetClientSize()
+        self.bitmap = wx.Bitmap(max(width, 1), max(height, 1))
+        dc = wx.MemoryDC(self.bitmap)
+        dc.SetBackground(brush(*self.GetParent().GetBackgroundColour().Get(includeAlpha=False)))
+        dc.Clear()
+        dc.SetFont(self.GetFont())
+        for i in range(self.GRID_LINES + 1):
+            x = rect.x + rect.width * i // self.GRID_LINES
+            seconds = int(self.window * i / self.GRID_LINES)
+            label = f"{seconds // 60}:{seconds % 60:02d}"
+            text_width, _ = dc.GetTextExtent(label)
+            dc.DrawText(label, min(max(x - text_width // 2, 0), width - text_width), rect.bottom + 4)
+        self.clear_strip(dc, rect, 0, rect.width - 1)
+        dc.SelectObject(wx.NullBitmap)
+
+    def clear_strip(self, dc, rect, first, last):
+        """Очищает столбцы графика first..last и рисует в них сетку"""
+        x = rect.x + first
+        strip_width = last - first + 1
+        dc.SetPen(wx.TRANSPARENT_PEN)
+        dc.SetBrush(brush("chart"))
+        dc.DrawRectangle(x, rect.y, strip_width, rect.height)
+        dc.SetPen(pen("chart_grid"))
+        for i in range(self.GRID_LINES + 1):
+            y = rect.y + (rect.height - 1) * i // self.GRID_LINES
+            dc.DrawLine(x, y, x + strip_width, y)
+            grid_x = rect.x + (rect.width - 1) * i // self.GRID_LINES
+            if x <= grid_x < x + strip_width:
+                dc.DrawLine(grid_x, rect.y, grid_x, rect.bottom + 1)
+
+    def draw_columns(self, rect, first, last):
+        """Рисует столбцы графика first..last по прореженным рядам"""
+        if self.bitmap is None or last < first:
+            return
+        dc = wx.MemoryDC(self.bitmap)
+        self.clear_strip(dc, rect, first, last)
+        start = max(first - 1, 0)  # Предыдущий столбец - для соединения с уже нарисованной линией
+        end = self.origin + self.window
+        for name, _, _, rgb in self.specs:
+            if name not in self.ranges:
+                continue
+            low, high = self.ranges[name]
+            scale = (rect.height - 1) / (high - low)
+
+            def to_y(value):
+                return rect.bottom - int((value - low) * scale)
+
+            dc.SetPen(pen(*rgb))
+            previous = None
+            columns = self.buffers[name].columns(rect.width, self.origin, end, start, last)
+            for offset, column in enumerate(columns):
+                if column is None:
+                    continue
+                x = rect.x + start + offset
+                if previous is not None:
+                    dc.DrawLine(previous[0], to_y(previous[1]), x, to_y(column[FIRST]))
+                dc.DrawLine(x, to_y(column[MAX]), x, to_y(column[MIN]) + 1)
+                previous = (x, column[LAST])
+        dc.SelectObject(wx.NullBitmap)
+
+    def on_size(self, event):
+        self.full_redraw = True
+        self.refresh_plot()
+        event.Skip()
+
+    def on_paint(self, event):  # noqa: unused-argument
+        dc = wx.AutoBufferedPaintDC(self)
+        if self.bitmap is None:
+            dc.SetBackground(brush(*self.GetParent().GetBackgroundColour().Get(includeAlpha=False)))
+            dc.Clear()
+            return
+        dc.DrawBitmap(self.bitmap, 0, 0)
+
+        # Легенда: последнее значение и шкала каждого ряда
+        rect = self.plot_rect()
+        dc.SetFont(self.GetFont())
+        y = rect.y + 4
+        for name, label, unit, rgb in self.specs:
+            buffer = self.buffers[name]
+            if buffer.last_value is None:
+                continue
+            low, high = self.ranges.get(name, (buffer.low, buffer.high))
+            dc.SetTextForeground(colour(*rgb))
+            dc.DrawText(f"{label}: {buffer.last_value:.2f} {unit}  (шкала {low:.1f}…{high:.1f})", rect.x + 6, y)
+            y += dc.GetCharHeight() + 2
@@ -0,0 +1,83 @@
+"""Пакетная проверка значений каталога по реестру колонок (catalog.COLUMNS)."""
+from collections import namedtuple
+from functools import lru_cache
+from catalog import CONVERTERS, DATA_COLUMNS
+
+# Ошибка проверки ячейки: индекс строки таблицы, индекс колонки и текст сообщения
+ValidationError = namedtuple("ValidationError", "row col message")
+
+_TYPE_NAMES = {int: "целое число", float: "число", str: "текст"}
+
+
+def compile_checker(column):
+    """Строит функцию проверки и приведения значения для колонки.
+
+    Все решения, зависящие только от колонки (тип, границы, обязательность),
+    принимаются здесь один раз, а не для каждой ячейки.
+
+    Args:
+        column (Column): Описание колонки
+
+    Returns:
+        function: text -> значение; при ошибке возбуждает ValueError с текстом сообщения
+    """
+    convert = CONVERTERS[column.py_type]
+    required = column.required
+    numeric = column.py_type is not str
+    low, high = column.min_value, column.max_value
+    type_error = f"{column.title}: ожидается {_TYPE_NAMES[column.py_type]}"
+    low_error = f"{column.title}: значение меньше {low}"
+    high_error = f"{column.title}: значение больше {high}"
+    required_error = f"{column.title}: обязательное поле"
+
+    def check(text):
+        text = text.strip()
+        if not text:
+            if required:
+                raise ValueError(required_error)
+            return None
+        if not numeric:
+            return text
+        try:
+            value = convert(text)
+        except ValueError:
+            raise ValueError(type_error) from None
+        if low is not None and value < low:
+            raise ValueError(low_error)
+        if high is not None and value > high:
+            raise ValueError(high_error)
+        return value
+
+    return check
+
+
+@lru_cache(maxsize=None)
+def compile_checkers(columns):
+    """Возвращает функции проверки для набора колонок (кэшируются по набору)."""
+    return tuple(compile_checker(column) for column in columns)
+
+
+def validate_rows(rows, columns=DATA_COLUMNS, first_col=1):
+    """Проверяет набор изменений целиком за один проход.
+
+    Args:
+        rows: Последовательность пар (индекс строки, список текстов ячеек по columns)
+        columns: Проверяемые колонки (по умолчанию все, кроме ID)
+        first_col (int): Индекс первой проверяемой колонки в таблице (для сообщений об ошибках)
+
+    Returns:
+        tuple: (словарь {индекс строки: список приведенных значений}, список ValidationError)
+    """
+    checkers = compile_checkers(tuple(columns))
+    values = {}
+    errors = []
+    for row, cells in rows:
+        converted = []
+        for col, (check, text) in enumerate(zip(checkers, cells), start=first_col):
+            try:
+                converted.append(check(text))
+            except ValueError as e:
+                errors.append(ValidationError(row, col, str(e)))
+                converted.append(None)
+        values[row] = converted
+    return values, errors
@@ -2,8 +2,10 @@ import wx
 
 
 class NumberValidator(wx.Validator):
-    def __init__(self):
+    def __init__(self, allow_decimal=True, allow_negative=True):
         super().__init__()
+        self.allow_decimal = allow_decimal
+        self.allow_negative = allow_negative
         self.Bind(wx.EVT_CHAR, self.on_char)
 
     def on_char(self, event):
@@ -12,7 +14,21 @@ class NumberValidator(wx.Validator):
             event.Skip()
             return
 
-        if chr(key).isdigit():
+        char = chr(key)
+        if char.isdigit():
+            event.Skip()
+            return
+
+        ctrl = self.GetWindow()
+        text = ctrl.GetValue()
+
+        # Десятичный разделитель (точка или запятая) допускается один раз
+        if self.allow_decimal and char in ".," and "." not in text and "," not in text:
+            event.Skip()
+            return
+
+        # Знак минуса допускается только в начале строки
+        if self.allow_negative and char == "-" and "-" not in text and ctrl.GetInsertionPoint() == 0:
             event.Skip()
             return
 
@@ -20,7 +36,7 @@ class NumberValidator(wx.Validator):
             wx.Bell()
 
     def Clone(self):
-        return NumberValidator()
+        return NumberValidator(self.allow_decimal, self.allow_negative)
 
     def Validate(self, parent):
         return True
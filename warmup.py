@@ -0,0 +1,114 @@
+"""Фоновая подготовка программы во время показа заставки.
+
+Шаги подготовки (открытие базы и загрузка каталога, разбор шаблона
+протокола, запись незаписанных протоколов) выполняются параллельно в пуле
+потоков. Результаты шагов забираются окнами при создании (take), а
+заставка закрывается, когда все шаги завершены (done).
+"""
+import logging
+import os
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from catalog import COLUMN_NAMES, compile_row_factory, ensure_range_indexes
+from protocol import TEMPLATE_PATH, template_cache
+from results_store import get_results_store
+from snapshot import load_snapshot
+import startup_profile
+
+
+def warm_catalog(db_path="baseReda.db"):
+    """Открывает базу, создает индексы и загружает список моделей и снимок каталога.
+
+    Returns:
+        dict: {"models": [названия моделей], "snapshot": CatalogSnapshot или None}
+    """
+    compile_row_factory(COLUMN_NAMES)
+    conn = sqlite3.connect(db_path)
+    try:
+        ensure_range_indexes(conn)
+        models = [row[0] for row in conn.execute("SELECT DISTINCT Model FROM Base ORDER BY Model") if row[0]]
+        return {"models": models, "snapshot": load_snapshot(conn)}
+    finally:
+        conn.close()
+
+
+def catalog_step(db_path="baseReda.db"):
+    """Имя шага подготовки каталога базы db_path (результат забирается только для той же базы)."""
+    return f"catalog:{os.path.abspath(db_path)}"
+
+
+def warm_template(template_path=TEMPLATE_PATH):
+    """Разбирает шаблон протокола в кэш (используется при записи через openpyxl)."""
+    if os.path.exists(template_path):
+        template_cache.image(template_path)
+        return True
+    return False
+
+
+def default_steps(db_path="baseReda.db", template_path=TEMPLATE_PATH):
+    """Шаги подготовки главного окна: [(имя шага, описание, функция)]."""
+    return [
+        (catalog_step(db_path), "каталог ПЭД", lambda: warm_catalog(db_path)),
+        ("template", "шаблон протокола", lambda: warm_template(template_path)),
+        ("protocols", "незаписанные протоколы", lambda: get_results_store(db_path).render_pending()),
+    ]
+
+
+class WarmUp:
+    """Параллельное выполнение шагов подготовки."""
+
+    def __init__(self, steps, workers=4):
+        """Запускает шаги подготовки.
+
+        Args:
+            steps (list): [(имя шага, описание, функция без аргументов)]
+            workers (int): Количество потоков
+        """
+        self.titles = {name: title for name, title, _ in steps}
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="warmup")
+        self.futures = {name: executor.submit(self._run, title, func) for name, title, func in steps}
+        executor.shutdown(wait=False)
+
+    @staticmethod
+    def _run(title, func):
+        with startup_profile.phase(f"Подготовка: {title}"):
+            return func()
+
+    def done(self):
+        """Проверяет, завершены ли все шаги."""
+        return all(future.done() for future in self.futures.values())
+
+    def pending(self):
+        """Возвращает описания незавершенных шагов."""
+        return [self.titles[name] for name, future in self.futures.items() if not future.done()]
+
+    def take(self, name):
+        """Забирает результат завершенного шага (повторный вызов возвращает None).
+
+        Returns:
+            Результат шага или None, если шаг не завершен или завершился ошибкой
+        """
+        future = self.futures.get(name)
+        if future is None or not future.done():
+            return None
+        del self.futures[name]
+        error = future.exception()
+        if error is not None:
+            logging.error(f"Ошибка подготовки ({self.titles[name]}): {error}")
+            return None
+        return future.result()
+
+
+_current = None
+
+
+def start(steps=None):
+    """Запускает подготовку программы (по умолчанию - default_steps)."""
+    global _current
+    _current = WarmUp(default_steps() if steps is None else steps)
+    return _current
+
+
+def take(name):
+    """Забирает результат шага текущей подготовки (None, если подготовка не запускалась)."""
+    return _current.take(name) if _current is not None else None
@@ -0,0 +1,434 @@
+"""Быстрые запись и чтение значений ячеек xlsx без полной загрузки книги.
+
+Файл xlsx - это zip-архив. Все части архива, кроме XML листа с
+изменяемыми ячейками, переносятся без изменений; в XML листа точечно
+заменяются только нужные элементы <c>. Стили ячеек (атрибут s) и
+формулы остальных ячеек сохраняются. Строки записываются как inline-строки,
+поэтому таблица общих строк (sharedStrings.xml) не перестраивается.
+
+Чтение выполняется потоковым разбором XML листа до последней нужной строки.
+
+Строки и ячейки листа без атрибута r (адрес по схеме необязателен) быстрой
+записью и чтением не поддерживаются - выдается XlsxPatchError, и вызывающий
+код использует openpyxl.
+"""
+import copy
+import math
+import os
+import re
+import tempfile
+import zipfile
+from xml.etree import ElementTree
+from xml.sax.saxutils import escape
+
+_REL_NS_ATTR = re.compile(r'\br:id="([^"]+)"|\b\w+:id="([^"]+)"')
+_SHEET_TAG = re.compile(r"<sheet\b[^>]*>")
+_RELATIONSHIP_TAG = re.compile(r"<Relationship\b[^>]*>")
+_ATTR = re.compile(r'(\w+(?::\w+)?)="([^"]*)"')
+_SHEET_DATA = re.compile(r"<sheetData\s*/>|<sheetData>(.*?)</sheetData>", re.S)
+_ROW = re.compile(r'<row\b([^>]*?)(?:/>|>(.*?)</row>)', re.S)
+_CELL = re.compile(r'<c\b([^>]*?)(?:/>|>(.*?)</c>)', re.S)
+_ROW_REF = re.compile(r'\br="(\d+)"')
+_CELL_REF = re.compile(r'\br="([A-Z]+)(\d+)"')
+_DIMENSION = re.compile(r'<dimension\b[^>]*?\bref="([^"]*)"')
+_ADDRESS = re.compile(r"^([A-Z]+)(\d+)$")
+
+
+# Маска прав процесса (читается один раз при импорте: os.umask меняет ее для всех потоков)
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+class XlsxPatchError(Exception):
+    """Структура файла не поддерживается быстрой записью (нужна запись через openpyxl)."""
+
+
+def column_letter(col):
+    """Возвращает буквенное обозначение колонки по номеру (1 -> "A")."""
+    letters = ""
+    while col > 0:
+        col, remainder = divmod(col - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+def column_index(letters):
+    """Возвращает номер колонки по буквенному обозначению ("A" -> 1)."""
+    index = 0
+    for char in letters:
+        index = index * 26 + ord(char) - 64
+    return index
+
+
+def normalize_address(address):
+    """Приводит адрес ячейки к паре (номер строки, номер колонки).
+
+    Args:
+        address: Адрес "L4" или пара (строка, колонка)
+
+    Returns:
+        tuple: (номер строки, номер колонки)
+    """
+    if isinstance(address, tuple):
+        return address
+    match = _ADDRESS.match(address.upper())
+    if not match:
+        raise ValueError(f"Некорректный адрес ячейки: {address}")
+    return int(match.group(2)), column_index(match.group(1))
+
+
+def _attrs(tag):
+    return dict(_ATTR.findall(tag))
+
+
+def _cell_xml(ref, style, value):
+    """Формирует XML элемента ячейки с сохранением стиля."""
+    style_attr = f' s="{style}"' if style is not None else ""
+    if value is None:
+        return f'<c r="{ref}"{style_attr}/>'
+    if isinstance(value, bool):
+        return f'<c r="{ref}"{style_attr} t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, float) and not math.isfinite(value):
+        raise ValueError(f"Ячейка {ref}: недопустимое числовое значение {value!r}")
+    if isinstance(value, (int, float)):
+        return f'<c r="{ref}"{style_attr}><v>{value!r}</v></c>'
+    text = str(value)
+    space = ' xml:space="preserve"' if text != text.strip() else ""
+    return f'<c r="{ref}"{style_attr} t="inlineStr"><is><t{space}>{escape(text)}</t></is></c>'
+
+
+def _patch_row(row_number, row_xml, values):
+    """Заменяет или вставляет ячейки в XML строки листа.
+
+    Args:
+        row_number (int): Номер строки
+        row_xml (str): XML элемента <row> (может быть пустым)
+        values (dict): {номер колонки: значение}
+
+    Returns:
+        tuple: (новый XML строки, признак замены ячейки с формулой)
+    """
+    open_match = re.match(r"<row\b[^>]*?(/?)>", row_xml)
+    open_tag = open_match.group(0)
+    if open_match.group(1):
+        open_tag = open_tag[:-2].rstrip() + ">"
+        content = ""
+    else:
+        content = row_xml[len(open_tag):-len("</row>")]
+
+    cells = []  # (номер колонки, XML ячейки)
+    formula_replaced = False
+    pending = dict(values)
+    for match in _CELL.finditer(content):
+        ref = _CELL_REF.search(match.group(1))
+        if ref is None:
+            raise XlsxPatchError(f"Ячейка без адреса в строке {row_number}")
+        col = column_index(ref.group(1))
+        if col in pending:
+            if match.group(2) and "<f" in match.group(2):
+                formula_replaced = True
+            style = _attrs(match.group(1)).get("s")
+            cells.append((col, _cell_xml(f"{ref.group(1)}{row_number}", style, pending.pop(col))))
+        else:
+            cells.append((col, match.group(0)))
+    for col, value in pending.items():
+        cells.append((col, _cell_xml(f"{column_letter(col)}{row_number}", None, value)))
+    cells.sort(key=lambda item: item[0])
+
+    # Атрибут spans после вставки ячеек может стать неверным - он необязателен
+    open_tag = re.sub(r'\s+spans="[^"]*"', "", open_tag)
+    return open_tag + "".join(xml for _, xml in cells) + "</row>", formula_replaced
+
+
+def patch_sheet_xml(xml, cells):
+    """Записывает значения в XML листа.
+
+    Args:
+        xml (str): XML листа
+        cells (dict): {(строка, колонка): значение}
+
+    Returns:
+        tuple: (новый XML листа, признак замены ячейки с формулой)
+    """
+    data_match = _SHEET_DATA.search(xml)
+    if data_match is None:
+        raise XlsxPatchError("В листе не найден элемент sheetData")
+    content = data_match.group(1) or ""
+
+    by_row = {}
+    for (row, col), value in cells.items():
+        by_row.setdefault(row, {})[col] = value
+
+    rows = []  # (номер строки, XML строки)
+    formula_replaced = False
+    for match in _ROW.finditer(content):
+        ref = _ROW_REF.search(match.group(1))
+        if ref is None:
+            raise XlsxPatchError("Строка листа без номера")
+        number = int(ref.group(1))
+        if number in by_row:
+            row_xml, replaced = _patch_row(number, match.group(0), by_row.pop(number))
+            formula_replaced |= replaced
+            rows.append((number, row_xml))
+        else:
+            rows.append((number, match.group(0)))
+    for number, values in by_row.items():
+        row_xml, _ = _patch_row(number, f'<row r="{number}">' + "</row>", values)
+        rows.append((number, row_xml))
+    rows.sort(key=lambda item: item[0])
+
+    new_data = "<sheetData>" + "".join(row_xml for _, row_xml in rows) + "</sheetData>"
+    xml = xml[:data_match.start()] + new_data + xml[data_match.end():]
+    return _widen_dimension(xml, cells), formula_replaced
+
+
+def _widen_dimension(xml, cells):
+    """Расширяет диапазон используемых ячеек листа (<dimension ref>) до записанных ячеек."""
+    match = _DIMENSION.search(xml)
+    if match is None or not cells:
+        return xml
+    addresses = list(cells)
+    for part in match.group(1).split(":"):
+        if _ADDRESS.match(part):
+            addresses.append(normalize_address(part))
+    rows = [row for row, _ in addresses]
+    cols = [col for _, col in addresses]
+    first, last = f"{column_letter(min(cols))}{min(rows)}", f"{column_letter(max(cols))}{max(rows)}"
+    ref = first if first == last else f"{first}:{last}"
+    return xml[:match.start(1)] + ref + xml[match.end(1):]
+
+
+def find_sheet_part(archive, sheet_index=0):
+    """Возвращает имя части архива с XML листа по его порядковому номеру.
+
+    Args:
+        archive (zipfile.ZipFile): Открытый архив xlsx
+        sheet_index (int): Порядковый номер листа (0 - первый)
+
+    Returns:
+        str: Имя части, например "xl/worksheets/sheet1.xml"
+    """
+    workbook = archive.read("xl/workbook.xml").decode("utf-8")
+    sheets = _SHEET_TAG.findall(workbook)
+    if sheet_index >= len(sheets):
+        raise XlsxPatchError(f"В книге нет листа с номером {sheet_index + 1}")
+    rel_match = _REL_NS_ATTR.search(sheets[sheet_index])
+    if rel_match is None:
+        raise XlsxPatchError("Не найдена ссылка на XML листа")
+    rel_id = rel_match.group(1) or rel_match.group(2)
+
+    rels = archive.read("xl/_rels/workbook.xml.rels").decode("utf-8")
+    for tag in _RELATIONSHIP_TAG.findall(rels):
+        attrs = _attrs(tag)
+        if attrs.get("Id") == rel_id:
+            target = attrs["Target"]
+            return target.lstrip("/") if target.startswith("/") else "xl/" + target
+    raise XlsxPatchError(f"Не найдена связь {rel_id} для листа")
+
+
+def _request_recalculation(workbook_xml):
+    """Включает полный пересчет формул при открытии книги."""
+    calc = re.search(r"<calcPr\b[^>]*?/?>", workbook_xml)
+    if calc:
+        tag = calc.group(0)
+        if "fullCalcOnLoad" in tag:
+            return workbook_xml
+        closing = "/>" if tag.endswith("/>") else ">"
+        new_tag = tag[:-len(closing)].rstrip() + ' fullCalcOnLoad="1"' + closing
+        return workbook_xml[:calc.start()] + new_tag + workbook_xml[calc.end():]
+    # calcPr по схеме следует за sheets/functionGroups/externalReferences/definedNames
+    anchor = None
+    for name in ("definedNames", "externalReferences", "functionGroups", "sheets"):
+        pattern = rf"</{name}>|<{name}\s*/>"
+        anchor = re.search(pattern, workbook_xml)
+        if anchor:
+            break
+    if anchor is None:
+        return workbook_xml
+    return workbook_xml[:anchor.end()] + '<calcPr fullCalcOnLoad="1"/>' + workbook_xml[anchor.end():]
+
+
+def _drop_calc_chain(parts):
+    """Удаляет цепочку вычислений (Excel восстановит ее), ссылки на нее убираются."""
+    parts.pop("xl/calcChain.xml", None)
+    for name, pattern in (("[Content_Types].xml", r'<Override\b[^>]*calcChain[^>]*/>'),
+                          ("xl/_rels/workbook.xml.rels", r'<Relationship\b[^>]*calcChain[^>]*/>')):
+        if name in parts:
+            parts[name] = re.sub(pattern, "", parts[name].decode("utf-8")).encode("utf-8")
+
+
+def patch_workbook(src_path, dst_path, cells, sheet_index=0):
+    """Записывает значения ячеек в копию книги (или в ту же книгу).
+
+    Args:
+        src_path: Путь к исходному файлу xlsx или открытый файловый объект
+        dst_path (str): Путь к результату (может совпадать с src_path)
+        cells (dict): {адрес ("L4" или (строка, колонка)): значение}
+        sheet_index (int): Порядковый номер листа (0 - первый)
+
+    Raises:
+        XlsxPatchError: Если структура файла не поддерживается
+        ValueError: Значение NaN или бесконечность
+    """
+    cells = {normalize_address(address): value for address, value in cells.items()}
+
+    with zipfile.ZipFile(src_path) as archive:
+        sheet_part = find_sheet_part(archive, sheet_index)
+        infos = archive.infolist()
+        sheet_xml = archive.read(sheet_part).decode("utf-8")
+        new_sheet_xml, formula_replaced = patch_sheet_xml(sheet_xml, cells)
+
+        # Изменяемые части читаются в память, остальные копируются потоком при записи
+        changed = {sheet_part: new_sheet_xml.encode("utf-8")}
+        if formula_replaced:
+            for name in ("[Content_Types].xml", "xl/_rels/workbook.xml.rels", "xl/calcChain.xml"):
+                if name in archive.namelist():
+                    changed[name] = archive.read(name)
+            _drop_calc_chain(changed)
+            workbook_xml = archive.read("xl/workbook.xml").decode("utf-8")
+            changed["xl/workbook.xml"] = _request_recalculation(workbook_xml).encode("utf-8")
+
+        # Запись во временный файл рядом с результатом; исходный архив закрывается до замены
+        # (в Windows открытый файл нельзя заменить)
+        directory = os.path.dirname(os.path.abspath(dst_path))
+        fd, tmp_path = tempfile.mkstemp(suffix=".xlsx", dir=directory)
+        os.close(fd)
+        try:
+            with zipfile.ZipFile(tmp_path, "w") as out:
+                for info in infos:
+                    out_info = copy.copy(info)
+                    if info.filename in changed:
+                        out.writestr(out_info, changed[info.filename], compress_type=info.compress_type)
+                    elif formula_replaced and info.filename == "xl/calcChain.xml":
+                        continue
+                    else:
+                        with archive.open(info) as src, out.open(out_info, "w") as dst:
+                            while True:
+                                chunk = src.read(1 << 16)
+                                if not chunk:
+                                    break
+                                dst.write(chunk)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+    try:
+        # mkstemp создает файл с правами 0600 - права берутся у заменяемого файла или по umask
+        os.chmod(tmp_path, _file_mode(dst_path))
+        os.replace(tmp_path, dst_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _file_mode(path):
+    """Права доступа для записываемого файла: как у существующего файла или по умолчанию (umask)."""
+    try:
+        return os.stat(path).st_mode & 0o7777
+    except FileNotFoundError:
+        return 0o666 & ~_UMASK
+
+
+def _local(tag):
+    """Возвращает имя элемента без пространства имен."""
+    return tag.rsplit("}", 1)[-1]
+
+
+def _text(elem):
+    """Собирает текст строки (элементы <t>, кроме фонетических подсказок <rPh>)."""
+    parts = []
+    for child in elem:
+        name = _local(child.tag)
+        if name == "t":
+            parts.append(child.text or "")
+        elif name == "r":
+            parts.extend(t.text or "" for t in child if _local(t.tag) == "t")
+    return "".join(parts)
+
+
+def _shared_strings(archive):
+    """Читает таблицу общих строк книги."""
+    if "xl/sharedStrings.xml" not in archive.namelist():
+        return []
+    with archive.open("xl/sharedStrings.xml") as f:
+        root = ElementTree.parse(f).getroot()
+    return [_text(si) for si in root if _local(si.tag) == "si"]
+
+
+def _cell_value(elem, archive, shared):
+    """Возвращает значение ячейки (кэшированное значение для формул)."""
+    cell_type = elem.get("t", "n")
+    if cell_type == "inlineStr":
+        for child in elem:
+            if _local(child.tag) == "is":
+                return _text(child)
+        return None
+    value = None
+    for child in elem:
+        if _local(child.tag) == "v":
+            value = child.text
+            break
+    if value is None:
+        return None
+    if cell_type == "s":
+        if shared[0] is None:
+            shared[0] = _shared_strings(archive)
+        return shared[0][int(value)]
+    if cell_type == "b":
+        return value == "1"
+    if cell_type in ("str", "e"):
+        return value
+    try:
+        return int(value)
+    except ValueError:
+        return float(value)
+
+
+def read_cells(src_path, addresses, sheet_index=0):
+    """Читает значения ячеек листа потоковым разбором XML.
+
+    Разбор прекращается после последней строки с нужными ячейками, таблица
+    общих строк читается только при наличии строковых ячеек.
+
+    Args:
+        src_path: Путь к файлу xlsx или открытый файловый объект
+        addresses: Адреса ячеек ("L4" или (строка, колонка))
+        sheet_index (int): Порядковый номер листа (0 - первый)
+
+    Returns:
+        dict: {(строка, колонка): значение} для найденных непустых ячеек
+
+    Raises:
+        XlsxPatchError: Если структура файла не поддерживается
+    """
+    wanted = {normalize_address(address) for address in addresses}
+    if not wanted:
+        return {}
+    last_row = max(row for row, _ in wanted)
+    values = {}
+
+    with zipfile.ZipFile(src_path) as archive:
+        sheet_part = find_sheet_part(archive, sheet_index)
+        shared = [None]  # Таблица общих строк загружается при первом обращении
+        with archive.open(sheet_part) as f:
+            for _, elem in ElementTree.iterparse(f, events=("end",)):
+                name = _local(elem.tag)
+                if name == "c":
+                    ref = elem.get("r")
+                    match = _ADDRESS.match(ref) if ref else None
+                    if match is None:
+                        raise XlsxPatchError("Ячейка листа без адреса")
+                    address = (int(match.group(2)), column_index(match.group(1)))
+                    if address in wanted:
+                        value = _cell_value(elem, archive, shared)
+                        if value is not None:
+                            values[address] = value
+                elif name == "row":
+                    if elem.get("r") is None:
+                        raise XlsxPatchError("Строка листа без номера")
+                    row_number = int(elem.get("r"))
+                    elem.clear()
+                    if row_number >= last_row:
+                        break
+    return values